@@ -0,0 +1,230 @@
+from __future__ import annotations
+import heapq
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .graph_data import GraphData
+from .renderer import DEFAULT_COLOR, EDGE_HIGHLIGHT_WIDTH, EDGE_WIDTH, NODE_FACE_COLOR, NODE_HIGHLIGHT_WIDTH, NODE_WIDTH
+
+# Loại phần tử của một sự kiện duyệt
+NODE, EDGE = 0, 1
+# Trạng thái đỉnh
+UNSEEN, FRONTIER, CURRENT, DONE = 0, 1, 2, 3
+# Trạng thái cạnh
+IDLE, EXAMINED, TREE = 0, 1, 2
+
+# Kiểu dáng theo trạng thái (chỉ số = mã trạng thái), xem GraphRenderer.show_states
+NODE_STATE_STYLES = (
+    (NODE_FACE_COLOR, DEFAULT_COLOR, NODE_WIDTH),   # Chưa thăm
+    ("#f9e79f", "#b7950b", NODE_WIDTH),             # Chờ xét (trong hàng đợi / trên ngăn xếp)
+    ("#e74c3c", "#922b21", NODE_HIGHLIGHT_WIDTH),   # Đang xét
+    ("#aed6f1", "#2471a3", NODE_WIDTH),             # Đã xong
+)
+EDGE_STATE_STYLES = (
+    None,                                           # Chưa xét: giữ nét vẽ thường
+    ("#e59866", EDGE_WIDTH),                        # Đã xét
+    ("#2471a3", EDGE_HIGHLIGHT_WIDTH + 0.5),        # Thuộc cây duyệt
+)
+
+# Sự kiện duyệt: (NODE, đỉnh, trạng thái) hoặc (EDGE, (u, v), trạng thái)
+Event = Tuple[int, object, int]
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+def _edge_key(graph: GraphData, u: str, v: str) -> Tuple[str, str]: # Khóa cạnh như GraphRenderer.edges (vô hướng: đầu mút nhỏ trước)
+    return (u, v) if graph.directed or u <= v else (v, u)
+
+def bfs_events(graph: GraphData, source: str, progress: Optional[ProgressCallback] = None) -> List[Event]: # Sự kiện của BFS từ source
+    events: List[Event] = [(NODE, source, FRONTIER)]
+    seen = {source}
+    tree = set()
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        events.append((NODE, u, CURRENT))
+        for v in graph.adjacency.get(u, {}):
+            key = _edge_key(graph, u, v)
+            if v not in seen:
+                seen.add(v)
+                tree.add(key)
+                events.append((EDGE, key, TREE))
+                events.append((NODE, v, FRONTIER))
+                queue.append(v)
+            elif key not in tree:
+                events.append((EDGE, key, EXAMINED))
+        events.append((NODE, u, DONE))
+        if progress is not None:
+            progress(len(seen), len(graph.nodes))
+    return events
+
+def dfs_events(graph: GraphData, source: str, progress: Optional[ProgressCallback] = None) -> List[Event]: # Sự kiện của DFS (khử đệ quy) từ source
+    """Các đỉnh trên đường đi từ gốc tới đỉnh đang xét mang trạng thái FRONTIER."""
+    events: List[Event] = [(NODE, source, CURRENT)]
+    visited = {source}
+    tree = set()
+    stack = [(source, iter(graph.adjacency.get(source, {})))]
+    while stack:
+        u, neighbors = stack[-1]
+        for v in neighbors:
+            key = _edge_key(graph, u, v)
+            if v not in visited:
+                visited.add(v)
+                tree.add(key)
+                events.append((EDGE, key, TREE))
+                events.append((NODE, u, FRONTIER))
+                events.append((NODE, v, CURRENT))
+                stack.append((v, iter(graph.adjacency.get(v, {}))))
+                break
+            if key not in tree:
+                events.append((EDGE, key, EXAMINED))
+        else:
+            stack.pop()
+            events.append((NODE, u, DONE))
+            if stack:
+                events.append((NODE, stack[-1][0], CURRENT))
+            if progress is not None:
+                progress(len(visited), len(graph.nodes))
+    return events
+
+def dijkstra_events(graph: GraphData, source: str, progress: Optional[ProgressCallback] = None) -> List[Event]: # Sự kiện của Dijkstra từ source
+    """Cây duyệt là cây đường đi ngắn nhất hiện tại: cạnh cha cũ bị hạ xuống EXAMINED khi tìm được đường ngắn hơn."""
+    events: List[Event] = [(NODE, source, FRONTIER)]
+    dist = {source: 0.0}
+    parent: Dict[str, Tuple[str, str]] = {}
+    tree = set()
+    done = set()
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u in done:
+            continue
+        done.add(u)
+        events.append((NODE, u, CURRENT))
+        for v, w in graph.adjacency.get(u, {}).items():
+            key = _edge_key(graph, u, v)
+            nd = d + w
+            if v not in done and nd < dist.get(v, float("inf")):
+                if v in parent:
+                    tree.discard(parent[v])
+                    events.append((EDGE, parent[v], EXAMINED))
+                dist[v] = nd
+                parent[v] = key
+                tree.add(key)
+                events.append((EDGE, key, TREE))
+                events.append((NODE, v, FRONTIER))
+                heapq.heappush(heap, (nd, v))
+            elif key not in tree:
+                events.append((EDGE, key, EXAMINED))
+        events.append((NODE, u, DONE))
+        if progress is not None:
+            progress(len(done), len(graph.nodes))
+    return events
+
+ALGORITHMS: Dict[str, Callable[..., List[Event]]] = {
+    "BFS": bfs_events,
+    "DFS": dfs_events,
+    "Dijkstra": dijkstra_events,
+}
+
+@dataclass
+class TraversalSteps:
+    """
+    Dãy bước của một lần duyệt, dạng mảng: bước i đặt phần tử `index[i]` (đỉnh nếu kind = NODE,
+    cạnh nếu kind = EDGE, theo chỉ số của GraphRenderer) từ trạng thái `previous[i]` sang `state[i]`.
+    Giữ cả trạng thái cũ nên lùi một bước cũng chỉ tốn O(1).
+    """
+    kind: np.ndarray
+    index: np.ndarray
+    state: np.ndarray
+    previous: np.ndarray
+    n_nodes: int
+    n_edges: int
+    def __len__(self) -> int:
+        return len(self.kind)
+
+def compile_events( # Chuyển sự kiện (theo tên đỉnh/cạnh) thành mảng bước theo chỉ số của bộ vẽ
+    events: Sequence[Event],
+    node_index: Dict[str, int],
+    edge_index: Dict[Tuple[str, str], int],
+) -> TraversalSteps:
+    """Bỏ các sự kiện không đổi trạng thái, để mỗi bước đều thay đổi hình vẽ."""
+    node_state = np.zeros(len(node_index), dtype=np.int8)
+    edge_state = np.zeros(len(edge_index), dtype=np.int8)
+    rows = []
+    for kind, key, state in events:
+        if kind == NODE:
+            i, states = node_index.get(key), node_state
+        else:
+            i, states = edge_index.get(key), edge_state
+        if i is None or states[i] == state:
+            continue
+        rows.append((kind, i, state, states[i]))
+        states[i] = state
+    table = np.array(rows, dtype=np.int32).reshape(-1, 4)
+    return TraversalSteps(
+        table[:, 0].astype(np.int8), table[:, 1].copy(), table[:, 2].astype(np.int8), table[:, 3].astype(np.int8),
+        len(node_index), len(edge_index),
+    )
+
+def traversal_steps( # Tính toàn bộ dãy bước của thuật toán (chạy được trên luồng nền)
+    graph: GraphData,
+    algorithm: str,
+    source: str,
+    node_index: Dict[str, int],
+    edge_index: Dict[Tuple[str, str], int],
+    progress: Optional[ProgressCallback] = None,
+) -> TraversalSteps:
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Thuật toán không hỗ trợ: '{algorithm}'")
+    if source not in graph.adjacency:
+        raise ValueError(f"Đỉnh '{source}' không tồn tại")
+    if algorithm == "Dijkstra" and any(w < 0 for nbrs in graph.adjacency.values() for w in nbrs.values()):
+        raise ValueError("Dijkstra không áp dụng được cho đồ thị có trọng số âm")
+    return compile_events(ALGORITHMS[algorithm](graph, source, progress), node_index, edge_index)
+
+class TraversalAnimation:
+    """
+    Phát lại dãy bước đã tính sẵn trên GraphRenderer.
+
+    Trạng thái hiện tại là hai mảng mã (đỉnh, cạnh); mỗi khung hình chỉ áp các bước mới rồi đưa
+    hai mảng cho lớp trạng thái của bộ vẽ (show_states). Bộ vẽ ở chế độ blit (begin_animation),
+    nên mỗi khung hình không vẽ lại trục, nền hay các cạnh chưa được xét.
+    """
+    def __init__(self, renderer, steps: TraversalSteps) -> None:
+        self.renderer = renderer
+        self.steps = steps
+        self.position = 0                   # Số bước đã áp dụng
+        self.node_state = np.zeros(steps.n_nodes, dtype=np.int8)
+        self.edge_state = np.zeros(steps.n_edges, dtype=np.int8)
+        # Danh sách Python cho vòng lặp áp bước (nhanh hơn đọc từng phần tử mảng numpy)
+        self._kind = steps.kind.tolist()
+        self._index = steps.index.tolist()
+        self._state = steps.state.tolist()
+        self._previous = steps.previous.tolist()
+    def __len__(self) -> int:
+        return len(self.steps)
+    @property
+    def finished(self) -> bool:
+        return self.position >= len(self.steps)
+    def seek(self, step: int) -> None: # Đưa trạng thái tới sau bước thứ `step` (tiến hoặc lùi)
+        step = max(0, min(step, len(self.steps)))
+        states = (self.node_state, self.edge_state)
+        kind, index = self._kind, self._index
+        if step > self.position:
+            values = self._state
+            for i in range(self.position, step):
+                states[kind[i]][index[i]] = values[i]
+        else:
+            values = self._previous
+            for i in range(self.position - 1, step - 1, -1):
+                states[kind[i]][index[i]] = values[i]
+        self.position = step
+    def apply(self) -> None: # Đưa trạng thái hiện tại lên lớp trạng thái của bộ vẽ (chưa vẽ)
+        self.renderer.show_states(self.node_state, self.edge_state, NODE_STATE_STYLES, EDGE_STATE_STYLES)
+    def render(self) -> None: # Áp trạng thái hiện tại và blit
+        self.apply()
+        self.renderer.blit()
+    def close(self) -> None: # Xóa lớp trạng thái, trả bộ vẽ về kiểu dáng thường
+        self.renderer.clear_states()
@@ -1,14 +1,20 @@
 from __future__ import annotations
+import queue
+import time
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from tkinter import filedialog, messagebox, ttk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import networkx as nx
+from .edge_parser import EdgeChanges, EdgeTextDiff, IncrementalEdgeParser
 from .graph_data import GraphData
+from .tasks import Progress, TaskRunner
+from .views import PagedEdgeListView, VirtualAdjacencyListView, VirtualMatrixView
 from .graph_io import (
+    apply_commands,
     export_graph_to_file,
     load_karate_club,   
     read_graph_from_file,
+    read_command_script,
     read_graph_from_text,
 )
 class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng (Controller & View).
@@ -16,7 +22,16 @@ class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng
     Lớp chính điều khiển giao diện người dùng (Controller & View).
     Kế thừa từ tk.Tk để tạo cửa sổ chính của ứng dụng.
     """
-    def __init__(self) -> None: # Khởi tạo cửa sổ chính
+    AUTO_UPDATE_DEBOUNCE_MS = 150  # Thời gian chờ (ms) sau lần gõ phím cuối trước khi phân tích
+    PARSE_POLL_MS = 20             # Chu kỳ (ms) kiểm tra kết quả phân tích từ luồng nền
+    LAYOUT_POLL_MS = 40            # Chu kỳ (ms) nhận vị trí trung gian từ luồng tính layout
+    ZOOM_STEP = 1.2                # Hệ số phóng to/thu nhỏ mỗi nấc cuộn chuột
+    TASK_POLL_MS = 50              # Chu kỳ (ms) nhận kết quả và cập nhật tiến độ của các tác vụ nền
+    DRAG_FRAME_MS = 16             # Khoảng cách tối thiểu (ms) giữa hai lần vẽ lại khi kéo đỉnh (~60 khung hình/giây)
+    ANIMATION_FRAME_MS = 16        # Chu kỳ (ms) một khung hình mô phỏng duyệt; nhiều bước có thể gộp trong một khung hình
+    ANIMATION_DEFAULT_SPEED = 200  # Số bước mô phỏng mỗi giây mặc định
+    LARGE_GRAPH_EDGES = 20000      # Số cạnh vượt ngưỡng này: ô cạnh chuyển sang chế độ đồ thị lớn (chỉ đọc, chia trang)
+    def __init__(self, debounce_ms: int | None = None, large_graph_edges: int | None = None) -> None: # Khởi tạo cửa sổ chính
         super().__init__()
         self.title("Graph Manager - Ứng dụng Quản lý Đồ thị")
         self.geometry("1400x900")
@@ -29,20 +44,59 @@ class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng
 
         # Khởi tạo dữ liệu đồ thị rỗng
         self.graph = GraphData()
+        # Bộ phân tích gia tăng cho ô danh sách cạnh (chỉ phân tích lại các dòng thay đổi)
+        self.edge_parser = IncrementalEdgeParser()
+        # Phân tích nội dung ô cạnh được gom nhóm (debounce) và chạy trên một luồng nền
+        self.debounce_ms = self.AUTO_UPDATE_DEBOUNCE_MS if debounce_ms is None else debounce_ms
+        self._auto_update_job = None        # Id của lệnh after() đang chờ
+        self._edit_generation = 0           # Tăng mỗi lần nội dung ô cạnh thay đổi
+        self._parse_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="edge-parser")
+        self._parse_results: queue.Queue = queue.Queue()  # Kết quả từ luồng nền gửi về luồng Tk
+        self._pending_parses = 0            # Số yêu cầu phân tích chưa nhận kết quả
+        # Đồ thị lớn không đi qua văn bản: ô cạnh được thay bằng danh sách chỉ đọc, chia trang,
+        # mọi chỉnh sửa đi qua các nút Thêm/Xóa
+        self.large_graph_edges = self.LARGE_GRAPH_EDGES if large_graph_edges is None else large_graph_edges
+        self.large_mode = False
+        # Các thao tác dài (đọc/xuất file, tải dữ liệu mẫu, ...) chạy nền; kết quả của tác vụ gắn với
+        # đồ thị bị bỏ nếu đồ thị đã thay đổi (đối tượng khác hoặc phiên bản mới) trong lúc chạy
+        self.task_runner = TaskRunner(current_key=lambda: (id(self.graph), self.graph.version))
+        self._task_job = None               # Id của lệnh after() đang chờ kiểm tra tác vụ nền
+        # Giao dịch (batch): các lần cập nhật giao diện bên trong được gom thành một lần khi kết thúc
+        self._batch_depth = 0
+        self._refresh_pending = False
         
         # Các biến phục vụ tính năng kéo thả đỉnh trên Canvas
         self.pos = None            # Vị trí tọa độ (x, y) của các đỉnh
         self.dragging = False      # Trạng thái đang kéo chuột
         self.selected_node = None  # Đỉnh đang được chọn để di chuyển
         self.drag_offset = None    # Độ lệch vị trí khi kéo
+        self._drag_target = None   # Vị trí mới nhất của đỉnh đang kéo (chưa vẽ)
+        self._drag_job = None      # Id của lệnh after() vẽ khung hình kéo tiếp theo
+
+        # Các biến phục vụ mô phỏng thuật toán duyệt
+        self.animation = None      # TraversalAnimation đang hiển thị (None nếu không mô phỏng)
+        self._anim_job = None      # Id của lệnh after() vẽ khung hình mô phỏng tiếp theo
+        self._anim_clock = None    # Thời điểm (perf_counter) của khung hình trước khi đang phát
+        self._anim_carry = 0.0     # Phần lẻ số bước chưa áp dụng (tốc độ không chia hết cho số khung hình)
+        self._anim_autoplay = False  # Phát ngay khi dãy bước tính xong
 
         # Các biến phục vụ tính năng đánh dấu (Highlight)
         self.highlighted_nodes = set()  # Tập hợp các đỉnh được highlight
         self.highlighted_edges = set()  # Tập hợp các cạnh được highlight
 
-        # Xây dựng các widget giao diện và vẽ đồ thị lần đầu
+        # Khung vẽ Matplotlib được tạo trễ (lazy) sau khi cửa sổ đã hiển thị
+        self.figure = None
+        self.ax = None
+        self.canvas = None
+        self.renderer = None       # Bộ vẽ retained-mode (tạo cùng khung vẽ)
+        self.hit_index = None      # Chỉ mục không gian cho việc click đỉnh/cạnh
+        self.layout_engine = None  # Tính layout trên luồng nền (tạo cùng khung vẽ)
+        self.layout_cache = None   # Bộ nhớ đệm vị trí đỉnh trên đĩa (tạo cùng khung vẽ)
+        self._layout_job = None    # Id của lệnh after() đang chờ nhận vị trí từ layout_engine
+
+        # Xây dựng các widget giao diện, khung vẽ sẽ được nạp sau khi cửa sổ hiện lên
         self._build_widgets()
-        self._draw_graph()
+        self.after(1, self._init_plot_canvas)
     # ------------------------------------------------------------------
     # GIAO DIỆN (UI)
     # ------------------------------------------------------------------
@@ -90,7 +144,14 @@ class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng
         self.edges_entry.configure(yscrollcommand=edges_scrollbar.set)
         self.edges_entry.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         edges_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.edges_entry.bind('<KeyRelease>', lambda e: self._auto_update_graph())
+        self.edges_entry.bind('<KeyRelease>', lambda e: self._schedule_auto_update())
+        self.edges_scrollbar = edges_scrollbar
+        # Chế độ đồ thị lớn: danh sách cạnh chỉ đọc, chia trang (hiện thay cho ô nhập)
+        self.edges_pager = PagedEdgeListView(
+            edges_frame,
+            note=f"Đồ thị lớn (trên {self.large_graph_edges} cạnh): chỉ đọc, thêm/xóa qua mục Thao tác đồ thị.",
+            height=8, width=35,
+        )
 
         # Error label
         self.error_label_var = tk.StringVar(value="")
@@ -110,6 +171,7 @@ class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng
         btn_row2.pack(fill=tk.X, pady=1)
         ttk.Button(btn_row2, text="Xuất file", command=self._export_graph, width=10).pack(side=tk.LEFT, padx=1)
         ttk.Button(btn_row2, text="Reset", command=self._reset_graph, width=10).pack(side=tk.LEFT, padx=1)
+        ttk.Button(btn_row2, text="Chạy lệnh", command=self._run_script, width=10).pack(side=tk.LEFT, padx=1)
 
         # 2. Thao tác nhanh (CRUD)
         crud_frame = ttk.LabelFrame(self.sidebar, text="Thao tác đồ thị", padding=5)
@@ -154,47 +216,95 @@ class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng
         self.density_label_var = tk.StringVar(value="Mật độ: 0.000")
         ttk.Label(hl_frame, textvariable=self.density_label_var, font=('TkDefaultFont', 9, 'bold'), foreground="#2980b9").pack(anchor=tk.E, pady=2)
 
-        # 4. Data View (Ma trận / Danh sách kề) - Dùng Notebook để tiết kiệm chỗ
+        # 4. Mô phỏng thuật toán duyệt (dãy bước tính sẵn, phát lại bằng blitting)
+        anim_frame = ttk.LabelFrame(self.sidebar, text="Mô phỏng duyệt đồ thị", padding=5)
+        anim_frame.pack(fill=tk.X, pady=(0, 5))
+
+        anim_row1 = ttk.Frame(anim_frame)
+        anim_row1.pack(fill=tk.X, pady=2)
+        self.anim_algorithm_var = tk.StringVar(value="BFS")
+        ttk.Combobox(anim_row1, textvariable=self.anim_algorithm_var, values=("BFS", "DFS", "Dijkstra"), state="readonly", width=9).pack(side=tk.LEFT, padx=2)
+        ttk.Label(anim_row1, text="Từ đỉnh:").pack(side=tk.LEFT, padx=2)
+        self.anim_source_entry = ttk.Entry(anim_row1, width=8)
+        self.anim_source_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=2)
+
+        anim_row2 = ttk.Frame(anim_frame)
+        anim_row2.pack(fill=tk.X, pady=2)
+        ttk.Button(anim_row2, text="⏮", width=3, command=lambda: self._step_animation(-1)).pack(side=tk.LEFT, padx=2)
+        self.anim_play_button = ttk.Button(anim_row2, text="▶", width=3, command=self._toggle_animation)
+        self.anim_play_button.pack(side=tk.LEFT, padx=2)
+        ttk.Button(anim_row2, text="⏭", width=3, command=lambda: self._step_animation(1)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(anim_row2, text="⏹", width=3, command=self._stop_animation).pack(side=tk.LEFT, padx=2)
+        self.anim_step_var = tk.StringVar(value="")
+        ttk.Label(anim_row2, textvariable=self.anim_step_var).pack(side=tk.RIGHT, padx=2)
+
+        anim_row3 = ttk.Frame(anim_frame)
+        anim_row3.pack(fill=tk.X, pady=2)
+        ttk.Label(anim_row3, text="Tốc độ (bước/giây):").pack(side=tk.LEFT, padx=2)
+        self.anim_speed_var = tk.DoubleVar(value=self.ANIMATION_DEFAULT_SPEED)
+        ttk.Spinbox(anim_row3, from_=1, to=10000, increment=10, textvariable=self.anim_speed_var, width=8).pack(side=tk.LEFT, padx=2)
+
+        # 5. Data View (Ma trận / Danh sách kề) - Dùng Notebook để tiết kiệm chỗ
         data_notebook = ttk.Notebook(self.sidebar)
         data_notebook.pack(fill=tk.BOTH, expand=True)
 
         # Tab Ma trận
-        matrix_tab = ttk.Frame(data_notebook)
-        data_notebook.add(matrix_tab, text="Ma trận kề")
-        self.matrix_table = ttk.Treeview(matrix_tab, columns=[], show="headings")
-        matrix_scroll_y = ttk.Scrollbar(matrix_tab, orient=tk.VERTICAL, command=self.matrix_table.yview)
-        matrix_scroll_x = ttk.Scrollbar(matrix_tab, orient=tk.HORIZONTAL, command=self.matrix_table.xview)
-        self.matrix_table.configure(yscrollcommand=matrix_scroll_y.set, xscrollcommand=matrix_scroll_x.set)
-        
-        self.matrix_table.grid(row=0, column=0, sticky='nsew')
-        matrix_scroll_y.grid(row=0, column=1, sticky='ns')
-        matrix_scroll_x.grid(row=1, column=0, sticky='ew')
-        matrix_tab.grid_columnconfigure(0, weight=1)
-        matrix_tab.grid_rowconfigure(0, weight=1)
+        # Bảng ảo hóa: chỉ vẽ các ô trong vùng nhìn thấy
+        self.matrix_view = VirtualMatrixView(data_notebook)
+        data_notebook.add(self.matrix_view, text="Ma trận kề")
 
         # Tab Danh sách kề
-        list_tab = ttk.Frame(data_notebook)
-        data_notebook.add(list_tab, text="Danh sách kề")
-        self.adj_list_text = tk.Text(list_tab, state=tk.DISABLED, font=("Consolas", 10))
-        list_scroll = ttk.Scrollbar(list_tab, orient=tk.VERTICAL, command=self.adj_list_text.yview)
-        self.adj_list_text.configure(yscrollcommand=list_scroll.set)
-        self.adj_list_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        list_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        # Danh sách ảo hóa: chỉ đưa các dòng nhìn thấy vào widget Text
+        self.adj_list_view = VirtualAdjacencyListView(data_notebook, font=("Consolas", 10))
+        data_notebook.add(self.adj_list_view, text="Danh sách kề")
 
         # ==================== GRAPH CONTENT ====================
-        
-        plot_frame = ttk.LabelFrame(self.content_area, text="Biểu diễn trực quan")
-        plot_frame.pack(fill=tk.BOTH, expand=True)
-        
+
+        # Thanh trạng thái tác vụ nền: tên tác vụ, tiến độ và nút hủy
+        status_frame = ttk.Frame(self.content_area)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(2, 0))
+        self.task_status_var = tk.StringVar(value="")
+        ttk.Label(status_frame, textvariable=self.task_status_var).pack(side=tk.LEFT, padx=2)
+        self.task_cancel_button = ttk.Button(status_frame, text="Hủy", width=8, command=self._cancel_tasks, state=tk.DISABLED)
+        self.task_cancel_button.pack(side=tk.RIGHT, padx=2)
+        self.task_progress = ttk.Progressbar(status_frame, length=200, maximum=1.0)
+        self.task_progress.pack(side=tk.RIGHT, padx=2)
+
+        self.plot_frame = ttk.LabelFrame(self.content_area, text="Biểu diễn trực quan")
+        self.plot_frame.pack(fill=tk.BOTH, expand=True)
+        # Nhãn tạm thời trong lúc nạp Matplotlib/NetworkX
+        self.plot_placeholder = ttk.Label(self.plot_frame, text="Đang tải khung vẽ...", anchor=tk.CENTER)
+        self.plot_placeholder.pack(fill=tk.BOTH, expand=True)
+    def _init_plot_canvas(self) -> None: # Nạp Matplotlib và tạo khung vẽ sau khi cửa sổ đã hiển thị
+        """
+        Import Matplotlib (backend TkAgg) tại lần dùng đầu tiên để cửa sổ xuất hiện ngay,
+        không phải chờ toàn bộ thư viện vẽ được nạp.
+        """
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from .hit_test import HitTestIndex
+        from .layout import LayoutEngine
+        from .layout_cache import LayoutCache
+        from .renderer import GraphRenderer
+
+        self.plot_placeholder.destroy()
         self.figure = Figure(figsize=(5, 4), dpi=100)
         self.ax = self.figure.add_subplot(111)
-        self.canvas = FigureCanvasTkAgg(self.figure, master=plot_frame)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.plot_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.renderer = GraphRenderer(self.ax)
+        self.hit_index = HitTestIndex()
+        self.layout_engine = LayoutEngine()
+        self.layout_cache = LayoutCache()
         
         # Connect events
         self.canvas.mpl_connect('button_press_event', self._on_mouse_press)
         self.canvas.mpl_connect('button_release_event', self._on_mouse_release)
         self.canvas.mpl_connect('motion_notify_event', self._on_mouse_motion)
+        self.canvas.mpl_connect('scroll_event', self._on_scroll)
+
+        # Vẽ đồ thị hiện tại (có thể đã được nạp từ file trong lúc chờ)
+        self._draw_graph()
     # ------------------------------------------------------------------
     # CÁC HÀM XỬ LÝ SỰ KIỆN (EVENT HANDLERS)
     # ------------------------------------------------------------------
@@ -299,80 +409,114 @@ class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng
             self._refresh_views()
         except ValueError as exc: # Nếu có lỗi, hiển thị thông báo
             messagebox.showerror("Lỗi nhập liệu", str(exc))
-    def _auto_update_graph(self) -> None: # Tự động cập nhật đồ thị khi nhập danh sách cạnh
-        try:
-            # Xóa thông báo lỗi cũ
-            self.error_label_var.set("")
-            # Trích xuất tất cả đỉnh từ danh sách cạnh
-            edges_nodes = self._extract_nodes_from_edges()
-            if not edges_nodes:
-                # Nếu không có cạnh nào, reset đồ thị
-                self.graph = GraphData(
-                    directed=self.options_var["directed"].get(),
-                    weighted=self.options_var["weighted"].get(),
-                )
-                self.pos = None  # Reset vị trí đỉnh
-                self._refresh_views()
-                return
-            # Sắp xếp danh sách đỉnh
-            nodes_list = sorted(edges_nodes)
+    def _schedule_auto_update(self) -> None: # Hẹn giờ cập nhật đồ thị, gom các lần gõ phím liên tiếp thành một lần
+        # Bỏ qua các phím không làm thay đổi nội dung (mũi tên, Shift, ...)
+        if not self.edges_entry.edit_modified():
+            return
+        self._edit_generation += 1
+        if self._auto_update_job is not None:
+            self.after_cancel(self._auto_update_job)
+        self._auto_update_job = self.after(self.debounce_ms, self._start_auto_update)
+    def _start_auto_update(self) -> None: # Gửi nội dung ô cạnh sang luồng nền để phân tích
+        self._auto_update_job = None
+        generation = self._edit_generation
+        # Các lệnh Tk chỉ được gọi trên luồng chính: lấy nội dung trước khi chuyển sang luồng nền
+        text = self.edges_entry.get("1.0", "end-1c")
+        self.edges_entry.edit_modified(False)
+        future = self._parse_executor.submit(self.edge_parser.diff, text)
+        future.add_done_callback(lambda f: self._parse_results.put((generation, f)))
+        self._pending_parses += 1
+        if self._pending_parses == 1:
+            self.after(self.PARSE_POLL_MS, self._poll_parse_results)
+    def _poll_parse_results(self) -> None: # Nhận kết quả phân tích trên luồng Tk, bỏ qua các kết quả đã cũ
+        latest: tuple[int, Future] | None = None
+        while True:
+            try:
+                item = self._parse_results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending_parses -= 1
+            latest = item
+        if latest is not None:
+            generation, future = latest
+            # Chỉ áp dụng kết quả ứng với lần chỉnh sửa mới nhất
+            if generation == self._edit_generation:
+                try:
+                    diff: EdgeTextDiff = future.result()
+                except Exception as exc:  # noqa: BLE001
+                    self.error_label_var.set(str(exc))
+                else:
+                    # Bộ phân tích đã được đặt lại (ghi nội dung bằng chương trình) -> kết quả không còn đúng
+                    if diff.base_revision == self.edge_parser.revision:
+                        self._apply_auto_update(self.edge_parser.commit(diff))
+        if self._pending_parses > 0:
+            self.after(self.PARSE_POLL_MS, self._poll_parse_results)
+    def _apply_auto_update(self, changes: EdgeChanges) -> None: # Cập nhật đồ thị và giao diện theo thay đổi của ô cạnh
+        """
+        Chỉ áp dụng các thao tác thêm/xóa/cập nhật cạnh tương ứng với các dòng thay đổi
+        lên đồ thị hiện có (giữ nguyên vị trí các đỉnh cũ).
+        """
+        # Xóa thông báo lỗi cũ
+        self.error_label_var.set("")
+        if not changes.is_empty or changes.weighted != self.graph.weighted:
+            self._apply_edge_changes(changes)
             # Tự động cập nhật số lượng đỉnh
-            actual_count = len(nodes_list)
-            current_count = self.nodes_entry.get().strip()
-            if current_count != str(actual_count):
+            actual_count = str(len(self.graph.nodes)) if self.graph.nodes else ""
+            if self.nodes_entry.get().strip() != actual_count:
                 self.nodes_entry.delete(0, tk.END)
-                self.nodes_entry.insert(0, str(actual_count))
-            # Tự động phát hiện trọng số và validate
-            has_weight = False
-            edges_text = self.edges_entry.get("1.0", tk.END).strip()
-            line_num = 0
-            for line in edges_text.splitlines():
-                line = line.strip()
-                line_num += 1
-                if not line:
-                    continue
-                parts = line.split()
-                if len(parts) >= 3:
-                    # Kiểm tra trọng số có hợp lệ không
-                    try:
-                        float(parts[2])
-                        has_weight = True
-                    except ValueError:
-                        raise ValueError(f"Lỗi dòng {line_num}: Trọng số '{parts[2]}' không phải là số hợp lệ")
-            # Tự động tick/untick checkbox trọng số
-            if has_weight != self.options_var["weighted"].get():
-                self.options_var["weighted"].set(has_weight)
-                # Toggle ô trọng số
-                if has_weight:
-                    self.edge_w_entry.config(state=tk.NORMAL)
-                else:
-                    self.edge_w_entry.config(state=tk.DISABLED)
-                    self.edge_w_entry.delete(0, tk.END)
-            # Parse edges với trọng số mặc định là 0 nếu có ít nhất 1 cạnh có trọng số
-            edges = self._parse_edges(None, weighted_flag=has_weight)
-            # Tạo đồ thị mới
-            g = GraphData(
-                directed=self.options_var["directed"].get(),
-                weighted=has_weight,
-            )
-            g.load_from_edges(nodes_list, edges)
-            self.graph = g
-            self.pos = None  # Reset vị trí đỉnh khi cấu trúc đồ thị thay đổi
+                self.nodes_entry.insert(0, actual_count)
             # Cập nhật hiển thị (không cập nhật ô nhập liệu để tránh xóa cursor)
             self._update_matrix()
             self._update_adj_list()
             self._draw_graph()
-            density = self.graph.density()
-            label = f"Mật độ: {density:.3f} ({self.graph.density_label()})"
-            self.density_label_var.set(label)
-        except ValueError as e:
-            # Hiển thị lỗi trong label màu đỏ
-            self.error_label_var.set(str(e))
+            self._update_density()
+        # Hiển thị lỗi của dòng không hợp lệ đầu tiên trong label màu đỏ
+        error = self.edge_parser.first_error()
+        if error:
+            self.error_label_var.set(error)
+    def _apply_edge_changes(self, changes: EdgeChanges) -> None: # Áp dụng các thay đổi từ bộ phân tích gia tăng lên đồ thị
+        # Tự động tick/untick checkbox trọng số
+        if changes.weighted != self.options_var["weighted"].get():
+            self.options_var["weighted"].set(changes.weighted)
+            # Toggle ô trọng số
+            if changes.weighted:
+                self.edge_w_entry.config(state=tk.NORMAL)
+            else:
+                self.edge_w_entry.config(state=tk.DISABLED)
+                self.edge_w_entry.delete(0, tk.END)
+        directed = self.options_var["directed"].get()
+        if changes.weighted != self.graph.weighted or directed != self.graph.directed:
+            # Thuộc tính đồ thị thay đổi: dựng lại toàn bộ từ trạng thái của bộ phân tích
+            g = GraphData(directed=directed, weighted=changes.weighted)
+            g.load_from_edges(self.edge_parser.nodes(), self.edge_parser.edges())
+            self.graph = g
+        else:
+            for node in changes.added_nodes:
+                self.graph.add_node(node)
+            for u, v, weight in changes.upserted_edges:
+                self.graph.add_edge(u, v, weight)
+            for u, v in changes.removed_edges:
+                self.graph.remove_edge(u, v)
+            for node in changes.removed_nodes:
+                self.graph.remove_node(node)
+            # Giữ danh sách đỉnh theo thứ tự từ điển như khi dựng từ đầu
+            if changes.added_nodes:
+                self.graph.nodes.sort()
+        self._prune_positions()
+    def _prune_positions(self) -> None: # Bỏ vị trí của các đỉnh không còn trong đồ thị, giữ nguyên các đỉnh còn lại
+        if self.pos:
+            self.pos = {node: p for node, p in self.pos.items() if node in self.graph.adjacency}
+    def _sync_edge_parser(self) -> None: # Đồng bộ bộ phân tích gia tăng sau khi nội dung ô cạnh được ghi bằng chương trình
+        self.edge_parser.rebase(
+            self.edges_entry.get("1.0", "end-1c"),
+            directed=self.options_var["directed"].get(),
+        )
+        self.edges_entry.edit_modified(False)
     def _on_option_change(self) -> None: # Xử lý khi thay đổi các tùy chọn như 'Có hướng' hoặc 'Có trọng số'.
         old_directed = self.graph.directed
         new_directed = self.options_var["directed"].get()
-        self.graph.directed = new_directed
-        self.graph.weighted = self.options_var["weighted"].get()
+        # Tăng phiên bản: tác vụ nền đang chạy trên đồ thị cũ (xuất file, mô phỏng) bị hủy
+        self.graph.set_options(new_directed, self.options_var["weighted"].get())
         # Nếu chuyển từ vô hướng sang có hướng, cần xóa các cạnh ngược
         if not old_directed and new_directed:
             # Lấy danh sách cạnh từ ô nhập
@@ -397,13 +541,15 @@ class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng
         else:
             self.edge_w_entry.config(state=tk.DISABLED)
             self.edge_w_entry.delete(0, tk.END)  # Xóa giá trị cũ
+        # Bộ phân tích cần biết chế độ có hướng mới để so khớp cạnh
+        self._sync_edge_parser()
+        if self.large_mode:
+            self.edges_pager.set_graph(self.graph)
         # Chỉ cập nhật hiển thị mà KHÔNG cập nhật ô nhập liệu
         self._update_matrix()
         self._update_adj_list()
         self._draw_graph()
-        density = self.graph.density()
-        label = f"Mật độ: {density:.3f} ({self.graph.density_label()})"
-        self.density_label_var.set(label)
+        self._update_density()
     def _import_from_file(self) -> None: # Import từ file
         file_path = filedialog.askopenfilename(
             title="Chọn file đồ thị",
@@ -411,37 +557,13 @@ class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng
         )
         if not file_path:
             return
-        try:
-            # Đọc file (bỏ qua tham số directed/weighted vì sẽ tự động phát hiện)
-            self.graph = read_graph_from_file(file_path)
-            
-            # Tự động cập nhật các checkbox theo dữ liệu đọc được
-            self.options_var["directed"].set(self.graph.directed)
-            self.options_var["weighted"].set(self.graph.weighted)
-            
-            # Toggle ô trọng số dựa trên weighted option
-            if self.graph.weighted:
-                self.edge_w_entry.config(state=tk.NORMAL)
-            else:
-                self.edge_w_entry.config(state=tk.DISABLED)
-                self.edge_w_entry.delete(0, tk.END)
-            
-            self.pos = None  # Reset vị trí đỉnh
-            self._refresh_views()
-            self.nodes_entry.delete(0, tk.END)
-            self.nodes_entry.insert(0, str(len(self.graph.nodes)))
-            self.edges_entry.delete("1.0", tk.END)
-            edges_lines = []
-            for u, nbrs in self.graph.adjacency.items():
-                for v, w in nbrs.items():
-                    if self.graph.directed or u <= v:
-                        if self.graph.weighted:
-                            edges_lines.append(f"{u} {v} {w}")
-                        else:
-                            edges_lines.append(f"{u} {v}")
-            self.edges_entry.insert("1.0", "\n".join(edges_lines))
-        except Exception as exc:  # noqa: BLE001
-            messagebox.showerror("Không đọc được file", str(exc))
+        # Đọc file (bỏ qua tham số directed/weighted vì sẽ tự động phát hiện) trên luồng nền
+        self._run_task(
+            "Đang đọc file", _load_graph_task, lambda progress: read_graph_from_file(file_path, progress=progress), self.large_graph_edges,
+            on_done=self._set_loaded_graph,
+            on_error=lambda exc: messagebox.showerror("Không đọc được file", str(exc)),
+            group="load",
+        )
     def _export_graph(self) -> None: # Xuất đồ thị ra file
         file_path = filedialog.asksaveasfilename(
             defaultextension=".txt",
@@ -450,27 +572,128 @@ class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng
         )
         if not file_path:
             return
-        export_graph_to_file(self.graph, file_path)
-        messagebox.showinfo("Hoàn tất", f"Đã lưu vào {file_path}")
+        # Luồng nền đọc bản chụp (luồng Tk vẫn sửa được đồ thị); bị hủy nếu đồ thị thay đổi trước khi ghi file
+        snapshot = self.graph.snapshot()
+        self._run_task(
+            "Đang xuất file", lambda progress: export_graph_to_file(snapshot, file_path, progress),
+            on_done=lambda _: messagebox.showinfo("Hoàn tất", f"Đã lưu vào {file_path}"),
+            on_error=lambda exc: messagebox.showerror("Không xuất được file", str(exc)),
+            track_key=True,
+        )
+    def _run_script(self) -> None: # Chạy một script chỉnh sửa (add_node/remove_node/add_edge/remove_edge) lên đồ thị hiện tại
+        file_path = filedialog.askopenfilename(
+            title="Chọn script chỉnh sửa",
+            filetypes=[("Text", "*.txt"), ("All files", "*.*")],
+        )
+        if not file_path:
+            return
+        # Đọc và kiểm tra cú pháp trên luồng nền; áp dụng trên luồng Tk trong một giao dịch
+        self._run_task(
+            "Đang đọc script", lambda progress: read_command_script(file_path, progress),
+            on_done=self._apply_script,
+            on_error=lambda exc: messagebox.showerror("Lỗi script", str(exc)),
+            group="load",
+        )
+    def _apply_script(self, commands) -> None: # Áp dụng các lệnh đã phân tích: một phiên bản mới, một lần cập nhật giao diện
+        try:
+            with self.batch():
+                count = apply_commands(self.graph, commands)
+                # Bỏ highlight của các đỉnh/cạnh không còn tồn tại
+                adjacency = self.graph.adjacency
+                self.highlighted_nodes.intersection_update(adjacency)
+                self.highlighted_edges = {
+                    (u, v) for u, v in self.highlighted_edges
+                    if v in adjacency.get(u, {}) or v in adjacency and u in adjacency[v]
+                }
+                self._sync_highlight_inputs()
+                self._refresh_views()
+        except ValueError as exc:
+            messagebox.showerror("Lỗi script", f"{exc}\nĐồ thị không thay đổi.")
+            return
+        messagebox.showinfo("Hoàn tất", f"Đã áp dụng {count} lệnh")
     def _load_karate(self) -> None: # Tải đồ thị Karate Club mẫu
-        self.graph = load_karate_club(directed=self.options_var["directed"].get())
+        directed = self.options_var["directed"].get()
+        self._run_task(
+            "Đang tải Karate Club", _load_graph_task, lambda progress: load_karate_club(directed=directed), self.large_graph_edges,
+            on_done=self._set_loaded_graph,
+            on_error=lambda exc: messagebox.showerror("Không tải được dữ liệu", str(exc)),
+            group="load",
+        )
+    def _set_loaded_graph(self, loaded: tuple[GraphData, str | None]) -> None: # Thay đồ thị hiện tại bằng đồ thị vừa đọc/tải (trên luồng Tk)
+        self.graph, edges_text = loaded
+
+        # Tự động cập nhật các checkbox theo dữ liệu đọc được
+        self.options_var["directed"].set(self.graph.directed)
+        self.options_var["weighted"].set(self.graph.weighted)
+
+        # Toggle ô trọng số dựa trên weighted option
+        if self.graph.weighted:
+            self.edge_w_entry.config(state=tk.NORMAL)
+        else:
+            self.edge_w_entry.config(state=tk.DISABLED)
+            self.edge_w_entry.delete(0, tk.END)
+
         self.pos = None  # Reset vị trí đỉnh
-        self._refresh_views()
+        if edges_text is None:
+            # Đồ thị lớn: không dựng văn bản, ô cạnh hiển thị danh sách chia trang
+            self._refresh_views()
+            return
+        self._update_matrix()
+        self._update_adj_list()
+        self._draw_graph()
+        self._update_density()
+        self._set_large_mode(False)
         self.nodes_entry.delete(0, tk.END)
         self.nodes_entry.insert(0, str(len(self.graph.nodes)))
-        edges_text = []
-        for u, nbrs in self.graph.adjacency.items():
-            for v in nbrs.keys():
-                if self.graph.directed or u <= v:
-                    edges_text.append(f"{u} {v}")
         self.edges_entry.delete("1.0", tk.END)
-        self.edges_entry.insert("1.0", "\n".join(edges_text))
+        self.edges_entry.insert("1.0", edges_text)
+        self._sync_edge_parser()
+    # ------------------------------------------------------------------
+    # Tác vụ nền
+    # ------------------------------------------------------------------
+    def _run_task(self, name: str, fn, *args, **options) -> None: # Gửi một tác vụ cho task_runner và bắt đầu theo dõi tiến độ
+        self.task_runner.submit(name, fn, *args, **options)
+        self._update_task_status()
+        if self._task_job is None:
+            self._task_job = self.after(self.TASK_POLL_MS, self._poll_tasks)
+    def _poll_tasks(self) -> None: # Giao kết quả các tác vụ đã xong trên luồng Tk và cập nhật thanh trạng thái
+        self._task_job = None
+        self.task_runner.poll()
+        self._update_task_status()
+        if self.task_runner.busy:
+            self._task_job = self.after(self.TASK_POLL_MS, self._poll_tasks)
+    def _update_task_status(self) -> None: # Hiển thị tác vụ đang chạy (kể cả tính layout) trên thanh trạng thái
+        active = self.task_runner.active()
+        layout_running = self.layout_engine is not None and self.layout_engine.running
+        if active:
+            task = active[0]
+            more = f" (+{len(active) - 1})" if len(active) > 1 else ""
+            self.task_status_var.set(task.name + more)
+            fraction = task.progress.fraction
+            if fraction is None:
+                self.task_progress.config(mode="indeterminate")
+                self.task_progress.step(0.05)
+            else:
+                self.task_progress.config(mode="determinate", value=fraction)
+        elif layout_running:
+            self.task_status_var.set("Đang tính layout")
+            self.task_progress.config(mode="indeterminate")
+            self.task_progress.step(0.05)
+        else:
+            self.task_status_var.set("")
+            self.task_progress.config(mode="determinate", value=0.0)
+        self.task_cancel_button.config(state=tk.NORMAL if active or layout_running else tk.DISABLED)
+    def _cancel_tasks(self) -> None: # Nút Hủy: dừng mọi tác vụ nền và lần tính layout đang chạy
+        self.task_runner.cancel_all()
+        if self.layout_engine is not None and self.layout_engine.running:
+            self.layout_engine.cancel()
+        self._update_task_status()
     def _add_vertex(self) -> None: # Thêm đỉnh
         name = self.node_name_entry.get().strip()
         if not name:
             messagebox.showwarning("Thông báo", "Vui lòng nhập đỉnh cần thêm")
             return
-        if name in self.graph.nodes:
+        if name in self.graph.adjacency:
             messagebox.showwarning("Trùng tên", "Đỉnh đã tồn tại")
             return
         self.graph.add_node(name)
@@ -585,6 +808,11 @@ class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng
         self.nodes_entry.delete(0, tk.END)
         if len(self.graph.nodes) > 0:
             self.nodes_entry.insert(0, str(len(self.graph.nodes)))
+        # Đồ thị lớn: chỉ trang đang xem của danh sách cạnh được định dạng
+        self._set_large_mode(self.graph.edge_count() > self.large_graph_edges)
+        if self.large_mode:
+            self.edges_pager.set_graph(self.graph)
+            return
         # Cập nhật danh sách cạnh và đỉnh đơn lẻ
         self.edges_entry.delete("1.0", tk.END)
         edges_lines = []
@@ -602,61 +830,63 @@ class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng
             if not self.graph.adjacency.get(node, {}):
                 edges_lines.append(node)
         self.edges_entry.insert("1.0", "\n".join(edges_lines))
+        self._sync_edge_parser()
+    @contextmanager
+    def batch(self): # Giao dịch trên đồ thị hiện tại: gom mọi lần cập nhật giao diện thành một lần khi kết thúc
+        """
+        Bọc GraphData.batch(): các thay đổi trong khối chỉ tạo một phiên bản mới và giao diện chỉ
+        được cập nhật một lần ở khối ngoài cùng. Nếu khối ném ngoại lệ, đồ thị được khôi phục và
+        giao diện không bị cập nhật dở dang.
+        """
+        self._batch_depth += 1
+        try:
+            with self.graph.batch():
+                yield self.graph
+        except BaseException:
+            if self._batch_depth == 1:
+                self._refresh_pending = False
+            raise
+        finally:
+            self._batch_depth -= 1
+        if not self._batch_depth and self._refresh_pending:
+            self._refresh_pending = False
+            self._refresh_views()
     def _refresh_views(self) -> None: # Cập nhật giao diện
+        if self._batch_depth:
+            self._refresh_pending = True    # Đang trong giao dịch: cập nhật một lần khi kết thúc
+            return
         self._update_matrix()
         self._update_adj_list()
         self._update_input_fields()  # Tự động cập nhật ô nhập liệu
         self._draw_graph()
+        self._update_density()
+    def _update_density(self) -> None: # Cập nhật nhãn mật độ
         density = self.graph.density()
         label = f"Mật độ: {density:.3f} ({self.graph.density_label()})"
         self.density_label_var.set(label)
-    def _update_matrix(self) -> None: # Cập nhật ma trận kề
-        matrix = self.graph.adjacency_matrix()
-        # Xóa tất cả columns và rows cũ
-        for col in self.matrix_table["columns"]:
-            self.matrix_table.heading(col, text="")
-            self.matrix_table.column(col, width=70)
-        self.matrix_table.delete(*self.matrix_table.get_children())
-        # Nếu đồ thị rỗng, không hiển thị gì
-        if len(self.graph.nodes) == 0:
-            self.matrix_table["columns"] = []
+    def _set_large_mode(self, enabled: bool) -> None: # Chuyển ô cạnh giữa ô nhập văn bản và danh sách chỉ đọc chia trang
+        if enabled == self.large_mode:
             return
-        # Hiển thị ma trận kề bình thường
-        columns = ["#"] + self.graph.nodes
-        self.matrix_table["columns"] = columns
-        for col in columns:
-            self.matrix_table.heading(col, text=col)
-            self.matrix_table.column(col, width=60, anchor=tk.CENTER)
-        for idx, row in enumerate(matrix):
-            u = self.graph.nodes[idx]
-            values = [u]
-            for col_idx, val in enumerate(row):
-                v = self.graph.nodes[col_idx]
-                if u == v:
-                    values.append("0")
-                else:
-                    if self.graph.weighted:
-                        weight = self.graph.adjacency.get(u, {}).get(v)
-                        if weight is None or weight == float('inf'):
-                            values.append("∞")
-                        else:
-                            values.append(f"{weight:g}")
-                    else:
-                        values.append(f"{val:g}")
-            self.matrix_table.insert("", tk.END, values=values)
+        self.large_mode = enabled
+        if enabled:
+            self.edges_entry.pack_forget()
+            self.edges_scrollbar.pack_forget()
+            self.edges_pager.pack(fill=tk.BOTH, expand=True)
+            # Giải phóng văn bản cũ; bộ phân tích gia tăng không còn theo dõi ô cạnh
+            self.edges_entry.delete("1.0", tk.END)
+            self._sync_edge_parser()
+            self.error_label_var.set("")
+        else:
+            self.edges_pager.pack_forget()
+            self.edges_pager.clear()
+            self.edges_entry.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            self.edges_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    def _update_matrix(self) -> None: # Cập nhật ma trận kề
+        # Bảng ảo hóa tự lấy giá trị các ô nhìn thấy từ GraphData khi vẽ
+        self.matrix_view.set_graph(self.graph)
     def _update_adj_list(self) -> None: # Cập nhật danh sách kề
-        adj_list = self.graph.adjacency_list()
-        self.adj_list_text.configure(state=tk.NORMAL)
-        self.adj_list_text.delete("1.0", tk.END)
-        lines = []
-        arrow = "→"
-        for node, neighbors in adj_list.items():
-            if neighbors:
-                lines.append(f"{node} {arrow} {', '.join(neighbors)}")
-            else:
-                lines.append(f"{node} {arrow} ∅")
-        self.adj_list_text.insert("1.0", "\n".join(lines))
-        self.adj_list_text.configure(state=tk.DISABLED)
+        # Chỉ các đỉnh thay đổi được định dạng lại, chỉ các dòng nhìn thấy được vẽ
+        self.adj_list_view.set_graph(self.graph)
     def _parse_highlights(self): # Trả về danh sách nodes và edges được highlight từ internal state
         return list(self.highlighted_nodes), list(self.highlighted_edges)
     def _sync_highlight_inputs(self): # Đồng bộ highlight input boxes với internal state
@@ -708,188 +938,73 @@ class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng
         self.highlighted_edges = new_edges
         # Sau khi cập nhật trạng thái highlight nội bộ, vẽ lại đồ thị
         self._draw_graph()
-    def _draw_graph(self) -> None: # Vẽ đồ thị lên khung Canvas sử dụng Matplotlib và NetworkX
-        self.ax.clear()
-        nx_graph = self.graph.to_networkx()
-        # Chỉ tính toán lại layout nếu chưa có hoặc số đỉnh thay đổi
-        if self.pos is None or set(self.pos.keys()) != set(nx_graph.nodes()):
-            self.pos = nx.spring_layout(nx_graph, seed=42)
+    def _draw_graph(self) -> None: # Vẽ đồ thị lên khung Canvas (artist chỉ được tạo lại khi cấu trúc đồ thị thay đổi)
+        if self.canvas is None:
+            return  # Khung vẽ chưa được nạp, _init_plot_canvas sẽ vẽ lại sau
+        self._stop_animation()
+        self._ensure_layout()
         highlight_nodes, highlight_edges = self._parse_highlights()
-        # Màu nền đỉnh: luôn trắng
-        node_colors = ["white" for _ in nx_graph.nodes()]
-        # Viền đỉnh: đỉnh highlight có viền đen đậm, đỉnh thường viền xám nhạt
-        default_edge_color = "#95a5a6"
-        node_edgecolors = []
-        node_linewidths = []
-        for node in nx_graph.nodes():
-            if node in highlight_nodes:
-                node_edgecolors.append("black")
-                node_linewidths.append(3.0)
-            else:
-                node_edgecolors.append(default_edge_color)
-                node_linewidths.append(2.0)
-        # Cạnh highlight: màu đen đậm, dày hơn; cạnh thường xám nhạt, mỏng hơn
-        edge_colors = []
-        edge_widths = []
-        for u, v in nx_graph.edges():
-            is_highlighted = (u, v) in highlight_edges or (
-                not self.graph.directed and (v, u) in highlight_edges
-            )
-            if is_highlighted:
-                edge_colors.append("black")
-                edge_widths.append(2.5)
-            else:
-                edge_colors.append(default_edge_color)
-                edge_widths.append(1.5)
-        # Vẽ cạnh trước
-        if self.graph.directed:
-            # Đồ thị có hướng - sử dụng FancyArrowPatches với margin
-            nx.draw_networkx_edges(
-                nx_graph,
-                self.pos,
-                ax=self.ax,
-                edge_color=edge_colors,
-                arrows=True,
-                width=edge_widths,
-                arrowsize=20,
-                arrowstyle='->',
-                min_source_margin=15,
-                min_target_margin=15,
-                node_size=700,
-            )
-        else:
-            # Đồ thị vô hướng - sử dụng LineCollection đơn giản
-            nx.draw_networkx_edges(
-                nx_graph,
-                self.pos,
-                ax=self.ax,
-                edge_color=edge_colors,
-                width=edge_widths,
-            )
-        # Vẽ đỉnh với border màu đen nhạt
-        nx.draw_networkx_nodes(
-            nx_graph,
-            self.pos,
-            ax=self.ax,
-            node_color=node_colors,
-            node_size=700,
-            edgecolors=node_edgecolors,
-            linewidths=node_linewidths,
-        )
-        # Vẽ label đỉnh
-        nx.draw_networkx_labels(
-            nx_graph,
-            self.pos,
-            ax=self.ax,
-            font_size=10,
-        )
-        # Vẽ trọng số phía trên cạnh (nếu có)
-        if self.graph.weighted:
-            import numpy as np
-            labels = nx.get_edge_attributes(nx_graph, "weight")
-            for (u, v), weight in labels.items():
-                # Lấy tọa độ của hai đỉnh
-                x1, y1 = self.pos[u]
-                x2, y2 = self.pos[v]
-                # Tính điểm giữa cạnh
-                mid_x = (x1 + x2) / 2
-                mid_y = (y1 + y2) / 2
-                # Tính góc của cạnh để xác định hướng offset
-                dx = x2 - x1
-                dy = y2 - y1
-                # Tránh chia cho 0
-                length = np.sqrt(dx**2 + dy**2)
-                if length < 0.001:
-                    length = 0.001
-                # Tính vector vuông góc đơn vị
-                # Vector vuông góc (quay 90 độ ngược chiều kim đồng hồ)
-                perp_x = -dy / length
-                perp_y = dx / length
-                # Offset cố định trong không gian màn hình (points)
-                # 9 points ≈ 0.3cm trên màn hình chuẩn
-                offset_points = 9
-                # Định dạng nhãn trọng số: hiển thị ∞ nếu là vô cùng
-                weight_label = "∞" if weight == float('inf') else f"{weight:g}"
-                
-                # Vẽ label với offset points (khoảng cách cố định trên màn hình)
-                self.ax.annotate(
-                    weight_label,
-                    xy=(mid_x, mid_y),  # Vị trí gốc (điểm giữa cạnh)
-                    xytext=(perp_x * offset_points, perp_y * offset_points),  # Offset theo hướng vuông góc
-                    textcoords='offset points',  # Sử dụng offset points thay vì data coordinates
-                    fontsize=9,
-                    ha='center', 
-                    va='center',
-                    bbox=dict(boxstyle="round,pad=0.3", facecolor="white", edgecolor="none", alpha=0.8)
-                )
-        self.ax.axis("off")
-        self.canvas.draw_idle()
+        self.renderer.render(self.graph, self.pos, highlight_nodes, highlight_edges)
+    def _ensure_layout(self) -> None: # Tính vị trí các đỉnh nếu chưa có hoặc tập đỉnh thay đổi
+        """
+        Chỉ tính lại layout khi chưa có vị trí hoặc tập đỉnh thay đổi. Layout chạy trên luồng
+        nền: đồ thị được vẽ ngay với vị trí khởi đầu (đỉnh cũ giữ nguyên chỗ, đỉnh mới đặt cạnh
+        các đỉnh kề), sau đó các vị trí trung gian được cập nhật dần qua _poll_layout().
+        """
+        nodes = self.graph.adjacency.keys()
+        if self.pos and self.pos.keys() == nodes:
+            return
+        # Đồ thị mới nạp (chưa có vị trí): dùng lại vị trí đã lưu của cùng đồ thị hoặc đồ thị gần giống
+        previous = self.pos or self.layout_cache.lookup(self.graph)
+        kept = {node: p for node, p in previous.items() if node in nodes} if previous else None
+        if kept and len(kept) == len(nodes):
+            self.pos = kept  # Chỉ có đỉnh bị xóa: giữ nguyên vị trí các đỉnh còn lại
+            return
+        # Lần chạy trước (nếu có) bị hủy, kết quả cũ của nó sẽ bị bỏ qua
+        self.pos = self.layout_engine.start(self.graph, kept)
+        if self._layout_job is None:
+            self._layout_job = self.after(self.LAYOUT_POLL_MS, self._poll_layout)
+    def _poll_layout(self) -> None: # Nhận vị trí trung gian từ luồng layout và cập nhật hình vẽ tại chỗ
+        self._layout_job = None
+        result = self.layout_engine.poll()
+        if result is not None:
+            positions, finished = result
+            # Bỏ qua nếu tập đỉnh đã đổi (lần chạy mới sẽ gửi kết quả riêng)
+            if positions.keys() == self.graph.adjacency.keys():
+                self.pos = positions
+                self.renderer.update_positions(self.pos)
+                self.renderer.autoscale()
+                self.canvas.draw_idle()
+                if finished:
+                    self._save_layout()
+        if self.layout_engine.error is not None:
+            error, self.layout_engine.error = self.layout_engine.error, None
+            messagebox.showerror("Lỗi layout", f"Không tính được vị trí đỉnh: {error}")
+        if self.layout_engine.running:
+            self._layout_job = self.after(self.LAYOUT_POLL_MS, self._poll_layout)
+        self._update_task_status()
+    def _save_layout(self) -> None: # Lưu vị trí hiện tại vào bộ nhớ đệm để lần mở lại không phải tính layout
+        if self.layout_cache is not None and self.pos and self.pos.keys() == self.graph.adjacency.keys():
+            # Khóa/MinHash được nhớ theo phiên bản đồ thị (kéo thả không tính lại); ghi đĩa chạy nền
+            pending = self.layout_cache.prepare_store(self.graph, self.pos)
+            if pending is not None:
+                self._run_task("Đang lưu layout", lambda progress: pending.write())
     # ------------------------------------------------------------------
     # Mouse event handlers cho kéo thả đỉnh và highlight
     # ------------------------------------------------------------------
-    def _data_to_display_coords(self, pos): # Chuyển đổi tọa độ dữ liệu (data coords) sang tọa độ màn hình (display pixel coords)
-        x, y = pos
-        # ax.transData.transform trả về (x_screen, y_screen)
-        screen_point = self.ax.transData.transform((x, y))
-        return screen_point
     def _get_clicked_node(self, event_x, event_y, radius=20): # Tìm đỉnh được click dựa trên tọa độ pixel, trả về tên đỉnh hoặc None
-        if self.pos is None:
+        if self.pos is None or self.renderer is None:
             return None
-        
-        # Duyệt qua các node, chuyển tọa độ node sang pixel và so sánh khoảng cách
-        clicked_node = None
-        min_dist = float('inf')
-
-        for node, (nx, ny) in self.pos.items():
-            screen_x, screen_y = self._data_to_display_coords((nx, ny))
-            # Tính khoảng cách Euclidean
-            dist = ((screen_x - event_x)**2 + (screen_y - event_y)**2)**0.5
-            
-            if dist < radius and dist < min_dist:
-                min_dist = dist
-                clicked_node = node
-        
-        return clicked_node
+        # Tra cứu trong chỉ mục lưới (chỉ dựng lại khi vị trí đỉnh hoặc khung nhìn thay đổi)
+        return self.hit_index.nearest_node(self.renderer, event_x, event_y, radius)
     def _get_clicked_edge(self, event_x, event_y, threshold=10): # Tìm cạnh được click dựa trên tọa độ pixel
-        import numpy as np
-        if self.pos is None:
+        if self.pos is None or self.renderer is None:
             return None
-            
-        nx_graph = self.graph.to_networkx()
-        min_dist = float('inf')
-        clicked_edge = None
-
-        for u, v in nx_graph.edges():
-            # Lấy tọa độ pixel của 2 đầu mút
-            p1 = self._data_to_display_coords(self.pos[u])
-            p2 = self._data_to_display_coords(self.pos[v])
-            x1, y1 = p1
-            x2, y2 = p2
-            
-            # Tính khoảng cách từ điểm click (event_x, event_y) đến đoạn thẳng (p1, p2)
-            dx = x2 - x1
-            dy = y2 - y1
-            length_sq = dx*dx + dy*dy
-            
-            if length_sq < 0.00001: 
-                continue
-                
-            # Tham số t
-            t = max(0, min(1, ((event_x - x1) * dx + (event_y - y1) * dy) / length_sq))
-            
-            proj_x = x1 + t * dx
-            proj_y = y1 + t * dy
-            
-            dist = np.sqrt((event_x - proj_x)**2 + (event_y - proj_y)**2)
-            
-            if dist < threshold and dist < min_dist:
-                min_dist = dist
-                clicked_edge = (u, v)
-
-        return clicked_edge
+        return self.hit_index.nearest_edge(self.renderer, event_x, event_y, threshold)
     def _on_mouse_press(self, event): # Xử lý khi nhấn chuột: Xác định mục tiêu (Node/Edge) để Highlight hoặc Drag
         if event.inaxes != self.ax or self.pos is None:
             return
+        self._stop_animation()
             
         # Lưu tọa độ pixel của điểm click
         self.drag_start_screen = (event.x, event.y)
@@ -912,6 +1027,8 @@ class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng
             else:
                 self.drag_offset = (0, 0)
                 
+            # Người dùng tự đặt vị trí: dừng layout nền để đỉnh không bị kéo lệch khỏi con trỏ
+            self.layout_engine.cancel()
             self.canvas.get_tk_widget().config(cursor="hand2")
             return
 
@@ -946,15 +1063,20 @@ class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng
             self.is_dragging_active = True
         
         if self.is_dragging_active:
-            # Logic Drag: cập nhật vị trí node
+            # Chỉ ghi nhận vị trí mới nhất; mỗi khoảng DRAG_FRAME_MS vẽ lại tối đa một lần
             dx, dy = self.drag_offset if self.drag_offset else (0, 0)
-            new_x = event.xdata + dx
-            new_y = event.ydata + dy
-            self.pos[self.selected_node] = (new_x, new_y)
-            try:
-                self._draw_graph()
-            except:
-                pass
+            self._drag_target = (event.xdata + dx, event.ydata + dy)
+            if self._drag_job is None:
+                self._drag_job = self.after(self.DRAG_FRAME_MS, self._apply_drag)
+    def _apply_drag(self) -> None: # Vẽ một khung hình kéo: đưa đỉnh tới vị trí mới nhất, chỉ blit phần liên thuộc
+        self._drag_job = None
+        if self._drag_target is None or self.selected_node is None:
+            return
+        self.pos[self.selected_node] = self._drag_target
+        self._drag_target = None
+        self.renderer.begin_animation(nodes=[self.selected_node])
+        self.renderer.update_positions(self.pos, nodes=[self.selected_node])
+        self.renderer.blit()
     def _on_mouse_release(self, event): # Xử lý khi thả chuột: Thực hiện Highlight nếu là Click (không Drag)
         # Nếu đã drag thực sự -> không highlight
         if not self.is_dragging_active and self.click_target is not None:
@@ -976,6 +1098,16 @@ class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng
             # Cập nhật giao diện
             self._sync_highlight_inputs()
             self._draw_graph()
+        elif self.is_dragging_active:
+            # Kết thúc kéo: vẽ vị trí cuối cùng còn chờ, trả về chế độ vẽ thường và căn lại khung nhìn
+            if self._drag_job is not None:
+                self.after_cancel(self._drag_job)
+                self._drag_job = None
+            self._apply_drag()
+            self.renderer.end_animation()
+            self.renderer.autoscale()
+            self.canvas.draw_idle()
+            self._save_layout()  # Giữ lại vị trí người dùng đã sắp xếp
 
         # Reset states
         self.dragging = False
@@ -984,6 +1116,135 @@ class GraphApp(tk.Tk): # Lớp chính điều khiển giao diện người dùng
         self.click_target = None
         self.drag_offset = None
         self.canvas.get_tk_widget().config(cursor="")
+    def _on_scroll(self, event): # Cuộn chuột: phóng to/thu nhỏ quanh con trỏ, mức chi tiết được tính lại theo khung nhìn mới
+        if event.inaxes != self.ax or event.xdata is None or self.dragging:
+            return
+        factor = 1 / self.ZOOM_STEP if event.button == 'up' else self.ZOOM_STEP
+        if self.animation is not None:
+            # Nền đã chụp không còn đúng với khung nhìn mới: chụp lại rồi vẽ tiếp bước hiện tại
+            self.renderer.end_animation()
+            self.renderer.zoom(event.xdata, event.ydata, factor)
+            self.renderer.begin_animation()
+            self.animation.render()
+            return
+        self.renderer.zoom(event.xdata, event.ydata, factor)
+        self.canvas.draw_idle()
+    # ------------------------------------------------------------------
+    # Mô phỏng thuật toán duyệt
+    # ------------------------------------------------------------------
+    def _prepare_animation(self, autoplay: bool = False) -> None: # Tính dãy bước của thuật toán đã chọn trên luồng nền
+        if self.renderer is None or not self.graph.nodes:
+            return
+        self._draw_graph()  # Bảo đảm chỉ số đỉnh/cạnh của bộ vẽ khớp với đồ thị hiện tại
+        self._anim_autoplay = autoplay
+        source = self.anim_source_entry.get().strip() or self.graph.nodes[0]
+        algorithm = self.anim_algorithm_var.get()
+        if source not in self.graph.adjacency:
+            messagebox.showerror("Lỗi", f"Đỉnh '{source}' không tồn tại")
+            return
+        edge_index = {(u, v): e for e, (u, v, _) in enumerate(self.renderer.edges)}
+        # Luồng nền duyệt bản chụp: đồ thị thật có thể bị sửa trên luồng Tk trong lúc tính
+        self._run_task(
+            f"Đang tính {algorithm} từ '{source}'", _traversal_task,
+            self.graph.snapshot(), algorithm, source, dict(self.renderer.node_index), edge_index,
+            on_done=self._start_animation,
+            on_error=lambda e: messagebox.showerror("Lỗi", str(e)),
+            group="animation", track_key=True,
+        )
+    def _start_animation(self, steps) -> None: # Hiển thị bước đầu của dãy bước vừa tính (chế độ blit)
+        from .animation import TraversalAnimation
+
+        self._stop_animation()
+        # Vị trí đỉnh phải đứng yên trong lúc mô phỏng (nền blit được chụp một lần)
+        if self.layout_engine is not None and self.layout_engine.running:
+            self.layout_engine.cancel()
+        self.animation = TraversalAnimation(self.renderer, steps)
+        self.animation.apply()                  # Tạo lớp trạng thái trước khi chụp nền
+        self.renderer.begin_animation()
+        self.renderer.blit()
+        self._update_animation_status()
+        if self._anim_autoplay:
+            self._anim_autoplay = False
+            self._toggle_animation()
+    def _toggle_animation(self) -> None: # Nút phát/tạm dừng (tính dãy bước trước nếu chưa có)
+        if self.animation is None:
+            self._prepare_animation(autoplay=True)
+            return
+        if self._anim_job is not None:
+            self._pause_animation()
+            return
+        if self.animation.finished:
+            self.animation.seek(0)
+        self._anim_clock = time.perf_counter()
+        self._anim_carry = 0.0
+        self.anim_play_button.config(text="⏸")
+        self._anim_job = self.after(self.ANIMATION_FRAME_MS, self._animation_frame)
+    def _pause_animation(self) -> None:
+        if self._anim_job is not None:
+            self.after_cancel(self._anim_job)
+            self._anim_job = None
+        self.anim_play_button.config(text="▶")
+    def _animation_frame(self) -> None: # Một khung hình: áp số bước tương ứng thời gian đã trôi qua rồi blit
+        self._anim_job = None
+        if self.animation is None:
+            return
+        now = time.perf_counter()
+        try:
+            speed = max(float(self.anim_speed_var.get()), 0.0)
+        except (tk.TclError, ValueError):
+            speed = self.ANIMATION_DEFAULT_SPEED
+        steps = (now - self._anim_clock) * speed + self._anim_carry
+        self._anim_clock = now
+        count = int(steps)
+        self._anim_carry = steps - count
+        if count:
+            self.animation.seek(self.animation.position + count)
+            self.animation.render()
+            self._update_animation_status()
+        if self.animation.finished:
+            self._pause_animation()
+        else:
+            self._anim_job = self.after(self.ANIMATION_FRAME_MS, self._animation_frame)
+    def _step_animation(self, delta: int) -> None: # Nút bước tới/lùi: tạm dừng và đi một bước
+        if self.animation is None:
+            if delta > 0:
+                self._prepare_animation()
+            return
+        self._pause_animation()
+        self.animation.seek(self.animation.position + delta)
+        self.animation.render()
+        self._update_animation_status()
+    def _stop_animation(self) -> None: # Kết thúc mô phỏng, trả lại kiểu dáng thường
+        if self.animation is None:
+            return
+        self._pause_animation()
+        self.renderer.end_animation()
+        self.animation.close()
+        self.animation = None
+        self.anim_step_var.set("")
+    def _update_animation_status(self) -> None: # Hiển thị bước hiện tại / tổng số bước
+        self.anim_step_var.set(f"Bước {self.animation.position}/{len(self.animation)}")
+    def destroy(self) -> None: # Dừng các luồng nền (phân tích, layout) khi đóng cửa sổ
+        self._parse_executor.shutdown(wait=False, cancel_futures=True)
+        self.task_runner.shutdown()
+        if self.layout_engine is not None:
+            self.layout_engine.cancel()
+        super().destroy()
+def _load_graph_task(progress: Progress, loader, max_text_edges: int) -> tuple[GraphData, str | None]: # Tác vụ nền: nạp đồ thị và dựng sẵn nội dung ô danh sách cạnh
+    """Nội dung ô cạnh là None nếu đồ thị có hơn max_text_edges cạnh (chế độ đồ thị lớn)."""
+    graph = loader(progress)
+    if graph.edge_count() > max_text_edges:
+        return graph, None
+    lines = []
+    for u, nbrs in graph.adjacency.items():
+        progress.check()
+        for v, w in nbrs.items():
+            if graph.directed or u <= v:
+                lines.append(f"{u} {v} {w}" if graph.weighted else f"{u} {v}")
+    return graph, "\n".join(lines)
+def _traversal_task(progress: Progress, graph: GraphData, algorithm: str, source: str, node_index, edge_index): # Tác vụ nền: tính dãy bước của thuật toán duyệt
+    from .animation import traversal_steps
+    return traversal_steps(graph, algorithm, source, node_index, edge_index, progress)
 def main() -> None:
     app = GraphApp()
     app.mainloop()
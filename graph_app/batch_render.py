@@ -0,0 +1,221 @@
+from __future__ import annotations
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+FORMATS = ("png", "svg")
+DEFAULT_FIGSIZE = (8.0, 6.0)    # Kích thước ảnh (inch)
+DEFAULT_DPI = 100
+
+@dataclass
+class RenderJob:
+    """Một file đồ thị cần vẽ và nơi lưu ảnh kết quả."""
+    source: str
+    output: str
+    highlighted_nodes: Tuple[str, ...] = ()
+    highlighted_edges: Tuple[Tuple[str, str], ...] = ()
+    seed: int = 42
+
+@dataclass
+class RenderResult:
+    """Kết quả vẽ một file: thời gian từng bước (ms) hoặc thông báo lỗi."""
+    source: str
+    output: str
+    n_nodes: int = 0
+    n_edges: int = 0
+    parse_time: float = 0.0     # Đọc và phân tích file (graph_io)
+    layout_time: float = 0.0    # Tính vị trí đỉnh
+    render_time: float = 0.0    # Dựng artist và ghi ảnh
+    error: Optional[str] = None
+    @property
+    def total_time(self) -> float:
+        return self.parse_time + self.layout_time + self.render_time
+
+# ----------------------------------------------------------------------
+# Tiến trình con: mỗi tiến trình giữ một Figure dùng lại cho mọi file
+# ----------------------------------------------------------------------
+_worker = None
+
+class _Worker:
+    """Figure, canvas Agg và GraphRenderer của một tiến trình con (tạo một lần, dùng cho mọi file)."""
+    def __init__(self, figsize: Tuple[float, float], dpi: int) -> None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from .renderer import GraphRenderer
+
+        class _DeferredCanvas(FigureCanvasAgg):
+            def draw_idle(self, *args, **kwargs) -> None: # Không vẽ ngay: ảnh chỉ được vẽ một lần khi savefig
+                pass
+
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = _DeferredCanvas(self.figure)
+        self.ax = self.figure.add_subplot(111)
+        self.renderer = GraphRenderer(self.ax)
+    def render(self, job: RenderJob) -> RenderResult: # Đọc, tính layout, vẽ và lưu ảnh cho một file
+        from .graph_io import read_graph_from_file
+        from .layout import spring_layout
+
+        result = RenderResult(job.source, job.output)
+        try:
+            start = time.perf_counter()
+            graph = read_graph_from_file(job.source)
+            result.parse_time = (time.perf_counter() - start) * 1000
+            result.n_nodes = len(graph.nodes)
+            result.n_edges = graph.edge_count()
+
+            start = time.perf_counter()
+            pos = spring_layout(graph, seed=job.seed)
+            result.layout_time = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            # Dựng lại toàn bộ artist (không dựa vào khóa cấu trúc: id đồ thị có thể bị dùng lại giữa các file)
+            self.renderer.rebuild(graph, pos, job.highlighted_nodes, job.highlighted_edges)
+            self.figure.savefig(job.output, format=Path(job.output).suffix[1:])
+            result.render_time = (time.perf_counter() - start) * 1000
+        except Exception as e:  # Lỗi của một file không làm dừng cả lô
+            result.error = f"{type(e).__name__}: {e}"
+        return result
+
+def _init_worker(figsize: Tuple[float, float], dpi: int) -> None: # Khởi tạo tiến trình con của pool
+    global _worker
+    _worker = _Worker(figsize, dpi)
+
+def _render_job(job: RenderJob) -> RenderResult: # Hàm chạy trong tiến trình con
+    return _worker.render(job)
+
+# ----------------------------------------------------------------------
+# Tiến trình chính
+# ----------------------------------------------------------------------
+def collect_inputs(patterns: Iterable[str], extension: str = ".txt") -> List[Path]: # Danh sách file đồ thị từ các thư mục, glob hoặc đường dẫn file
+    files: List[Path] = []
+    seen: Set[Path] = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = sorted(p for p in path.iterdir() if p.is_file() and p.suffix == extension)
+        elif path.is_file():
+            matches = [path]
+        else:
+            matches = sorted(Path(p) for p in glob.glob(pattern, recursive=True) if Path(p).is_file())
+        for match in matches:
+            key = match.resolve()
+            if key not in seen:
+                seen.add(key)
+                files.append(match)
+    return files
+
+def plan_jobs( # Gán tên file ảnh cho từng file đồ thị (thêm hậu tố khi trùng tên)
+    files: Sequence[Path],
+    out_dir: Path,
+    fmt: str = "png",
+    highlighted_nodes: Sequence[str] = (),
+    highlighted_edges: Sequence[Tuple[str, str]] = (),
+    seed: int = 42,
+) -> List[RenderJob]:
+    jobs = []
+    used: Set[str] = set()
+    for path in files:
+        name, k = path.stem, 1
+        while name in used:
+            k += 1
+            name = f"{path.stem}_{k}"
+        used.add(name)
+        jobs.append(RenderJob(
+            str(path), str(out_dir / f"{name}.{fmt}"),
+            tuple(highlighted_nodes), tuple(highlighted_edges), seed,
+        ))
+    return jobs
+
+def render_batch( # Vẽ các file trên một pool tiến trình, trả kết quả theo thứ tự hoàn thành
+    jobs: Sequence[RenderJob],
+    workers: Optional[int] = None,
+    figsize: Tuple[float, float] = DEFAULT_FIGSIZE,
+    dpi: int = DEFAULT_DPI,
+    on_result=None,
+) -> List[RenderResult]:
+    """
+    Args:
+        workers: Số tiến trình (mặc định: số CPU, không quá số file)
+        on_result: Hàm gọi lại với mỗi RenderResult ngay khi file đó xong
+    """
+    if not jobs:
+        return []
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(figsize, dpi)) as pool:
+        futures = [pool.submit(_render_job, job) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    return results
+
+def _parse_edge(text: str) -> Tuple[str, str]: # "u-v" -> (u, v)
+    u, sep, v = text.partition("-")
+    if not sep or not u or not v:
+        raise argparse.ArgumentTypeError(f"Cạnh phải có dạng u-v. Nhận được: '{text}'")
+    return (u, v)
+
+def _parse_size(text: str) -> Tuple[float, float]: # "8x6" -> (8.0, 6.0)
+    try:
+        w, h = (float(x) for x in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Kích thước phải có dạng RỘNGxCAO (inch). Nhận được: '{text}'")
+    return (w, h)
+
+def print_result(result: RenderResult) -> None: # In một dòng kết quả
+    name = Path(result.source).name
+    if result.error:
+        print(f"{name:<32} LỖI: {result.error}")
+        return
+    print(
+        f"{name:<32} {result.n_nodes:>8} {result.n_edges:>9} "
+        f"{result.parse_time:>10.1f} {result.layout_time:>10.1f} {result.render_time:>10.1f} {result.total_time:>10.1f}"
+    )
+
+def main(argv: Optional[Sequence[str]] = None) -> int: # Điểm vào dòng lệnh: python -m graph_app.batch_render
+    parser = argparse.ArgumentParser(
+        prog="python -m graph_app.batch_render",
+        description="Vẽ hàng loạt file đồ thị ra ảnh PNG/SVG (không cần giao diện).",
+    )
+    parser.add_argument("inputs", nargs="+", help="Thư mục, mẫu glob hoặc file đồ thị (.txt)")
+    parser.add_argument("-o", "--out-dir", default="renders", help="Thư mục lưu ảnh (mặc định: renders)")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="png", help="Định dạng ảnh")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Số tiến trình (mặc định: số CPU)")
+    parser.add_argument("--size", type=_parse_size, default=DEFAULT_FIGSIZE, help="Kích thước ảnh RỘNGxCAO (inch), mặc định 8x6")
+    parser.add_argument("--dpi", type=int, default=DEFAULT_DPI)
+    parser.add_argument("--seed", type=int, default=42, help="Seed của thuật toán layout")
+    parser.add_argument("--highlight-nodes", nargs="*", default=[], metavar="NODE", help="Các đỉnh được highlight")
+    parser.add_argument("--highlight-edges", nargs="*", type=_parse_edge, default=[], metavar="U-V", help="Các cạnh được highlight")
+    args = parser.parse_args(argv)
+
+    files = collect_inputs(args.inputs)
+    if not files:
+        print("Không tìm thấy file đồ thị nào.", file=sys.stderr)
+        return 1
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = plan_jobs(files, out_dir, args.format, args.highlight_nodes, args.highlight_edges, args.seed)
+
+    print(f"{'File':<32} {'Số đỉnh':>8} {'Số cạnh':>9} {'Đọc (ms)':>10} {'Layout':>10} {'Vẽ':>10} {'Tổng':>10}")
+    print("-" * 96)
+    start = time.perf_counter()
+    results = render_batch(jobs, args.jobs, args.size, args.dpi, on_result=print_result)
+    wall = (time.perf_counter() - start) * 1000
+
+    failed = [r for r in results if r.error]
+    busy = sum(r.total_time for r in results)
+    print("-" * 96)
+    print(f"Đã vẽ {len(results) - len(failed)}/{len(results)} file vào '{out_dir}' trong {wall:.0f} ms "
+          f"(tổng thời gian xử lý {busy:.0f} ms, tăng tốc x{busy / wall if wall else 0:.2f})")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,21 @@
 from __future__ import annotations
-import time
+import argparse
 import random
+import subprocess
 import sys
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
 # Import các module của ứng dụng
 from .graph_data import GraphData
+from .generators import TOPOLOGIES, generate_topology, gnm_random_graph, pair_count
+from .memory_profile import MEMORY_STAGES, MemoryStats, duplicate_ratio, format_bytes, measure_memory_stages
+from .timing import DEFAULT_HARNESS, Harness, TimingStats
+
+MAX_DRAW_NODES = 50_000  # Số đỉnh tối đa được đo thời gian vẽ (layout đa mức + Barnes–Hut)
+MAX_MATRIX_NODES = 5_000  # Số đỉnh tối đa được đo thời gian tạo ma trận kề (V² ô, 25 triệu ô ở mức này)
+DRAW_REPEATS = 5         # Số mẫu tối đa của phép đo thời gian vẽ (mỗi lần vẽ tốn nhiều giây với đồ thị lớn; 5 là mức
+                         # tối thiểu để kiểm định của lệnh compare có thể đạt p < 0.05)
 
 @dataclass
 class BenchmarkResult:
@@ -17,15 +26,82 @@ class BenchmarkResult:
     directed: bool                  # Đồ thị có hướng
     weighted: bool                  # Đồ thị có trọng số
     
-    # Thời gian xử lý cấu trúc dữ liệu (ms)
-    create_structure_time: float    # Thời gian tạo cấu trúc dữ liệu
-    check_edge_time: float          # Thời gian kiểm tra cạnh (1000 lần)
-    get_neighbors_time: float       # Thời gian lấy danh sách kề (1000 lần)
-    create_matrix_time: float       # Thời gian tạo ma trận kề
-    create_adj_list_time: float     # Thời gian tạo danh sách kề
+    # Phân phối thời gian xử lý cấu trúc dữ liệu (ms mỗi lần gọi, xem timing.Harness)
+    create_structure_time: TimingStats   # Thời gian tạo cấu trúc dữ liệu
+    check_edge_time: TimingStats         # Thời gian kiểm tra cạnh (1000 lần)
+    get_neighbors_time: TimingStats      # Thời gian lấy danh sách kề (1000 lần)
+    create_matrix_time: Optional[TimingStats]  # Thời gian tạo ma trận kề (None nếu bỏ qua: quá nhiều đỉnh)
+    create_adj_list_time: TimingStats    # Thời gian tạo danh sách kề
     
     # Thời gian vẽ/hiển thị (ms) - nếu có
-    draw_time: float = 0.0          # Thời gian vẽ đồ thị (Matplotlib)
+    draw_time: Optional[TimingStats] = None  # Thời gian vẽ đồ thị (Matplotlib)
+    
+    # Mô hình sinh đồ thị (xem generators.TOPOLOGIES) và bậc lớn nhất (đỉnh trung tâm)
+    topology: str = "random"
+    max_degree: int = 0
+    
+    # Bộ nhớ theo giai đoạn (xem memory_profile.MEMORY_STAGES), None nếu không đo
+    memory: Optional[Dict[str, MemoryStats]] = None
+
+# Các phép đo thời gian của BenchmarkResult: (tên trường, nhãn hiển thị)
+METRICS: List[Tuple[str, str]] = [
+    ("create_structure_time", "Tạo CTDL"),
+    ("check_edge_time", "Check cạnh (1000x)"),
+    ("get_neighbors_time", "Lấy kề (1000x)"),
+    ("create_matrix_time", "Ma trận kề"),
+    ("create_adj_list_time", "DS kề"),
+    ("draw_time", "Vẽ"),
+]
+
+def _median(stats: Optional[TimingStats]) -> float: # Trung vị của phép đo (0.0 nếu không đo)
+    return stats.median if stats is not None and len(stats) else 0.0
+
+def _model_label(result: "BenchmarkResult") -> str: # Nhãn cột "Mô hình": tên mô hình, thêm CH (có hướng) / TS (có trọng số)
+    label = TOPOLOGIES.get(result.topology, result.topology)
+    if result.directed:
+        label += " CH"
+    if result.weighted:
+        label += " TS"
+    return label
+
+def _cell(stats: Optional[TimingStats], digits: int = 3) -> str: # Ô bảng kết quả: trung vị hoặc N/A
+    return f"{stats.median:.{digits}f}" if stats is not None and len(stats) else "N/A"
+
+def _memory_lines(results: List["BenchmarkResult"]) -> List[str]: # Bảng bộ nhớ theo giai đoạn (tracemalloc + RSS), kèm phần do bản sao trùng lặp
+    lines = []
+    lines.append(f"{'Mô hình':>12} | {'Đỉnh':>6} | {'Mật độ':>8} | {'Số cạnh':>8} | {'Giai đoạn':<20} | {'Cao nhất':>10} | {'Giữ lại':>10} | {'B/đỉnh':>8} | {'B/cạnh':>8} | {'RSS cao nhất':>12} | {'RSS giữ lại':>11}")
+    lines.append("-" * 144)
+    for r in results:
+        if not r.memory:
+            continue
+        for stage, label in MEMORY_STAGES:
+            m = r.memory.get(stage)
+            if m is None:
+                continue
+            lines.append(
+                f"{_model_label(r):>12} | {r.n_nodes:>6} | {r.density*100:>7.0f}% | {r.n_edges:>8} | {label:<20} | "
+                f"{format_bytes(m.peak):>10} | {format_bytes(m.retained):>10} | {m.per_node(r.n_nodes):>8.0f} | {m.per_edge(r.n_edges):>8.0f} | "
+                f"{format_bytes(m.rss_peak):>12} | {format_bytes(m.rss_retained):>11}"
+            )
+        if "refresh" in r.memory:
+            lines.append(f"{'':>12}   -> Bản sao trùng lặp khi refresh: {format_bytes(r.memory['refresh'].retained)} ({duplicate_ratio(r.memory) * 100:.0f}% bộ nhớ đồ thị + bản sao)")
+    lines.append("-" * 144)
+    return lines
+
+def _distribution_lines(results: List["BenchmarkResult"]) -> List[str]: # Bảng phân phối (min/trung vị/p95/độ lệch) của mọi phép đo
+    lines = []
+    lines.append(f"{'Mô hình':>12} | {'Đỉnh':>6} | {'Mật độ':>8} | {'Phép đo':<18} | {'Mẫu':>10} | {'Min':>10} | {'Trung vị':>10} | {'p95':>10} | {'Độ lệch':>10} | {'CV':>6}")
+    lines.append("-" * 124)
+    for r in results:
+        for attr, label in METRICS:
+            stats = getattr(r, attr)
+            if stats is None or not len(stats):
+                continue
+            cv = stats.stdev / stats.mean * 100 if stats.mean else 0.0  # Hệ số biến thiên (%)
+            samples = f"{len(stats)}x{stats.number}"
+            lines.append(f"{_model_label(r):>12} | {r.n_nodes:>6} | {r.density*100:>7.0f}% | {label:<18} | {samples:>10} | {stats.min:>10.3f} | {stats.median:>10.3f} | {stats.p95:>10.3f} | {stats.stdev:>10.3f} | {cv:>5.1f}%")
+    lines.append("-" * 124)
+    return lines
 
 
 def generate_random_graph( # Tạo đồ thị ngẫu nhiên với số đỉnh và mật độ cho trước
@@ -48,167 +124,115 @@ def generate_random_graph( # Tạo đồ thị ngẫu nhiên với số đỉnh
     Returns:
         Tuple gồm danh sách đỉnh và danh sách cạnh
     """
-    # Thiết lập seed để kết quả có thể lặp lại (reproducible)
+    # Thiết lập seed cho module random: các phép đo phía sau (chọn cặp đỉnh ngẫu nhiên) cũng lặp lại được
     if seed is not None:
         random.seed(seed)
     
-    # Bước 1: Tạo danh sách đỉnh từ 0 đến n_nodes-1 (dạng chuỗi)
-    # Ví dụ: n_nodes=5 → nodes = ["0", "1", "2", "3", "4"]
-    nodes = [str(i) for i in range(n_nodes)]
-    
-    # Bước 2: Tính số cạnh tối đa có thể có trong đồ thị
-    # - Đồ thị có hướng: n*(n-1) (mỗi đỉnh nối với n-1 đỉnh khác, 2 chiều)
-    # - Đồ thị vô hướng: n*(n-1)/2 (mỗi cặp đỉnh chỉ có 1 cạnh)
-    if directed:
-        max_edges = n_nodes * (n_nodes - 1)
-    else:
-        max_edges = n_nodes * (n_nodes - 1) // 2
-    
-    # Bước 3: Tính số cạnh mục tiêu dựa trên mật độ
+    # Số cạnh mục tiêu dựa trên mật độ
     # Ví dụ: max_edges=100, density=0.3 → target_edges=30
+    max_edges = pair_count(n_nodes, directed)
     target_edges = int(max_edges * density)
     
-    # Bước 4: Tạo tất cả các cặp đỉnh có thể (không bao gồm cạnh tự nối)
-    all_pairs = []
-    for i in range(n_nodes):
-        for j in range(n_nodes):
-            if i != j:  # Không cho phép cạnh tự nối (i→i)
-                if directed:
-                    # Đồ thị có hướng: thêm cả (i,j) và (j,i)
-                    all_pairs.append((str(i), str(j)))
-                elif i < j:  # Đồ thị vô hướng: chỉ lấy i<j để tránh trùng lặp
-                    all_pairs.append((str(i), str(j)))
-    
-    # Bước 5: Chọn ngẫu nhiên số cạnh cần thiết từ tất cả các cặp có thể
-    # random.sample() đảm bảo không chọn trùng lặp
-    selected_pairs = random.sample(all_pairs, min(target_edges, len(all_pairs)))
-    
-    # Bước 6: Tạo danh sách cạnh với trọng số
-    edges = []
-    for u, v in selected_pairs:
-        if weighted:
-            # Đồ thị có trọng số: random từ 1.0 đến 10.0, làm tròn 1 chữ số
-            weight = round(random.uniform(1.0, 10.0), 1)
-        else:
-            # Đồ thị không trọng số: mặc định = 1.0
-            weight = 1.0
-        edges.append((u, v, weight))
-    
-    # Trả về tuple (danh sách đỉnh, danh sách cạnh)
-    return nodes, edges
+    # Chọn đúng target_edges cặp đỉnh phân biệt mà không dựng danh sách mọi cặp (O(V²) bộ nhớ):
+    # G(n, m) lấy mẫu trực tiếp trên chỉ số cặp, O(V + E)
+    return gnm_random_graph(n_nodes, target_edges, directed, weighted, seed)
 
-def measure_create_structure(nodes: List[str], edges: List[Tuple], directed: bool, weighted: bool) -> Tuple[GraphData, float]: # Đo thời gian tạo cấu trúc dữ liệu đồ thị
+def measure_create_structure( # Đo thời gian tạo cấu trúc dữ liệu đồ thị
+    nodes: List[str], edges: List[Tuple], directed: bool, weighted: bool, harness: Harness = DEFAULT_HARNESS
+) -> Tuple[GraphData, TimingStats]:
     """
     Đo thời gian tạo cấu trúc dữ liệu đồ thị.
     
     Returns:
-        Tuple gồm đối tượng GraphData và thời gian (ms)
+        Tuple gồm đối tượng GraphData (của lần tạo cuối) và phân phối thời gian (ms)
     """
-    # Bắt đầu đo thời gian (perf_counter: độ chính xác cao nhất)
-    start = time.perf_counter()
+    built = []
     
-    # Tạo đối tượng GraphData rỗng với các thuộc tính
-    graph = GraphData(directed=directed, weighted=weighted)
-    # Nạp dữ liệu đỉnh và cạnh vào đồ thị (xây dựng cấu trúc adjacency)
-    graph.load_from_edges(nodes, edges)
+    def create() -> None: # Một lần tạo: GraphData rỗng + nạp đỉnh và cạnh (xây dựng cấu trúc adjacency)
+        graph = GraphData(directed=directed, weighted=weighted)
+        graph.load_from_edges(nodes, edges)
+        built[:] = [graph]
     
-    # Tính thời gian đã trôi qua và chuyển từ giây sang milliseconds
-    elapsed = (time.perf_counter() - start) * 1000  # Chuyển sang ms
-    return graph, elapsed  # Trả về đồ thị và thời gian
+    stats = harness.measure(create)
+    return built[0], stats  # Trả về đồ thị và phân phối thời gian
 
-def measure_check_edge(graph: GraphData, iterations: int = 1000) -> float: # Đo thời gian kiểm tra sự tồn tại của cạnh
+def measure_check_edge(graph: GraphData, iterations: int = 1000, harness: Harness = DEFAULT_HARNESS) -> TimingStats: # Đo thời gian kiểm tra sự tồn tại của cạnh
     """
     Đo thời gian kiểm tra sự tồn tại của cạnh.
-    Thực hiện nhiều lần để có kết quả chính xác.
+    Mỗi lần gọi kiểm tra `iterations` cặp đỉnh ngẫu nhiên (cố định giữa các lần lặp).
     
     Returns:
-        Thời gian tổng cộng (ms) cho tất cả iterations
+        Phân phối thời gian (ms) cho `iterations` lần kiểm tra
     """
     # Lấy danh sách tất cả các đỉnh trong đồ thị
     nodes = graph.nodes
     if len(nodes) < 2:
-        return 0.0  # Không đủ đỉnh để tạo cạnh
+        return TimingStats()  # Không đủ đỉnh để tạo cạnh
     
     # Chuẩn bị danh sách các cặp đỉnh ngẫu nhiên để kiểm tra
     # Ví dụ: [("0","5"), ("3","7"), ...] với iterations=1000 cặp
     test_pairs = [(random.choice(nodes), random.choice(nodes)) for _ in range(iterations)]
+    adjacency = graph.adjacency
     
-    # Bắt đầu đo thời gian
-    start = time.perf_counter()
-    for u, v in test_pairs:
-        # Kiểm tra xem có cạnh từ u đến v không
-        # graph.adjacency.get(u, {}) → lấy dict các đỉnh kề của u
-        # v in {...} → kiểm tra v có trong dict đó không
-        _ = v in graph.adjacency.get(u, {})
-    elapsed = (time.perf_counter() - start) * 1000  # Chuyển sang ms
+    def check() -> None: # Kiểm tra xem có cạnh từ u đến v không: v in adjacency.get(u, {})
+        for u, v in test_pairs:
+            _ = v in adjacency.get(u, {})
     
-    return elapsed  # Trả về tổng thời gian cho 1000 lần kiểm tra
+    return harness.measure(check)  # Phân phối thời gian cho 1000 lần kiểm tra
 
-def measure_get_neighbors(graph: GraphData, iterations: int = 1000) -> float: # Đo thời gian lấy danh sách các đỉnh kề
+def measure_get_neighbors(graph: GraphData, iterations: int = 1000, harness: Harness = DEFAULT_HARNESS) -> TimingStats: # Đo thời gian lấy danh sách các đỉnh kề
     """
     Đo thời gian lấy danh sách các đỉnh kề.
     
     Returns:
-        Thời gian tổng cộng (ms) cho tất cả iterations
+        Phân phối thời gian (ms) cho `iterations` lần lấy danh sách kề
     """
     # Lấy danh sách tất cả các đỉnh
     nodes = graph.nodes
     if not nodes:
-        return 0.0  # Đồ thị rỗng
+        return TimingStats()  # Đồ thị rỗng
     
     # Chuẩn bị danh sách các đỉnh ngẫu nhiên để test
     # Ví dụ: ["3", "7", "1", ...] với iterations=1000 đỉnh
     test_nodes = [random.choice(nodes) for _ in range(iterations)]
+    adjacency = graph.adjacency
     
-    # Bắt đầu đo thời gian
-    start = time.perf_counter()
-    for node in test_nodes:
-        # Lấy danh sách các đỉnh kề của node
-        # graph.adjacency.get(node, {}) → dict {láng_giềng: trọng_số}
-        # .keys() → lấy danh sách tên các láng giềng
-        # list(...) → chuyển thành list
-        _ = list(graph.adjacency.get(node, {}).keys())
-    elapsed = (time.perf_counter() - start) * 1000  # Chuyển sang ms
-    
-    return elapsed  # Trả về tổng thời gian cho 1000 lần lấy danh sách kề
+    def neighbors() -> None: # Lấy danh sách tên các láng giềng: list(adjacency.get(node, {}).keys())
+        for node in test_nodes:
+            _ = list(adjacency.get(node, {}).keys())
+    
+    return harness.measure(neighbors)  # Phân phối thời gian cho 1000 lần lấy danh sách kề
 
-def measure_create_matrix(graph: GraphData) -> float: # Đo thời gian tạo ma trận kề
+def measure_create_matrix(graph: GraphData, harness: Harness = DEFAULT_HARNESS) -> TimingStats: # Đo thời gian tạo ma trận kề
     """
-    Đo thời gian tạo ma trận kề.
+    Đo thời gian tạo ma trận kề (list of lists).
+    Ví dụ: [[0, 5, ∞], [∞, 0, 3], [2, ∞, 0]]
     
     Returns:
-        Thời gian (ms)
+        Phân phối thời gian (ms)
     """
-    # Bắt đầu đo thời gian
-    start = time.perf_counter()
-    # Gọi phương thức tạo ma trận kề (list of lists)
-    # Ví dụ: [[0, 5, ∞], [∞, 0, 3], [2, ∞, 0]]
-    _ = graph.adjacency_matrix()
-    elapsed = (time.perf_counter() - start) * 1000  # Chuyển sang ms
-    return elapsed  # Trả về thời gian tạo ma trận
+    return harness.measure(graph.adjacency_matrix)
 
-def measure_create_adj_list(graph: GraphData) -> float: # Đo thời gian tạo danh sách kề
+def measure_create_adj_list(graph: GraphData, harness: Harness = DEFAULT_HARNESS) -> TimingStats: # Đo thời gian tạo danh sách kề
     """
-    Đo thời gian tạo danh sách kề.
+    Đo thời gian tạo danh sách kề (dict).
+    Ví dụ: {"0": ["1", "2"], "1": ["2"], "2": []}
     
     Returns:
-        Thời gian (ms)
+        Phân phối thời gian (ms)
     """
-    # Bắt đầu đo thời gian
-    start = time.perf_counter()
-    # Gọi phương thức tạo danh sách kề (dict)
-    # Ví dụ: {"0": ["1", "2"], "1": ["2"], "2": []}
-    _ = graph.adjacency_list()
-    elapsed = (time.perf_counter() - start) * 1000  # Chuyển sang ms
-    return elapsed  # Trả về thời gian tạo danh sách kề
+    return harness.measure(graph.adjacency_list)
 
-def measure_draw_time(graph: GraphData) -> float: # Đo thời gian vẽ đồ thị bằng Matplotlib + NetworkX
+def measure_draw_time(graph: GraphData, harness: Harness = DEFAULT_HARNESS) -> Optional[TimingStats]: # Đo thời gian vẽ đồ thị bằng Matplotlib + NetworkX
     """
     Đo thời gian vẽ đồ thị bằng Matplotlib + NetworkX.
+    Vị trí đỉnh được tính bằng layout của ứng dụng (graph_app.layout: đa mức + Barnes–Hut
+    cho đồ thị lớn) thay vì nx.spring_layout O(V²) mỗi vòng lặp.
+    Mỗi lần vẽ tốn hàng trăm ms trở lên nên chỉ gọi một lần mỗi mẫu và tối đa DRAW_REPEATS mẫu.
     Lưu ý: Phần này phụ thuộc vào thư viện bên ngoài.
     
     Returns:
-        Thời gian (ms)
+        Phân phối thời gian (ms), hoặc None nếu thiếu thư viện
     """
     try:
         # Import các thư viện cần thiết
@@ -216,16 +240,18 @@ def measure_draw_time(graph: GraphData) -> float: # Đo thời gian vẽ đồ t
         import matplotlib
         matplotlib.use('Agg')  # Sử dụng backend không hiển thị (không mở cửa sổ)
         import matplotlib.pyplot as plt
-        
-        # Bắt đầu đo thời gian
-        start = time.perf_counter()
-        
+        from .layout import spring_layout
+    except ImportError:
+        # Nếu không có NetworkX hoặc Matplotlib → không đo
+        return None
+    
+    def draw() -> None: # Một lần vẽ đầy đủ
         # Bước 1: Chuyển đổi GraphData sang NetworkX Graph
         nx_graph = graph.to_networkx()
         
         # Bước 2: Tính toán vị trí các đỉnh (spring layout - thuật toán lò xo)
         # seed=42 để kết quả nhất quán
-        pos = nx.spring_layout(nx_graph, seed=42)
+        pos = spring_layout(graph, seed=42)
         
         # Bước 3: Vẽ đồ thị (không hiển thị, chỉ tạo trong bộ nhớ)
         fig, ax = plt.subplots(figsize=(8, 6))  # Tạo figure 8x6 inch
@@ -234,14 +260,75 @@ def measure_draw_time(graph: GraphData) -> float: # Đo thời gian vẽ đồ t
         nx.draw_networkx_labels(nx_graph, pos, ax=ax, font_size=8)  # Vẽ label
         
         plt.close(fig)  # Đóng figure để giải phóng bộ nhớ (quan trọng!)
-        
-        # Tính thời gian đã trôi qua
-        elapsed = (time.perf_counter() - start) * 1000  # Chuyển sang ms
-        return elapsed
-        
-    except ImportError:
-        # Nếu không có NetworkX hoặc Matplotlib → trả về 0
-        return 0.0
+    
+    return harness.replace(repeats=min(harness.repeats, DRAW_REPEATS)).measure(draw, number=1)
+
+def _time_import_in_subprocess(statement: str) -> Tuple[float, List[str]]: # Đo thời gian chạy một câu lệnh import trong tiến trình Python mới
+    """
+    Chạy câu lệnh trong một trình thông dịch mới (bộ nhớ đệm module trống - cold start).
+
+    Returns:
+        Tuple gồm thời gian (ms) và danh sách các thư viện nặng đã bị nạp theo
+    """
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = (time.perf_counter() - start) * 1000\n"
+        "heavy = [m for m in ('networkx', 'matplotlib', 'numpy') if m in sys.modules]\n"
+        "print(elapsed)\n"
+        "print(','.join(heavy))\n"
+    )
+    # Chạy từ thư mục gốc của dự án để `import graph_app` hoạt động
+    project_root = Path(__file__).resolve().parent.parent
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.splitlines()
+    elapsed = float(output[0])
+    heavy = [m for m in output[1].split(",") if m] if len(output) > 1 else []
+    return elapsed, heavy
+
+def measure_startup_time(repeats: int = DEFAULT_HARNESS.repeats) -> Dict[str, Tuple[TimingStats, List[str]]]: # Đo thời gian khởi động (cold start) của các module trong gói
+    """
+    Đo thời gian import (cold start) của các module chính và của bộ thư viện vẽ được nạp trễ.
+    Mỗi mẫu chạy trong một tiến trình riêng để không bị ảnh hưởng bởi module đã nạp (không có
+    vòng khởi động: lần chạy đầu tiên cũng là cold start cần đo).
+
+    Returns:
+        Dictionary {tên phép đo: (phân phối thời gian ms, danh sách thư viện nặng đã nạp)}.
+        Phép đo nào không chạy được (thiếu thư viện) sẽ bị bỏ qua.
+    """
+    statements = {
+        "graph_data + graph_io": "import graph_app.graph_io",
+        "graph_app.app": "import graph_app.app",
+        "Matplotlib + NetworkX (nạp trễ)": (
+            "import matplotlib.backends.backend_tkagg, matplotlib.figure, networkx"
+        ),
+    }
+    results: Dict[str, Tuple[TimingStats, List[str]]] = {}
+    for name, statement in statements.items():
+        try:
+            runs = [_time_import_in_subprocess(statement) for _ in range(max(1, repeats))]
+            results[name] = (TimingStats([elapsed for elapsed, _ in runs]), runs[-1][1])
+        except subprocess.CalledProcessError:
+            # Thiếu thư viện (ví dụ: không cài Matplotlib) -> bỏ qua phép đo này
+            continue
+    return results
+
+def print_startup_results(results: Dict[str, Tuple[TimingStats, List[str]]]) -> None: # In kết quả đo thời gian khởi động
+    """In kết quả đo thời gian khởi động."""
+    print("=" * 90)
+    print("  THỜI GIAN KHỞI ĐỘNG (COLD START)")
+    print("=" * 90)
+    print()
+    for name, (elapsed, heavy) in results.items():
+        heavy_str = ", ".join(heavy) if heavy else "không"
+        print(f"  - {name:<35}: {elapsed.median:>9.2f} ms (p95 {elapsed.p95:.2f}, độ lệch {elapsed.stdev:.2f}; thư viện nặng đã nạp: {heavy_str})")
+    print()
 
 def run_single_benchmark( # Chạy benchmark cho một cấu hình đồ thị cụ thể
     n_nodes: int, 
@@ -249,7 +336,10 @@ def run_single_benchmark( # Chạy benchmark cho một cấu hình đồ thị c
     directed: bool = False, 
     weighted: bool = False,
     include_draw: bool = True,
-    seed: int = 42
+    seed: int = 42,
+    topology: str = "random",
+    harness: Harness = DEFAULT_HARNESS,
+    include_memory: bool = False
 ) -> BenchmarkResult:
     """
     Chạy benchmark cho một cấu hình đồ thị cụ thể.
@@ -261,38 +351,50 @@ def run_single_benchmark( # Chạy benchmark cho một cấu hình đồ thị c
         weighted: Đồ thị có trọng số
         include_draw: Có đo thời gian vẽ không
         seed: Random seed
+        topology: Mô hình sinh đồ thị (xem generators.TOPOLOGIES), số cạnh xấp xỉ theo density
+        harness: Cách lặp mỗi phép đo (khởi động, số mẫu, tắt GC)
+        include_memory: Có đo bộ nhớ theo giai đoạn không (chạy sau các phép đo thời gian, dưới tracemalloc)
     
     Returns:
-        BenchmarkResult chứa tất cả kết quả đo
+        BenchmarkResult chứa phân phối thời gian của tất cả phép đo
     """
-    # Bước 1: Tạo đồ thị ngẫu nhiên với cấu hình cho trước
+    # Bước 1: Tạo đồ thị theo mô hình với cấu hình cho trước
     # Trả về: (danh sách đỉnh, danh sách cạnh)
-    nodes, edges = generate_random_graph(n_nodes, density, directed, weighted, seed)
+    if topology == "random":
+        nodes, edges = generate_random_graph(n_nodes, density, directed, weighted, seed)
+    else:
+        random.seed(seed)
+        nodes, edges = generate_topology(topology, n_nodes, density, directed, weighted, seed)
     
     # Bước 2: Đo thời gian tạo cấu trúc dữ liệu (GraphData + load_from_edges)
-    # Trả về: (đối tượng graph, thời gian tạo)
-    graph, create_time = measure_create_structure(nodes, edges, directed, weighted)
+    # Trả về: (đối tượng graph, phân phối thời gian tạo)
+    graph, create_time = measure_create_structure(nodes, edges, directed, weighted, harness)
     
     # Bước 3: Đo thời gian kiểm tra cạnh (1000 lần kiểm tra ngẫu nhiên)
     # Đo hiệu năng tra cứu: v in graph.adjacency.get(u, {})
-    check_edge_time = measure_check_edge(graph)
+    check_edge_time = measure_check_edge(graph, harness=harness)
     
     # Bước 4: Đo thời gian lấy danh sách kề (1000 lần lấy ngẫu nhiên)
     # Đo hiệu năng truy xuất: graph.adjacency.get(node, {}).keys()
-    get_neighbors_time = measure_get_neighbors(graph)
+    get_neighbors_time = measure_get_neighbors(graph, harness=harness)
     
     # Bước 5: Đo thời gian tạo ma trận kề (chuyển đổi adjacency → matrix)
-    # Đo hiệu năng chuyển đổi sang biểu diễn ma trận
-    create_matrix_time = measure_create_matrix(graph)
+    # Đo hiệu năng chuyển đổi sang biểu diễn ma trận (bỏ qua đồ thị lớn: ma trận V x V không vừa bộ nhớ)
+    create_matrix_time = measure_create_matrix(graph, harness) if n_nodes <= MAX_MATRIX_NODES else None
     
     # Bước 6: Đo thời gian tạo danh sách kề (chuyển đổi adjacency → adj_list)
     # Đo hiệu năng chuyển đổi sang biểu diễn danh sách
-    create_adj_list_time = measure_create_adj_list(graph)
+    create_adj_list_time = measure_create_adj_list(graph, harness)
+    
+    # Bước 7: Đo thời gian vẽ (giới hạn MAX_DRAW_NODES đỉnh để tránh quá lâu)
+    draw_time = None
+    if include_draw and n_nodes <= MAX_DRAW_NODES:
+        draw_time = measure_draw_time(graph, harness)
     
-    # Bước 7: Đo thời gian vẽ (chỉ với đồ thị nhỏ/vừa để tránh quá lâu)
-    draw_time = 0.0
-    if include_draw and n_nodes <= 200:  # Giới hạn ≤200 đỉnh
-        draw_time = measure_draw_time(graph)
+    # Bước 8: Đo bộ nhớ (tracemalloc làm chậm mọi cấp phát nên đo riêng, sau các phép đo thời gian)
+    memory = None
+    if include_memory:
+        memory = measure_memory_stages(nodes, edges, directed, weighted, include_matrix=n_nodes <= MAX_MATRIX_NODES)
     
     # Tổng hợp tất cả kết quả vào đối tượng BenchmarkResult
     return BenchmarkResult(
@@ -306,13 +408,19 @@ def run_single_benchmark( # Chạy benchmark cho một cấu hình đồ thị c
         get_neighbors_time=get_neighbors_time,
         create_matrix_time=create_matrix_time,
         create_adj_list_time=create_adj_list_time,
-        draw_time=draw_time
+        draw_time=draw_time,
+        topology=topology,
+        max_degree=max((len(nbrs) for nbrs in graph.adjacency.values()), default=0),
+        memory=memory
     )
 
 def run_full_benchmark( # Chạy benchmark đầy đủ với nhiều cấu hình khác nhau
     sizes: List[int] = None,
     densities: List[float] = None,
-    include_draw: bool = True
+    include_draw: bool = True,
+    topologies: List[str] = None,
+    harness: Harness = DEFAULT_HARNESS,
+    include_memory: bool = False
 ) -> List[BenchmarkResult]:
     """
     Chạy benchmark đầy đủ với nhiều cấu hình khác nhau.
@@ -321,6 +429,9 @@ def run_full_benchmark( # Chạy benchmark đầy đủ với nhiều cấu hìn
         sizes: Danh sách số lượng đỉnh để test
         densities: Danh sách mật độ để test
         include_draw: Có đo thời gian vẽ không
+        topologies: Danh sách mô hình sinh đồ thị (mặc định chỉ "random")
+        harness: Cách lặp mỗi phép đo (khởi động, số mẫu, tắt GC)
+        include_memory: Có đo bộ nhớ theo giai đoạn không
     
     Returns:
         Danh sách các BenchmarkResult
@@ -330,54 +441,71 @@ def run_full_benchmark( # Chạy benchmark đầy đủ với nhiều cấu hìn
         sizes = [50, 200, 500]  # Đồ thị nhỏ, vừa, lớn
     if densities is None:
         densities = [0.1, 0.3, 0.5]  # Thưa (10%), vừa (30%), dày (50%)
+    if topologies is None:
+        topologies = ["random"]
     
     # Danh sách lưu kết quả tất cả các test
     results = []
     print()
     
-    # Vòng lặp qua tất cả các kết hợp (size, density)
-    # Ví dụ: (50, 0.1), (50, 0.3), (50, 0.5), (200, 0.1), ...
-    for n in sizes:
-        for d in densities:
-            # In thông báo đang test (không xuống dòng, flush ngay)
-            print(f"Đang test: {n} đỉnh, mật độ {d*100:.0f}%...", end=" ", flush=True)
-            
-            # Chạy benchmark cho cấu hình này
-            result = run_single_benchmark(
-                n_nodes=n, 
-                density=d, 
-                directed=False,  # Mặc định: vô hướng
-                weighted=False,  # Mặc định: không trọng số
-                include_draw=include_draw
-            )
-            # Thêm kết quả vào danh sách
-            results.append(result)
-            
-            # In thông báo hoàn thành (có số cạnh thực tế)
-            print(f"Hoàn thành ({result.n_edges} cạnh)")
+    # Vòng lặp qua tất cả các kết hợp (topology, size, density)
+    # Ví dụ: (random, 50, 0.1), (random, 50, 0.3), ..., (barabasi_albert, 50, 0.1), ...
+    for topology in topologies:
+        for n in sizes:
+            for d in densities:
+                # In thông báo đang test (không xuống dòng, flush ngay)
+                print(f"Đang test: {TOPOLOGIES[topology]}, {n} đỉnh, mật độ {d*100:.0f}%...", end=" ", flush=True)
+                
+                # Chạy benchmark cho cấu hình này
+                result = run_single_benchmark(
+                    n_nodes=n, 
+                    density=d, 
+                    directed=False,  # Mặc định: vô hướng
+                    weighted=False,  # Mặc định: không trọng số
+                    include_draw=include_draw,
+                    topology=topology,
+                    harness=harness,
+                    include_memory=include_memory
+                )
+                # Thêm kết quả vào danh sách
+                results.append(result)
+                
+                # In thông báo hoàn thành (có số cạnh thực tế)
+                print(f"Hoàn thành ({result.n_edges} cạnh, bậc lớn nhất {result.max_degree})")
     
     print()
     return results  # Trả về danh sách tất cả kết quả
 
 def print_results_table(results: List[BenchmarkResult]) -> None: # In kết quả dưới dạng bảng
-    """In kết quả dưới dạng bảng đẹp."""
+    """In kết quả dưới dạng bảng đẹp: bảng trung vị, rồi bảng phân phối của từng phép đo."""
     
-    print("=" * 130)
+    print("=" * 154)
     print("  KẾT QUẢ ĐÁNH GIÁ HIỆU NĂNG")
-    print("=" * 130)
+    print("=" * 154)
     print()
     
     # Header
-    print(f"{'Đỉnh':>6} | {'Mật độ':>8} | {'Số cạnh':>8} | {'Tạo CTDL':>12} | {'Check cạnh':>12} | {'Lấy kề':>12} | {'Ma trận kề':>12} | {'DS kề':>12} | {'Vẽ':>10}")
-    print(f"{'':>6} | {'':>8} | {'':>8} | {'(ms)':>12} | {'(1000x, ms)':>12} | {'(1000x, ms)':>12} | {'(ms)':>12} | {'(ms)':>12} | {'(ms)':>10}")
-    print("-" * 130)
+    print(f"{'Mô hình':>12} | {'Đỉnh':>6} | {'Mật độ':>8} | {'Số cạnh':>8} | {'Bậc max':>7} | {'Tạo CTDL':>12} | {'Check cạnh':>12} | {'Lấy kề':>12} | {'Ma trận kề':>12} | {'DS kề':>12} | {'Vẽ':>10}")
+    print(f"{'':>12} | {'':>6} | {'':>8} | {'':>8} | {'':>7} | {'(ms, TV)':>12} | {'(1000x, TV)':>12} | {'(1000x, TV)':>12} | {'(ms, TV)':>12} | {'(ms, TV)':>12} | {'(ms, TV)':>10}")
+    print("-" * 154)
     
     for r in results:
-        draw_str = f"{r.draw_time:.2f}" if r.draw_time > 0 else "N/A"
-        print(f"{r.n_nodes:>6} | {r.density*100:>7.0f}% | {r.n_edges:>8} | {r.create_structure_time:>12.3f} | {r.check_edge_time:>12.3f} | {r.get_neighbors_time:>12.3f} | {r.create_matrix_time:>12.3f} | {r.create_adj_list_time:>12.3f} | {draw_str:>10}")
+        print(f"{_model_label(r):>12} | {r.n_nodes:>6} | {r.density*100:>7.0f}% | {r.n_edges:>8} | {r.max_degree:>7} | {_cell(r.create_structure_time):>12} | {_cell(r.check_edge_time):>12} | {_cell(r.get_neighbors_time):>12} | {_cell(r.create_matrix_time):>12} | {_cell(r.create_adj_list_time):>12} | {_cell(r.draw_time, 2):>10}")
+    
+    print("-" * 154)
+    print("  TV: trung vị các mẫu (ms mỗi lần gọi); CH: có hướng, TS: có trọng số")
+    print()
     
-    print("-" * 130)
+    print("PHÂN PHỐI THỜI GIAN (ms mỗi lần gọi; Mẫu = số mẫu x số lần gọi mỗi mẫu; CV = độ lệch / trung bình):")
+    for line in _distribution_lines(results):
+        print(line)
     print()
+    
+    if any(r.memory for r in results):
+        print("BỘ NHỚ THEO GIAI ĐOẠN (tracemalloc; B/đỉnh, B/cạnh tính trên phần giữ lại; RSS gồm cả bộ nhớ chưa trả lại hệ điều hành):")
+        for line in _memory_lines(results):
+            print(line)
+        print()
 
 def print_analysis(results: List[BenchmarkResult]) -> None: # In phân tích kết quả
     """In phân tích kết quả."""
@@ -394,8 +522,8 @@ def print_analysis(results: List[BenchmarkResult]) -> None: # In phân tích k
     sizes = sorted(set(r.n_nodes for r in results))
     for size in sizes:
         size_results = [r for r in results if r.n_nodes == size]
-        avg_create = sum(r.create_structure_time for r in size_results) / len(size_results)
-        avg_matrix = sum(r.create_matrix_time for r in size_results) / len(size_results)
+        avg_create = sum(_median(r.create_structure_time) for r in size_results) / len(size_results)
+        avg_matrix = sum(_median(r.create_matrix_time) for r in size_results) / len(size_results)
         print(f"  - {size} đỉnh: Tạo CTDL TB = {avg_create:.3f} ms, Ma trận kề TB = {avg_matrix:.3f} ms")
     
     print()
@@ -407,21 +535,37 @@ def print_analysis(results: List[BenchmarkResult]) -> None: # In phân tích k
     densities = sorted(set(r.density for r in results))
     for density in densities:
         density_results = [r for r in results if r.density == density]
-        avg_create = sum(r.create_structure_time for r in density_results) / len(density_results)
+        avg_create = sum(_median(r.create_structure_time) for r in density_results) / len(density_results)
         avg_edges = sum(r.n_edges for r in density_results) / len(density_results)
         print(f"  - Mật độ {density*100:.0f}%: Số cạnh TB = {avg_edges:.0f}, Tạo CTDL TB = {avg_create:.3f} ms")
     
     print()
     
-    # 3. So sánh thời gian xử lý vs vẽ
+    # 3. Phân tích theo mô hình (bậc lệch ảnh hưởng tới danh sách kề và layout)
+    topologies = list(dict.fromkeys(r.topology for r in results))
+    if len(topologies) > 1:
+        print("PHÂN TÍCH THEO MÔ HÌNH ĐỒ THỊ:")
+        print("-" * 60)
+        for topology in topologies:
+            topo_results = [r for r in results if r.topology == topology]
+            avg_create = sum(_median(r.create_structure_time) for r in topo_results) / len(topo_results)
+            avg_adj = sum(_median(r.create_adj_list_time) for r in topo_results) / len(topo_results)
+            drawn = [_median(r.draw_time) for r in topo_results if r.draw_time is not None]
+            draw_str = f"{sum(drawn) / len(drawn):.2f} ms" if drawn else "N/A"
+            max_degree = max(r.max_degree for r in topo_results)
+            print(f"  - {TOPOLOGIES.get(topology, topology)}: Bậc lớn nhất = {max_degree}, Tạo CTDL TB = {avg_create:.3f} ms, DS kề TB = {avg_adj:.3f} ms, Vẽ TB = {draw_str}")
+        print()
+    
+    # 4. So sánh thời gian xử lý vs vẽ
     print("SO SÁNH THỜI GIAN XỬ LÝ DỮ LIỆU vs VẼ ĐỒ THỊ:")
     print("-" * 60)
     
     for r in results:
-        if r.draw_time > 0:
-            total_process = r.create_structure_time + r.create_matrix_time + r.create_adj_list_time
-            ratio = r.draw_time / total_process if total_process > 0 else 0
-            print(f"  • {r.n_nodes} đỉnh, {r.density*100:.0f}%: Xử lý = {total_process:.2f} ms, Vẽ = {r.draw_time:.2f} ms (gấp {ratio:.1f}x)")
+        if r.draw_time is not None:
+            total_process = _median(r.create_structure_time) + _median(r.create_matrix_time) + _median(r.create_adj_list_time)
+            draw_time = _median(r.draw_time)
+            ratio = draw_time / total_process if total_process > 0 else 0
+            print(f"  • {TOPOLOGIES.get(r.topology, r.topology)}, {r.n_nodes} đỉnh, {r.density*100:.0f}%: Xử lý = {total_process:.2f} ms, Vẽ = {draw_time:.2f} ms (gấp {ratio:.1f}x)")
     
     print()
     
@@ -438,44 +582,139 @@ def export_results_to_file(results: List[BenchmarkResult], filepath: str = None)
     lines = []
     # Bảng kết quả
     lines.append("BẢNG KẾT QUẢ CHI TIẾT:")
-    lines.append("-" * 110)
-    lines.append(f"{'Đỉnh':>6} | {'Mật độ':>8} | {'Số cạnh':>8} | {'Tạo CTDL':>12} | {'Check cạnh':>12} | {'Lấy kề':>12} | {'Ma trận kề':>12} | {'DS kề':>12}")
-    lines.append(f"{'':>6} | {'':>8} | {'':>8} | {'(ms)':>12} | {'(1000x, ms)':>12} | {'(1000x, ms)':>12} | {'(ms)':>12} | {'(ms)':>12}")
-    lines.append("-" * 110)
+    lines.append("-" * 134)
+    lines.append(f"{'Mô hình':>12} | {'Đỉnh':>6} | {'Mật độ':>8} | {'Số cạnh':>8} | {'Bậc max':>7} | {'Tạo CTDL':>12} | {'Check cạnh':>12} | {'Lấy kề':>12} | {'Ma trận kề':>12} | {'DS kề':>12}")
+    lines.append(f"{'':>12} | {'':>6} | {'':>8} | {'':>8} | {'':>7} | {'(ms, TV)':>12} | {'(1000x, TV)':>12} | {'(1000x, TV)':>12} | {'(ms, TV)':>12} | {'(ms, TV)':>12}")
+    lines.append("-" * 134)
     
     for r in results:
-        lines.append(f"{r.n_nodes:>6} | {r.density*100:>7.0f}% | {r.n_edges:>8} | {r.create_structure_time:>12.3f} | {r.check_edge_time:>12.3f} | {r.get_neighbors_time:>12.3f} | {r.create_matrix_time:>12.3f} | {r.create_adj_list_time:>12.3f}")
+        lines.append(f"{_model_label(r):>12} | {r.n_nodes:>6} | {r.density*100:>7.0f}% | {r.n_edges:>8} | {r.max_degree:>7} | {_cell(r.create_structure_time):>12} | {_cell(r.check_edge_time):>12} | {_cell(r.get_neighbors_time):>12} | {_cell(r.create_matrix_time):>12} | {_cell(r.create_adj_list_time):>12}")
+    
+    lines.append("-" * 134)
+    lines.append("")
     
-    lines.append("-" * 110)
+    # Phân phối của từng phép đo
+    lines.append("PHÂN PHỐI THỜI GIAN (ms mỗi lần gọi):")
+    lines.extend(_distribution_lines(results))
     lines.append("")
     
+    # Bộ nhớ theo giai đoạn
+    if any(r.memory for r in results):
+        lines.append("BỘ NHỚ THEO GIAI ĐOẠN:")
+        lines.extend(_memory_lines(results))
+        lines.append("")
+    
     # Ghi file
     Path(filepath).write_text("\n".join(lines), encoding="utf-8")
     return str(filepath)
 
-def main(): # Hàm chính để chạy benchmark
-    """Hàm chính để chạy benchmark."""
+def _run_command(args) -> int: # Lệnh "run": chạy benchmark, in bảng và lưu kết quả (văn bản + JSON, tùy chọn CSV)
+    from .benchmark_report import environment_metadata, save_results_csv, save_results_json
     print()
     print("Bắt đầu đánh giá hiệu năng")
+    harness = Harness(warmup=args.warmup, repeats=args.repeats, disable_gc=not args.keep_gc)
+    print(
+        f"Cách đo: {harness.warmup} lần khởi động, {harness.repeats} mẫu, "
+        f"mỗi mẫu >= {harness.min_time * 1000:.1f} ms, GC {'tắt' if harness.disable_gc else 'bật'} khi đo"
+    )
     print()
     
-    # Chạy benchmark với các cấu hình mặc định
-    results = run_full_benchmark(
-        sizes=[50, 200, 500],
-        densities=[0.1, 0.3, 0.5],
-        include_draw=True
-    )
+    # Chạy benchmark với các cấu hình đã chọn
+    if args.runs > 1:
+        results = _run_independent(args, harness)
+    else:
+        results = run_full_benchmark(
+            sizes=args.sizes,
+            densities=args.densities,
+            include_draw=not args.no_draw,
+            topologies=args.topologies,
+            harness=harness,
+            include_memory=not args.no_memory
+        )
     
     # In kết quả
     print_results_table(results)
     
     # In phân tích
     print_analysis(results)
+
+    # Đo thời gian khởi động
+    if not args.skip_startup:
+        print_startup_results(measure_startup_time(harness.repeats))
     
-    # Xuất file
-    filepath = export_results_to_file(results)
+    # Xuất file: bảng văn bản để đọc, JSON (kèm thông tin môi trường) để so sánh bằng lệnh "compare"
+    filepath = export_results_to_file(results, args.txt)
     print(f"Đã lưu kết quả vào: {filepath}")
+    json_path = args.json or Path(__file__).parent / "benchmark_results.json"
+    print(f"Đã lưu kết quả (JSON) vào: {save_results_json(results, json_path, environment_metadata(harness))}")
+    if args.csv:
+        print(f"Đã lưu kết quả (CSV) vào: {save_results_csv(results, args.csv)}")
+    print()
+    return 0
+
+def _run_independent(args, harness: Harness) -> List[BenchmarkResult]: # Chạy mỗi cấu hình args.runs lần, mỗi lần trong một tiến trình mới, rồi gộp
+    from .benchmark_report import merge_runs
+    from .sweep import expand_matrix, print_outcome, run_sweep
+    # Tuần tự (một tiến trình tại một thời điểm): các lần đo không tranh CPU với nhau
+    cells = expand_matrix(args.sizes, args.densities, topologies=args.topologies)
+    jobs = cells * args.runs
+    print(f"Chạy {len(cells)} cấu hình x {args.runs} lần, mỗi lần trong một tiến trình riêng")
+    done = 0
+    def report(outcome) -> None:
+        nonlocal done
+        done += 1
+        print_outcome(outcome, done, len(jobs))
+    outcomes = run_sweep(
+        jobs, workers=1, timeout=None, harness=harness,
+        include_draw=not args.no_draw, include_memory=not args.no_memory, on_result=report,
+    )
     print()
+    for outcome in outcomes:
+        if outcome.error:
+            raise RuntimeError(f"{outcome.cell.describe()}: {outcome.error}")
+    order = {cell: i for i, cell in enumerate(cells)}
+    outcomes.sort(key=lambda o: order[o.cell])
+    runs = [[o.result for o in outcomes[i::args.runs]] for i in range(args.runs)]
+    return merge_runs(runs)
+
+def _compare_command(args) -> int: # Lệnh "compare": so sánh với lần chạy gốc, mã thoát 1 nếu có phép đo chậm đi
+    from .benchmark_report import compare_files
+    return compare_files(args.baseline, args.current, args.threshold, args.alpha)
+
+def main(argv: Optional[Sequence[str]] = None) -> int: # Điểm vào dòng lệnh: python -m graph_app.benchmark [run|compare]
+    """Hàm chính để chạy benchmark."""
+    from .benchmark_report import DEFAULT_ALPHA, DEFAULT_THRESHOLD
+    parser = argparse.ArgumentParser(
+        prog="python -m graph_app.benchmark",
+        description="Đánh giá hiệu năng cấu trúc dữ liệu và vẽ đồ thị; so sánh với lần chạy gốc.",
+    )
+    commands = parser.add_subparsers(dest="command")
+    run = commands.add_parser("run", help="Chạy benchmark (mặc định)")
+    run.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 500], metavar="N", help="Các số đỉnh")
+    run.add_argument("--densities", type=float, nargs="+", default=[0.1, 0.3, 0.5], metavar="D", help="Các mật độ (0.0 - 1.0)")
+    run.add_argument("--topologies", nargs="+", choices=list(TOPOLOGIES), default=list(TOPOLOGIES), help="Các mô hình đồ thị")
+    run.add_argument("--warmup", type=int, default=DEFAULT_HARNESS.warmup, help="Số lần gọi khởi động trước khi đo")
+    run.add_argument("--repeats", type=int, default=DEFAULT_HARNESS.repeats, help="Số mẫu mỗi phép đo")
+    run.add_argument("--runs", type=int, default=1, help="Số lần chạy độc lập (mỗi lần một tiến trình); compare cần >= 5 lần mỗi bên")
+    run.add_argument("--keep-gc", action="store_true", help="Không tắt bộ thu gom rác khi đo")
+    run.add_argument("--no-draw", action="store_true", help="Bỏ qua phép đo thời gian vẽ")
+    run.add_argument("--no-memory", action="store_true", help="Bỏ qua phép đo bộ nhớ (tracemalloc + RSS)")
+    run.add_argument("--skip-startup", action="store_true", help="Bỏ qua phép đo thời gian khởi động")
+    run.add_argument("--txt", default=None, metavar="PATH", help="File bảng kết quả (mặc định: graph_app/benchmark_results.txt)")
+    run.add_argument("--json", default=None, metavar="PATH", help="File JSON (mặc định: graph_app/benchmark_results.json)")
+    run.add_argument("--csv", default=None, metavar="PATH", help="Ghi thêm file CSV")
+    compare = commands.add_parser("compare", help="So sánh hai file JSON, mã thoát 1 nếu có phép đo chậm đi")
+    compare.add_argument("baseline", help="File JSON của lần chạy gốc")
+    compare.add_argument("current", help="File JSON của lần chạy hiện tại")
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Thay đổi trung vị tối thiểu (mặc định 0.10 = 10%%)")
+    compare.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="Mức ý nghĩa (mặc định 0.05)")
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in ("run", "compare", "-h", "--help"):
+        argv.insert(0, "run")       # Không có lệnh con: chạy benchmark như trước
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        return _compare_command(args)
+    return _run_command(args)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
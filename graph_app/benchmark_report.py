@@ -0,0 +1,294 @@
+from __future__ import annotations
+import csv
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .benchmark import METRICS, BenchmarkResult
+from .generators import TOPOLOGIES
+from .memory_profile import MemoryStats
+from .timing import TIMER_RESOLUTION, Harness, TimingStats, mann_whitney_p, min_p_value
+
+SCHEMA_VERSION = 1          # Tăng khi định dạng file JSON thay đổi không tương thích
+DEFAULT_THRESHOLD = 0.10    # Thay đổi trung vị tối thiểu (tương đối) để tính là chậm đi / nhanh lên
+DEFAULT_ALPHA = 0.05        # Mức ý nghĩa của kiểm định Mann–Whitney
+
+# Khóa của một cấu hình benchmark: (mô hình, số đỉnh, mật độ, có hướng, có trọng số)
+ResultKey = Tuple[str, int, float, bool, bool]
+
+# ----------------------------------------------------------------------
+# Thông tin môi trường
+# ----------------------------------------------------------------------
+def _cpu_model() -> str: # Tên CPU (Linux: /proc/cpuinfo; nơi khác: platform.processor())
+    try:
+        for line in Path("/proc/cpuinfo").read_text(encoding="utf-8").splitlines():
+            if line.startswith("model name"):
+                return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+def _git_revision() -> Dict[str, Any]: # Commit hiện tại của mã nguồn và việc cây làm việc có thay đổi chưa commit
+    root = Path(__file__).resolve().parent.parent
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=root, capture_output=True, text=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": bool(status.strip())}
+
+def _library_versions() -> Dict[str, Optional[str]]: # Phiên bản các thư viện ảnh hưởng tới kết quả (None nếu chưa cài)
+    from importlib import metadata
+    versions: Dict[str, Optional[str]] = {}
+    for name in ("numpy", "networkx", "matplotlib"):
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+def environment_metadata(harness: Optional[Harness] = None) -> Dict[str, Any]: # Thông tin máy, Python, mã nguồn và cách đo của một lần chạy
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": {
+            "version": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "executable": sys.executable,
+        },
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu": _cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "git": _git_revision(),
+        "libraries": _library_versions(),
+        "timer_resolution": TIMER_RESOLUTION,
+        "harness": asdict(harness) if harness is not None else None,
+    }
+
+# ----------------------------------------------------------------------
+# Ghi / đọc kết quả
+# ----------------------------------------------------------------------
+def result_to_dict(result: BenchmarkResult) -> Dict[str, Any]: # BenchmarkResult -> dict (phép đo dạng TimingStats.to_dict, None nếu không đo)
+    data: Dict[str, Any] = {}
+    for f in fields(result):
+        value = getattr(result, f.name)
+        if isinstance(value, TimingStats):
+            value = value.to_dict()
+        elif f.name == "memory" and value is not None:
+            value = {stage: stats.to_dict() for stage, stats in value.items()}
+        data[f.name] = value
+    return data
+
+def result_from_dict(data: Dict[str, Any]) -> BenchmarkResult: # dict -> BenchmarkResult (bỏ qua trường không biết: file của phiên bản khác)
+    known = {f.name for f in fields(BenchmarkResult)}
+    timed = {attr for attr, _ in METRICS}
+    values = {}
+    for name, value in data.items():
+        if name not in known:
+            continue
+        if name in timed and value is not None:
+            value = TimingStats.from_dict(value)
+        elif name == "memory" and value is not None:
+            value = {stage: MemoryStats.from_dict(stats) for stage, stats in value.items()}
+        values[name] = value
+    return BenchmarkResult(**values)
+
+def merge_runs(runs: List[List[BenchmarkResult]]) -> List[BenchmarkResult]: # Gộp kết quả của nhiều lần chạy độc lập (cùng cấu hình, cùng seed)
+    """
+    Mỗi phép đo giữ mọi mẫu của các lần chạy và trung vị của từng lần (run_medians) để lệnh
+    compare kiểm định trên các giá trị độc lập. Số cạnh, bậc và bộ nhớ lấy từ lần chạy đầu.
+    """
+    merged: Dict[ResultKey, BenchmarkResult] = {}
+    grouped: Dict[ResultKey, List[BenchmarkResult]] = {}
+    for results in runs:
+        for r in results:
+            grouped.setdefault(result_key(r), []).append(r)
+    for key, group in grouped.items():
+        first = group[0]
+        values = {f.name: getattr(first, f.name) for f in fields(BenchmarkResult)}
+        for attr, _ in METRICS:
+            stats = [getattr(r, attr) for r in group if getattr(r, attr) is not None and len(getattr(r, attr))]
+            if not stats:
+                continue
+            values[attr] = TimingStats(
+                [x for s in stats for x in s.samples], stats[0].number, [m for s in stats for m in s.runs]
+            )
+        merged[key] = BenchmarkResult(**values)
+    return list(merged.values())
+
+def result_key(result: BenchmarkResult) -> ResultKey: # Khóa ghép cặp kết quả giữa hai lần chạy
+    return (result.topology, result.n_nodes, round(result.density, 9), result.directed, result.weighted)
+
+def save_results_json( # Ghi kết quả (kèm thông tin môi trường) ra file JSON
+    results: List[BenchmarkResult], filepath: str | Path, metadata: Optional[Dict[str, Any]] = None
+) -> str:
+    document = {
+        "schema": SCHEMA_VERSION,
+        "metadata": metadata if metadata is not None else environment_metadata(),
+        "results": [result_to_dict(r) for r in results],
+    }
+    Path(filepath).write_text(json.dumps(document, ensure_ascii=False, indent=2), encoding="utf-8")
+    return str(filepath)
+
+def load_results_json(filepath: str | Path) -> Tuple[Dict[str, Any], List[BenchmarkResult]]: # Đọc file JSON do save_results_json ghi
+    document = json.loads(Path(filepath).read_text(encoding="utf-8"))
+    schema = document.get("schema")
+    if schema != SCHEMA_VERSION:
+        raise ValueError(f"File '{filepath}' có định dạng phiên bản {schema}, cần phiên bản {SCHEMA_VERSION}.")
+    return document.get("metadata", {}), [result_from_dict(item) for item in document.get("results", [])]
+
+CSV_COLUMNS = [
+    "topology", "n_nodes", "density", "directed", "weighted", "n_edges", "max_degree",
+    "metric", "repeats", "number", "min", "median", "mean", "p95", "stdev",
+]
+
+def save_results_csv(results: List[BenchmarkResult], filepath: str | Path) -> str: # Ghi kết quả ra CSV: một dòng cho mỗi (cấu hình, phép đo)
+    with open(filepath, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(CSV_COLUMNS)
+        for r in results:
+            for attr, _ in METRICS:
+                stats = getattr(r, attr)
+                if stats is None or not len(stats):
+                    continue
+                writer.writerow([
+                    r.topology, r.n_nodes, r.density, int(r.directed), int(r.weighted), r.n_edges, r.max_degree,
+                    attr, len(stats), stats.number,
+                    f"{stats.min:.6f}", f"{stats.median:.6f}", f"{stats.mean:.6f}", f"{stats.p95:.6f}", f"{stats.stdev:.6f}",
+                ])
+    return str(filepath)
+
+# ----------------------------------------------------------------------
+# So sánh với lần chạy gốc (baseline)
+# ----------------------------------------------------------------------
+REGRESSION, IMPROVEMENT, UNCHANGED = "chậm đi", "nhanh lên", "không đổi"
+INSUFFICIENT = "thiếu mẫu"   # Quá ít mẫu: kiểm định không thể đạt p < alpha dù khác biệt lớn tới đâu
+
+@dataclass
+class Comparison:
+    """So sánh một phép đo của một cấu hình giữa lần chạy gốc và lần chạy hiện tại."""
+    key: ResultKey
+    metric: str
+    baseline: TimingStats
+    current: TimingStats
+    change: float                   # Thay đổi tương đối của trung vị (+0.10 = chậm hơn 10%)
+    p_value: float                  # Kiểm định Mann–Whitney trên trung vị của từng lần chạy
+    verdict: str                    # REGRESSION / IMPROVEMENT / UNCHANGED / INSUFFICIENT
+
+def compare_results( # So sánh từng phép đo của các cấu hình có ở cả hai lần chạy
+    baseline: List[BenchmarkResult],
+    current: List[BenchmarkResult],
+    threshold: float = DEFAULT_THRESHOLD,
+    alpha: float = DEFAULT_ALPHA,
+) -> List[Comparison]:
+    """
+    Một phép đo bị coi là chậm đi (hoặc nhanh lên) khi trung vị thay đổi quá `threshold` VÀ khác
+    biệt có ý nghĩa thống kê (p < alpha). Kiểm định dùng trung vị của từng lần chạy độc lập
+    (`benchmark run --runs K`, mỗi lần một tiến trình), không dùng các mẫu trong cùng một tiến
+    trình: các mẫu đó bỏ qua dao động giữa các lần chạy (tần số CPU, bộ cấp phát, ...) nên p-value
+    quá lạc quan. Với 3 lần chạy mỗi bên, p nhỏ nhất là 0.1; 5 lần mỗi bên cho p nhỏ nhất 0.008.
+    Phép đo không thể đạt p < alpha (ví dụ file chỉ có một lần chạy) nhận kết luận INSUFFICIENT.
+    """
+    base_by_key = {result_key(r): r for r in baseline}
+    comparisons = []
+    for r in current:
+        base = base_by_key.get(result_key(r))
+        if base is None:
+            continue
+        for attr, _ in METRICS:
+            old, new = getattr(base, attr), getattr(r, attr)
+            if old is None or new is None or not len(old) or not len(new):
+                continue
+            old_runs, new_runs = old.runs, new.runs
+            old_median, new_median = statistics.median(old_runs), statistics.median(new_runs)
+            change = new_median / old_median - 1.0 if old_median > 0 else 0.0
+            p_value = mann_whitney_p(old_runs, new_runs)
+            verdict = UNCHANGED
+            if min_p_value(len(old_runs), len(new_runs)) >= alpha:
+                verdict = INSUFFICIENT
+            elif p_value < alpha and change > threshold:
+                verdict = REGRESSION
+            elif p_value < alpha and change < -threshold:
+                verdict = IMPROVEMENT
+            comparisons.append(Comparison(result_key(r), attr, old, new, change, p_value, verdict))
+    return comparisons
+
+def missing_configurations(baseline: List[BenchmarkResult], current: List[BenchmarkResult]) -> List[ResultKey]: # Cấu hình có trong lần chạy gốc nhưng không có trong lần chạy hiện tại
+    current_keys = {result_key(r) for r in current}
+    return [result_key(r) for r in baseline if result_key(r) not in current_keys]
+
+def _describe_key(key: ResultKey) -> str:
+    topology, n_nodes, density, directed, weighted = key
+    flags = ("có hướng" if directed else "vô hướng") + (", có trọng số" if weighted else "")
+    return f"{TOPOLOGIES.get(topology, topology)}, {n_nodes} đỉnh, {density * 100:g}%, {flags}"
+
+def _describe_environment(metadata: Dict[str, Any]) -> str: # Một dòng tóm tắt môi trường của một lần chạy
+    git = metadata.get("git") or {}
+    commit = (git.get("commit") or "?")[:10] + (" (có thay đổi chưa commit)" if git.get("dirty") else "")
+    python = (metadata.get("python") or {}).get("version", "?")
+    return f"{metadata.get('timestamp', '?')}, commit {commit}, Python {python}, {metadata.get('cpu', '?')}"
+
+def print_comparison( # In bảng so sánh; trả về số phép đo chậm đi
+    comparisons: List[Comparison],
+    baseline_meta: Dict[str, Any],
+    current_meta: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    alpha: float = DEFAULT_ALPHA,
+    missing: Optional[List[ResultKey]] = None,
+) -> int:
+    labels = dict(METRICS)
+    print("=" * 141)
+    print("  SO SÁNH VỚI LẦN CHẠY GỐC")
+    print("=" * 141)
+    print(f"  Gốc     : {_describe_environment(baseline_meta)}")
+    print(f"  Hiện tại: {_describe_environment(current_meta)}")
+    if baseline_meta.get("cpu") != current_meta.get("cpu"):
+        print("  Cảnh báo: hai lần chạy trên CPU khác nhau, so sánh có thể không có ý nghĩa.")
+    print(f"  Ngưỡng: thay đổi trung vị > {threshold * 100:g}% và p < {alpha:g} (Mann–Whitney U trên trung vị của từng lần chạy)")
+    print()
+    print(f"{'Cấu hình':<42} | {'Phép đo':<18} | {'Gốc (ms)':>10} | {'Hiện tại':>10} | {'Lần chạy':>8} | {'Thay đổi':>9} | {'p':>7} | Kết luận")
+    print("-" * 141)
+    for c in comparisons:
+        marker = " <<" if c.verdict == REGRESSION else ""
+        print(
+            f"{_describe_key(c.key):<42} | {labels[c.metric]:<18} | {statistics.median(c.baseline.runs):>10.3f} | "
+            f"{statistics.median(c.current.runs):>10.3f} | {f'{len(c.baseline.runs)}/{len(c.current.runs)}':>8} | "
+            f"{c.change * 100:>+8.1f}% | {c.p_value:>7.4f} | {c.verdict}{marker}"
+        )
+    print("-" * 141)
+    regressions = sum(c.verdict == REGRESSION for c in comparisons)
+    improvements = sum(c.verdict == IMPROVEMENT for c in comparisons)
+    insufficient = sum(c.verdict == INSUFFICIENT for c in comparisons)
+    unchanged = len(comparisons) - regressions - improvements - insufficient
+    print(f"  {len(comparisons)} phép đo: {regressions} chậm đi, {improvements} nhanh lên, {unchanged} không đổi, {insufficient} thiếu mẫu")
+    if insufficient:
+        print(f"  Cảnh báo: {insufficient} phép đo có quá ít mẫu để đạt p < {alpha:g}, không kiểm tra được chậm đi (chạy lại với --runs 5).")
+    for key in missing or []:
+        print(f"  Thiếu trong lần chạy hiện tại: {_describe_key(key)}")
+    print()
+    return regressions
+
+def compare_files( # So sánh hai file JSON; trả về mã thoát (0: không chậm đi, 1: có phép đo chậm đi)
+    baseline_path: str | Path,
+    current_path: str | Path,
+    threshold: float = DEFAULT_THRESHOLD,
+    alpha: float = DEFAULT_ALPHA,
+) -> int:
+    baseline_meta, baseline = load_results_json(baseline_path)
+    current_meta, current = load_results_json(current_path)
+    comparisons = compare_results(baseline, current, threshold, alpha)
+    regressions = print_comparison(
+        comparisons, baseline_meta, current_meta, threshold, alpha, missing_configurations(baseline, current)
+    )
+    return 1 if regressions else 0
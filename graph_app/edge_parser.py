@@ -0,0 +1,246 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+EdgeKey = Tuple[str, str]
+
+@dataclass(frozen=True)
+class EdgeLine:
+    """Kết quả phân tích một dòng (khác rỗng) của ô danh sách cạnh."""
+    nodes: Tuple[str, ...]              # Các đỉnh trên dòng: (u,) hoặc (u, v)
+    weight: Optional[float] = None      # Trọng số nếu dòng có ghi (None nếu không)
+    n_parts: int = 1                    # Số phần tử trên dòng
+    bad_weight: Optional[str] = None    # Token trọng số không hợp lệ (nếu có)
+
+    @property
+    def is_valid(self) -> bool: # Dòng hợp lệ: trọng số là số và không quá 3 phần tử
+        return self.bad_weight is None and self.n_parts <= 3
+
+def parse_edge_line(raw: str) -> Optional[EdgeLine]: # Phân tích một dòng 'u', 'u v' hoặc 'u v w'
+    parts = raw.split()
+    if not parts:
+        return None  # Dòng trống
+    if len(parts) == 1:
+        return EdgeLine((parts[0],))  # Dòng khai báo đỉnh đơn lẻ
+    weight = None
+    bad_weight = None
+    if len(parts) >= 3:
+        try:
+            weight = float(parts[2])
+        except ValueError:
+            bad_weight = parts[2]
+    return EdgeLine((parts[0], parts[1]), weight, len(parts), bad_weight)
+
+@dataclass
+class EdgeTextDiff:
+    """
+    Vùng dòng bị thay đổi giữa lần phân tích trước và nội dung mới.
+    Các dòng [start, old_end) cũ được thay bằng new_lines.
+    """
+    base_revision: int                          # Phiên bản trạng thái parser dùng để tính diff
+    start: int                                  # Dòng đầu tiên bị thay đổi
+    old_end: int                                # Dòng kết thúc (không bao gồm) trong nội dung cũ
+    new_lines: List[str]                        # Các dòng mới thay thế
+    new_parsed: List[Optional[EdgeLine]]        # Kết quả phân tích các dòng mới
+
+    @property
+    def is_empty(self) -> bool: # Nội dung không thay đổi
+        return self.old_end == self.start and not self.new_lines
+
+@dataclass
+class EdgeChanges:
+    """Các thao tác cần áp dụng lên GraphData để đồng bộ với nội dung ô nhập."""
+    added_nodes: List[str] = field(default_factory=list)
+    removed_nodes: List[str] = field(default_factory=list)
+    upserted_edges: List[Tuple[str, str, float]] = field(default_factory=list)  # Thêm mới hoặc đổi trọng số
+    removed_edges: List[EdgeKey] = field(default_factory=list)
+    weighted: bool = False  # Nội dung có ít nhất một cạnh ghi trọng số
+
+    @property
+    def is_empty(self) -> bool: # Không có thao tác nào
+        return not (self.added_nodes or self.removed_nodes or self.upserted_edges or self.removed_edges)
+
+class IncrementalEdgeParser:
+    """
+    Bộ phân tích gia tăng cho ô danh sách cạnh.
+
+    Ghi nhớ các dòng của lần phân tích trước, mỗi lần gõ phím chỉ phân tích lại vùng dòng
+    thay đổi (tìm bằng tiền tố/hậu tố chung) và trả về các thao tác thêm/xóa/cập nhật
+    cạnh tương ứng thay vì dựng lại toàn bộ đồ thị.
+
+    Nếu một cạnh xuất hiện trên nhiều dòng, trọng số của dòng đứng sau cùng trong nội dung được
+    dùng (như khi phân tích lại toàn bộ), không phụ thuộc thứ tự các dòng được gõ.
+    Dòng không hợp lệ không đóng góp đỉnh/cạnh nào cho đồ thị, lỗi được báo qua first_error().
+    """
+    def __init__(self, directed: bool = False) -> None:
+        self.directed = directed
+        self.revision = 0                                   # Tăng mỗi lần commit/rebase
+        self._reset_state()
+    def _reset_state(self) -> None: # Xóa toàn bộ trạng thái đã phân tích
+        self._lines: List[str] = []
+        self._parsed: List[Optional[EdgeLine]] = []
+        self._line_ids: List[int] = []                      # Định danh ổn định của từng dòng
+        self._positions: Optional[Dict[int, int]] = None    # Id dòng -> vị trí (dựng lại khi cần, xóa khi ghép dòng)
+        self._next_id = 0
+        self._node_refs: Dict[str, int] = {}                # Đỉnh -> số dòng hợp lệ nhắc tới
+        self._edge_refs: Dict[EdgeKey, Dict[int, float]] = {}  # Cạnh -> {id dòng: trọng số}
+        self._weight_lines = 0                              # Số dòng có ghi trọng số hợp lệ
+        self._error_lines = 0                               # Số dòng không hợp lệ
+
+    # ------------------------------------------------------------------
+    # Truy vấn trạng thái
+    # ------------------------------------------------------------------
+    @property
+    def has_weight(self) -> bool: # Có ít nhất một dòng ghi trọng số
+        return self._weight_lines > 0
+    def nodes(self) -> List[str]: # Danh sách đỉnh (đã sắp xếp) theo nội dung hiện tại
+        return sorted(self._node_refs)
+    def edges(self) -> List[Tuple[str, str, float]]: # Danh sách cạnh theo nội dung hiện tại
+        return [(u, v, self._current_weight(refs)) for (u, v), refs in self._edge_refs.items()]
+    def first_error(self) -> Optional[str]: # Thông báo lỗi của dòng không hợp lệ đầu tiên (None nếu không có)
+        if not self._error_lines:
+            return None
+        for line_no, parsed in enumerate(self._parsed, start=1):
+            if parsed is None or parsed.is_valid:
+                continue
+            if parsed.bad_weight is not None:
+                return f"Lỗi dòng {line_no}: Trọng số '{parsed.bad_weight}' không phải là số hợp lệ"
+            return f"Dòng {line_no}: định dạng cạnh không hợp lệ (chỉ hỗ trợ 'u v' hoặc 'u v w')."
+        return None
+
+    # ------------------------------------------------------------------
+    # Tính toán và áp dụng thay đổi
+    # ------------------------------------------------------------------
+    def diff(self, text: str) -> EdgeTextDiff: # Tìm vùng dòng thay đổi so với lần commit trước (không thay đổi trạng thái)
+        old = self._lines
+        new = text.split("\n")
+        # Tiền tố chung
+        start = 0
+        limit = min(len(old), len(new))
+        while start < limit and old[start] == new[start]:
+            start += 1
+        # Hậu tố chung (không chồng lấn với tiền tố)
+        old_end, new_end = len(old), len(new)
+        while old_end > start and new_end > start and old[old_end - 1] == new[new_end - 1]:
+            old_end -= 1
+            new_end -= 1
+        new_lines = new[start:new_end]
+        return EdgeTextDiff(
+            base_revision=self.revision,
+            start=start,
+            old_end=old_end,
+            new_lines=new_lines,
+            new_parsed=[parse_edge_line(line) for line in new_lines],
+        )
+    def commit(self, diff: EdgeTextDiff) -> EdgeChanges: # Áp dụng diff vào trạng thái và trả về các thao tác trên đồ thị
+        if diff.base_revision != self.revision:
+            raise ValueError("Diff được tính trên trạng thái cũ của bộ phân tích.")
+        # Trạng thái trước thay đổi của các đỉnh/cạnh bị ảnh hưởng
+        nodes_before: Dict[str, bool] = {}
+        edges_before: Dict[EdgeKey, Optional[float]] = {}
+
+        # Bước 1: Gỡ đóng góp của các dòng cũ bị thay thế
+        for idx in range(diff.start, diff.old_end):
+            self._unregister(self._line_ids[idx], self._parsed[idx], nodes_before, edges_before)
+
+        # Bước 2: Ghi nhận đóng góp của các dòng mới
+        new_ids = []
+        for parsed in diff.new_parsed:
+            line_id = self._next_id
+            self._next_id += 1
+            new_ids.append(line_id)
+            self._register(line_id, parsed, nodes_before, edges_before)
+
+        # Bước 3: Ghép danh sách dòng (tạo danh sách mới để luồng khác đọc an toàn)
+        s, e = diff.start, diff.old_end
+        self._lines = self._lines[:s] + diff.new_lines + self._lines[e:]
+        self._parsed = self._parsed[:s] + diff.new_parsed + self._parsed[e:]
+        self._line_ids = self._line_ids[:s] + new_ids + self._line_ids[e:]
+        self._positions = None
+        self.revision += 1
+
+        # Bước 4: So sánh trước/sau để sinh thao tác
+        changes = EdgeChanges(weighted=self.has_weight)
+        for node, existed in nodes_before.items():
+            exists = node in self._node_refs
+            if exists and not existed:
+                changes.added_nodes.append(node)
+            elif existed and not exists:
+                changes.removed_nodes.append(node)
+        for key, old_weight in edges_before.items():
+            refs = self._edge_refs.get(key)
+            if refs is None:
+                if old_weight is not None:
+                    changes.removed_edges.append(key)
+                continue
+            weight = self._current_weight(refs)
+            if weight != old_weight:
+                changes.upserted_edges.append((key[0], key[1], weight))
+        changes.added_nodes.sort()
+        return changes
+    def update(self, text: str) -> EdgeChanges: # diff + commit trong cùng một luồng
+        return self.commit(self.diff(text))
+    def rebase(self, text: str, directed: Optional[bool] = None) -> None: # Đặt lại trạng thái theo nội dung mới (không sinh thao tác)
+        if directed is not None:
+            self.directed = directed
+        self._reset_state()
+        self.revision += 1  # Vô hiệu hóa các diff đang tính trên trạng thái cũ
+        self.update(text)
+
+    # ------------------------------------------------------------------
+    # Hàm nội bộ
+    # ------------------------------------------------------------------
+    def _key(self, u: str, v: str) -> EdgeKey: # Khóa cạnh: vô hướng thì không phân biệt thứ tự
+        if self.directed or u <= v:
+            return (u, v)
+        return (v, u)
+    def _current_weight(self, refs: Dict[int, float]) -> float: # Trọng số của dòng đứng sau cùng trong nội dung
+        if len(refs) == 1:
+            return next(iter(refs.values()))
+        # Cạnh lặp lại trên nhiều dòng: so vị trí dòng (id chỉ phản ánh thứ tự gõ). Trong commit, bước 1-2
+        # chỉ hỏi trọng số trước thay đổi nên vị trí theo danh sách dòng cũ là đúng.
+        if self._positions is None:
+            self._positions = {line_id: i for i, line_id in enumerate(self._line_ids)}
+        return refs[max(refs, key=self._positions.__getitem__)]
+    def _register(self, line_id, parsed, nodes_before, edges_before) -> None: # Ghi nhận đóng góp của một dòng
+        if parsed is None:
+            return
+        if parsed.weight is not None:
+            self._weight_lines += 1
+        if not parsed.is_valid:
+            self._error_lines += 1
+            return
+        for node in parsed.nodes:
+            nodes_before.setdefault(node, node in self._node_refs)
+            self._node_refs[node] = self._node_refs.get(node, 0) + 1
+        if len(parsed.nodes) == 2:
+            key = self._key(*parsed.nodes)
+            refs = self._edge_refs.get(key)
+            if key not in edges_before:
+                edges_before[key] = self._current_weight(refs) if refs else None
+            if refs is None:
+                refs = self._edge_refs[key] = {}
+            refs[line_id] = parsed.weight if parsed.weight is not None else 1.0
+    def _unregister(self, line_id, parsed, nodes_before, edges_before) -> None: # Gỡ đóng góp của một dòng
+        if parsed is None:
+            return
+        if parsed.weight is not None:
+            self._weight_lines -= 1
+        if not parsed.is_valid:
+            self._error_lines -= 1
+            return
+        for node in parsed.nodes:
+            nodes_before.setdefault(node, True)
+            count = self._node_refs[node] - 1
+            if count:
+                self._node_refs[node] = count
+            else:
+                del self._node_refs[node]
+        if len(parsed.nodes) == 2:
+            key = self._key(*parsed.nodes)
+            refs = self._edge_refs[key]
+            if key not in edges_before:
+                edges_before[key] = self._current_weight(refs)
+            del refs[line_id]
+            if not refs:
+                del self._edge_refs[key]
@@ -0,0 +1,366 @@
+from __future__ import annotations
+import random
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Đồ thị sinh ra ở dạng mảng: (nguồn, đích, trọng số), đỉnh là số nguyên 0..n-1
+EdgeArrays = Tuple[np.ndarray, np.ndarray, np.ndarray]
+# Đồ thị sinh ra ở dạng danh sách như GraphData.load_from_edges: (đỉnh, [(u, v, w), ...])
+EdgeLists = Tuple[List[str], List[Tuple[str, str, float]]]
+
+def pair_count(n: int, directed: bool = False) -> int: # Số cặp đỉnh (cạnh tối đa, không có khuyên) của đồ thị n đỉnh
+    return n * (n - 1) if directed else n * (n - 1) // 2
+
+def pairs_from_index(index: np.ndarray, n: int, directed: bool = False) -> Tuple[np.ndarray, np.ndarray]: # Đổi chỉ số cặp (0..pair_count-1) thành hai mảng đầu mút
+    """
+    Đánh số cặp đỉnh liên tục, không cần dựng danh sách cặp:
+    - Có hướng: k -> (k // (n-1), k % (n-1)), bỏ qua đường chéo (j >= i thì j + 1).
+    - Vô hướng: k -> (v, w) với w < v theo thứ tự tam giác dưới, v = floor((1 + sqrt(1 + 8k)) / 2).
+    """
+    index = np.asarray(index, dtype=np.int64)
+    if directed:
+        i, j = np.divmod(index, n - 1)
+        j += j >= i
+        return i, j
+    v = ((1.0 + np.sqrt(1.0 + 8.0 * index)) / 2.0).astype(np.int64)
+    # Sửa sai số làm tròn của sqrt với chỉ số lớn
+    v -= v * (v - 1) // 2 > index
+    v += (v + 1) * v // 2 <= index
+    w = index - v * (v - 1) // 2
+    return w, v
+
+def _sorted_unique(values: np.ndarray) -> np.ndarray: # Các giá trị phân biệt đã sắp xếp (sort + so sánh kề nhau, nhanh hơn np.unique với mảng lớn)
+    values = np.sort(values)
+    if len(values) < 2:
+        return values
+    return values[np.concatenate(([True], values[1:] != values[:-1]))]
+
+def _geometric_indices(total: int, p: float, rng: np.random.Generator) -> np.ndarray: # Các chỉ số trong [0, total) được chọn độc lập với xác suất p (bước nhảy hình học), đã sắp xếp
+    if p <= 0.0 or total <= 0:
+        return np.empty(0, dtype=np.int64)
+    if p >= 1.0:
+        return np.arange(total, dtype=np.int64)
+    chunks = []
+    last = -1                               # Chỉ số được chọn gần nhất
+    # Kích thước khối: kỳ vọng số chỉ số còn lại + 5 độ lệch chuẩn, để thường chỉ cần một khối
+    while True:
+        expected = (total - 1 - last) * p
+        size = int(expected + 5.0 * np.sqrt(expected) + 16)
+        index = last + np.cumsum(rng.geometric(p, size), dtype=np.int64)
+        if index[-1] >= total:
+            chunks.append(index[: np.searchsorted(index, total)])
+            return np.concatenate(chunks)
+        chunks.append(index)
+        last = int(index[-1])
+
+def _dedupe_pairs( # Bỏ khuyên và cạnh lặp (vô hướng: (u, v) trùng (v, u)), trả về các cặp đã sắp xếp
+    n: int, u: np.ndarray, v: np.ndarray, directed: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    keep = u != v
+    u, v = u[keep], v[keep]
+    if not directed:
+        u, v = np.minimum(u, v), np.maximum(u, v)
+    keys = _sorted_unique(u * n + v)
+    return np.divmod(keys, n)
+
+def _weights(rng: np.random.Generator, size: int, weighted: bool) -> np.ndarray: # Trọng số cạnh như benchmark cũ: ngẫu nhiên 1.0-10.0 (1 chữ số thập phân) hoặc 1.0
+    if weighted:
+        return np.round(rng.uniform(1.0, 10.0, size), 1)
+    return np.ones(size)
+
+def _finish( # Thêm trọng số, trả về dạng mảng hoặc dạng danh sách
+    n: int, u: np.ndarray, v: np.ndarray, rng: np.random.Generator, weighted: bool, as_arrays: bool
+) -> Union[EdgeArrays, EdgeLists]:
+    w = _weights(rng, len(u), weighted)
+    if as_arrays:
+        return u, v, w
+    return arrays_to_edges(n, u, v, w)
+
+def arrays_to_edges(n: int, u: np.ndarray, v: np.ndarray, w: np.ndarray) -> EdgeLists: # Đổi dạng mảng sang (đỉnh, danh sách cạnh) dùng cho GraphData.load_from_edges
+    names = [str(i) for i in range(n)]
+    return names, [(names[a], names[b], c) for a, b, c in zip(u.tolist(), v.tolist(), w.tolist())]
+
+def gnp_random_graph( # Đồ thị ngẫu nhiên G(n, p) bằng bước nhảy hình học, O(V + E)
+    n: int,
+    p: float,
+    directed: bool = False,
+    weighted: bool = False,
+    seed: Optional[int] = None,
+    as_arrays: bool = False,
+) -> Union[EdgeArrays, EdgeLists]:
+    """
+    Mỗi cặp đỉnh có cạnh độc lập với xác suất p. Thay vì tung đồng xu cho từng cặp (O(V²)),
+    khoảng cách giữa hai cặp được chọn liên tiếp tuân theo phân phối hình học Geom(p)
+    (Batagelj & Brandes), nên chỉ cần sinh khoảng E số ngẫu nhiên, theo từng khối numpy.
+
+    Args:
+        seed: Cùng seed cho cùng kết quả
+        as_arrays: True -> trả về mảng (nguồn, đích, trọng số) với đỉnh là số nguyên 0..n-1;
+            False -> (danh sách tên đỉnh, danh sách cạnh (u, v, w)) như generate_random_graph
+    """
+    if not 0.0 <= p <= 1.0:
+        raise ValueError(f"Xác suất p phải nằm trong [0, 1], nhận được {p}")
+    rng = np.random.default_rng(seed)
+    index = _geometric_indices(pair_count(n, directed), p, rng)
+    u, v = pairs_from_index(index, n, directed)
+    return _finish(n, u, v, rng, weighted, as_arrays)
+
+def gnm_random_graph( # Đồ thị ngẫu nhiên G(n, m) bằng lấy mẫu loại trùng trên chỉ số cặp, O(V + E)
+    n: int,
+    m: int,
+    directed: bool = False,
+    weighted: bool = False,
+    seed: Optional[int] = None,
+    as_arrays: bool = False,
+) -> Union[EdgeArrays, EdgeLists]:
+    """
+    Chọn đều ngẫu nhiên đúng m cặp đỉnh phân biệt. Chỉ số cặp được rút theo khối và loại trùng;
+    khi m vượt quá nửa số cặp, lấy mẫu phần bù (các cặp KHÔNG có cạnh) để số lần rút lại luôn
+    nhỏ. Tham số như gnp_random_graph.
+    """
+    total = pair_count(n, directed)
+    if not 0 <= m <= total:
+        raise ValueError(f"Số cạnh m phải nằm trong [0, {total}], nhận được {m}")
+    rng = np.random.default_rng(seed)
+    complement = m > total // 2
+    k = total - m if complement else m
+    chosen = np.empty(0, dtype=np.int64)
+    while len(chosen) < k:
+        need = k - len(chosen)
+        draws = rng.integers(0, total, size=need + need // 10 + 16, dtype=np.int64)
+        chosen = _sorted_unique(np.concatenate((chosen, draws)))
+    if len(chosen) > k:
+        # Tập con ngẫu nhiên đều của một tập ngẫu nhiên đều vẫn là ngẫu nhiên đều
+        chosen = np.sort(rng.choice(chosen, k, replace=False))
+    if complement:
+        keep = np.ones(total, dtype=bool)
+        keep[chosen] = False
+        chosen = np.flatnonzero(keep)
+    index = chosen
+    u, v = pairs_from_index(index, n, directed)
+    return _finish(n, u, v, rng, weighted, as_arrays)
+
+# ----------------------------------------------------------------------
+# Các mô hình có cấu trúc (bậc lệch, cụm, lưới) cho benchmark
+# ----------------------------------------------------------------------
+def barabasi_albert_graph( # Gắn kết ưu tiên Barabási–Albert: mỗi đỉnh mới nối tới m đỉnh cũ, xác suất tỉ lệ với bậc
+    n: int,
+    m: int,
+    directed: bool = False,
+    weighted: bool = False,
+    seed: Optional[int] = None,
+    as_arrays: bool = False,
+) -> Union[EdgeArrays, EdgeLists]:
+    """
+    Bậc phân phối lũy thừa (số mũ ~3) với vài đỉnh trung tâm (hub) bậc rất cao. Chọn theo bậc
+    bằng danh sách "mỗi đầu mút cạnh một lần" nên mỗi lần chọn O(1), tổng O(V·m).
+    Có hướng: cạnh đi từ đỉnh mới tới đỉnh cũ (như trích dẫn).
+    """
+    if not 1 <= m < n:
+        raise ValueError(f"Cần 1 <= m < n, nhận được m={m}, n={n}")
+    rnd = random.Random(seed)
+    sources: List[int] = []
+    targets_out: List[int] = []
+    repeated: List[int] = []                # Mỗi đỉnh xuất hiện (bậc) lần
+    targets = list(range(m))                # Đỉnh m đầu tiên nối tới m đỉnh khởi tạo
+    for source in range(m, n):
+        sources.extend([source] * m)
+        targets_out.extend(targets)
+        repeated.extend(targets)
+        repeated.extend([source] * m)
+        chosen = set()
+        while len(chosen) < m:
+            chosen.add(repeated[int(rnd.random() * len(repeated))])
+        targets = list(chosen)
+    rng = np.random.default_rng(seed)
+    return _finish(n, np.array(sources, dtype=np.int64), np.array(targets_out, dtype=np.int64), rng, weighted, as_arrays)
+
+def watts_strogatz_graph( # Thế giới nhỏ Watts–Strogatz: vòng k láng giềng, mỗi cạnh nối lại với xác suất p
+    n: int,
+    k: int,
+    p: float = 0.1,
+    directed: bool = False,
+    weighted: bool = False,
+    seed: Optional[int] = None,
+    as_arrays: bool = False,
+) -> Union[EdgeArrays, EdgeLists]:
+    """
+    Mỗi đỉnh nối tới k/2 đỉnh kế tiếp trên vòng; đầu cuối của mỗi cạnh được đổi sang một đỉnh
+    ngẫu nhiên với xác suất p. Lần nối lại tạo khuyên hoặc cạnh trùng bị bỏ (cạnh giữ nguyên),
+    nên số cạnh luôn đúng n·(k/2). Toàn bộ được vector hóa bằng numpy.
+    """
+    half = k // 2
+    if not 1 <= half or not k < n:
+        raise ValueError(f"Cần 2 <= k < n, nhận được k={k}, n={n}")
+    rng = np.random.default_rng(seed)
+    u = np.repeat(np.arange(n, dtype=np.int64), half)
+    v = (u + np.tile(np.arange(1, half + 1, dtype=np.int64), n)) % n
+
+    def key(a, b): # Khóa cạnh (vô hướng: không phân biệt chiều)
+        return a * n + b if directed else np.minimum(a, b) * n + np.maximum(a, b)
+
+    rewire = np.flatnonzero(rng.random(len(u)) < p)
+    new_v = rng.integers(0, n, size=len(rewire), dtype=np.int64)
+    existing = np.sort(key(u, v))
+    new_keys = key(u[rewire], new_v)
+    pos = np.minimum(np.searchsorted(existing, new_keys), len(existing) - 1)
+    valid = (new_v != u[rewire]) & (existing[pos] != new_keys)
+    # Hai lần nối lại trùng nhau: chỉ giữ lần đầu
+    order = np.argsort(new_keys, kind="stable")
+    sorted_keys = new_keys[order]
+    first = np.ones(len(order), dtype=bool)
+    first[order[1:]] = sorted_keys[1:] != sorted_keys[:-1]
+    valid &= first
+    v[rewire[valid]] = new_v[valid]
+    return _finish(n, u, v, rng, weighted, as_arrays)
+
+def grid_graph( # Lưới 2 chiều gần vuông (4 láng giềng), tùy chọn cuộn tròn (hình xuyến)
+    n: int,
+    directed: bool = False,
+    weighted: bool = False,
+    periodic: bool = False,
+    seed: Optional[int] = None,
+    as_arrays: bool = False,
+) -> Union[EdgeArrays, EdgeLists]:
+    """
+    n đỉnh xếp theo hàng, mỗi hàng cols = ceil(sqrt(n)) đỉnh (hàng cuối có thể thiếu). Đường kính
+    lớn (~2·sqrt(n)) và bậc đều: trường hợp ngược lại của đồ thị có hub. Có hướng: mỗi cạnh lưới
+    có cả hai chiều. seed chỉ dùng cho trọng số.
+    """
+    cols = max(1, int(np.ceil(np.sqrt(n))))
+    nodes = np.arange(n, dtype=np.int64)
+    col = nodes % cols
+    right = np.where(col == cols - 1, nodes - cols + 1 if periodic else -1, nodes + 1)
+    down = nodes + cols
+    if periodic:
+        down = np.where(down >= n, col, down)
+    u = np.concatenate((nodes, nodes))
+    v = np.concatenate((right, down))
+    keep = (v >= 0) & (v < n)
+    u, v = _dedupe_pairs(n, u[keep], v[keep], False)
+    if directed:
+        u, v = np.concatenate((u, v)), np.concatenate((v, u))
+    return _finish(n, u, v, np.random.default_rng(seed), weighted, as_arrays)
+
+def stochastic_block_model( # Mô hình khối ngẫu nhiên: xác suất cạnh phụ thuộc cặp khối của hai đầu mút
+    sizes: Sequence[int],
+    probs: Sequence[Sequence[float]],
+    directed: bool = False,
+    weighted: bool = False,
+    seed: Optional[int] = None,
+    as_arrays: bool = False,
+) -> Union[EdgeArrays, EdgeLists]:
+    """
+    Khối i gồm sizes[i] đỉnh liên tiếp; cặp đỉnh thuộc khối (a, b) có cạnh với xác suất
+    probs[a][b]. Mỗi cặp khối là một G(n, p) (hoặc G(na x nb, p) giữa hai khối) lấy bằng bước
+    nhảy hình học, tổng O(V + E). Vô hướng: chỉ dùng probs[a][b] với a <= b.
+    """
+    rng = np.random.default_rng(seed)
+    offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+    n = int(offsets[-1])
+    us, vs = [], []
+    for a, na in enumerate(sizes):
+        for b, nb in enumerate(sizes):
+            if b < a and not directed:
+                continue
+            if a == b:
+                x, y = pairs_from_index(_geometric_indices(pair_count(na, directed), probs[a][a], rng), na, directed)
+            else:
+                x, y = np.divmod(_geometric_indices(na * nb, probs[a][b], rng), nb)
+            us.append(x + offsets[a])
+            vs.append(y + offsets[b])
+    u = np.concatenate(us) if us else np.empty(0, dtype=np.int64)
+    v = np.concatenate(vs) if vs else np.empty(0, dtype=np.int64)
+    return _finish(n, u, v, rng, weighted, as_arrays)
+
+def powerlaw_configuration_graph( # Mô hình cấu hình với dãy bậc lũy thừa (đã bỏ khuyên và cạnh lặp)
+    n: int,
+    exponent: float = 2.5,
+    min_degree: float = 1.0,
+    directed: bool = False,
+    weighted: bool = False,
+    seed: Optional[int] = None,
+    as_arrays: bool = False,
+) -> Union[EdgeArrays, EdgeLists]:
+    """
+    Bậc lấy từ phân phối Pareto P(k) ~ k^-exponent (k >= min_degree, chặn ở n - 1), rồi ghép
+    ngẫu nhiên các "nửa cạnh". Khuyên và cạnh lặp bị bỏ (erased configuration model), nên bậc
+    thực tế của các hub có thể thấp hơn một chút. Có hướng: bậc ra theo dãy trên, bậc vào là một
+    hoán vị ngẫu nhiên của cùng dãy.
+    """
+    if exponent <= 1.0:
+        raise ValueError(f"Số mũ phải lớn hơn 1, nhận được {exponent}")
+    rng = np.random.default_rng(seed)
+    degrees = np.floor(min_degree * (1.0 - rng.random(n)) ** (-1.0 / (exponent - 1.0)))
+    degrees = np.minimum(degrees, max(n - 1, 0)).astype(np.int64)
+    if directed:
+        u = np.repeat(np.arange(n, dtype=np.int64), degrees)
+        v = rng.permutation(np.repeat(rng.permutation(n).astype(np.int64), degrees))
+    else:
+        if degrees.sum() % 2:
+            degrees[rng.integers(n)] += 1   # Tổng bậc phải chẵn để ghép đủ cặp
+        stubs = rng.permutation(np.repeat(np.arange(n, dtype=np.int64), degrees))
+        u, v = stubs[0::2], stubs[1::2]
+    u, v = _dedupe_pairs(n, u, v, directed)
+    return _finish(n, u, v, rng, weighted, as_arrays)
+
+# Tên mô hình -> nhãn ngắn hiển thị trong bảng kết quả benchmark
+TOPOLOGIES: Dict[str, str] = {
+    "random": "G(n,m)",
+    "barabasi_albert": "BA",
+    "watts_strogatz": "WS",
+    "grid": "Lưới",
+    "sbm": "SBM",
+    "powerlaw": "Lũy thừa",
+}
+SBM_BLOCKS = 4          # Số khối của mô hình SBM trong benchmark
+SBM_RATIO = 10.0        # Tỉ lệ xác suất cạnh trong khối / giữa hai khối
+POWERLAW_EXPONENT = 2.5
+WS_REWIRE = 0.1
+
+# Số đỉnh tối thiểu để dựng được mô hình (BA: m >= 1 cạnh mỗi đỉnh mới; WS: vòng với k >= 2 láng giềng)
+MIN_TOPOLOGY_NODES = {"barabasi_albert": 2, "watts_strogatz": 3}
+
+def generate_topology( # Sinh đồ thị theo mô hình với số cạnh xấp xỉ mật độ cho trước (trục "mô hình" của benchmark)
+    topology: str,
+    n: int,
+    density: float,
+    directed: bool = False,
+    weighted: bool = False,
+    seed: Optional[int] = None,
+    as_arrays: bool = False,
+) -> Union[EdgeArrays, EdgeLists]:
+    """
+    Tham số của từng mô hình được chọn để số cạnh kỳ vọng gần `density * pair_count(n)`, nhờ đó
+    các mô hình cùng kích thước và mật độ so sánh được với nhau. Riêng "grid" có bậc cố định
+    (bỏ qua density). Mô hình không dựng được với quá ít đỉnh (xem MIN_TOPOLOGY_NODES) dùng G(n, m):
+    với n <= 2 mọi đồ thị cùng số cạnh đều như nhau.
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Mô hình không hỗ trợ: '{topology}' (chỉ hỗ trợ: {', '.join(TOPOLOGIES)})")
+    m = int(pair_count(n, directed) * density)
+    per_node = m / n if n else 0.0          # Số cạnh trung bình mỗi đỉnh "sở hữu"
+    options = dict(directed=directed, weighted=weighted, seed=seed, as_arrays=as_arrays)
+    if topology == "random" or n < MIN_TOPOLOGY_NODES.get(topology, 0):
+        return gnm_random_graph(n, m, **options)
+    if topology == "barabasi_albert":
+        return barabasi_albert_graph(n, max(1, min(n - 1, round(per_node))), **options)
+    if topology == "watts_strogatz":
+        k = max(2, 2 * round(per_node))
+        return watts_strogatz_graph(n, min(k, n - 1 - (n - 1) % 2), WS_REWIRE, **options)
+    if topology == "grid":
+        return grid_graph(n, **options)
+    if topology == "sbm":
+        blocks = max(1, min(SBM_BLOCKS, n))
+        sizes = [n // blocks + (i < n % blocks) for i in range(blocks)]
+        inside = sum(pair_count(size, directed) for size in sizes)
+        between = pair_count(n, directed) - inside
+        p_out = min(1.0, m / (SBM_RATIO * inside + between)) if m else 0.0
+        p_in = min(1.0, SBM_RATIO * p_out)
+        probs = [[p_in if a == b else p_out for b in range(blocks)] for a in range(blocks)]
+        return stochastic_block_model(sizes, probs, **options)
+    # Lũy thừa: trung bình Pareto = min_degree * (a - 1) / (a - 2) với a là số mũ
+    mean_degree = per_node if directed else 2.0 * per_node
+    min_degree = max(1.0, mean_degree * (POWERLAW_EXPONENT - 2.0) / (POWERLAW_EXPONENT - 1.0))
+    return powerlaw_configuration_graph(n, POWERLAW_EXPONENT, min_degree, **options)
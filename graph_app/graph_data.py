@@ -1,6 +1,23 @@
 from __future__ import annotations
+import heapq
+import itertools
+from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Iterable, Optional
+from typing import Dict, List, Tuple, Iterable, Iterator, Optional, Set
+
+# Bộ đếm phiên bản dùng chung cho mọi GraphData: mỗi thay đổi nhận một số mới, không bao giờ trùng lặp
+# (kể cả giữa hai đối tượng khác nhau), nên các bộ nhớ đệm hiển thị có thể dùng làm khóa an toàn.
+_VERSION_COUNTER = itertools.count(1)
+
+class _Transaction:
+    """Nhật ký hoàn tác của một GraphData.batch(): trạng thái cũ của những phần bị sửa lần đầu trong giao dịch."""
+    def __init__(self, version: int) -> None:
+        self.version = version                              # Phiên bản đồ thị lúc bắt đầu
+        self.nodes: Optional[List[str]] = None              # Bản sao danh sách đỉnh (chép khi lần đầu thêm/xóa đỉnh)
+        self.adjacency: Dict[str, Optional[Dict[str, float]]] = {}  # Đỉnh -> bản sao danh sách kề cũ (None: đỉnh chưa tồn tại)
+        self.node_versions: Dict[str, Optional[int]] = {}   # Đỉnh -> phiên bản cũ của đỉnh
+        self.touched: Set[str] = set()                      # Các đỉnh đã thay đổi (nhận phiên bản mới khi xác nhận)
 
 @dataclass
 class GraphData:
@@ -12,27 +29,117 @@ class GraphData:
     weighted: bool = False  # Đồ thị có trọng số hay không
     nodes: List[str] = field(default_factory=list)  # Danh sách các đỉnh
     adjacency: Dict[str, Dict[str, float]] = field(default_factory=dict)  # Biểu diễn ma trận kề bằng dictionary
+    version: int = field(default=0, compare=False, repr=False)  # Phiên bản của lần thay đổi gần nhất
+    node_versions: Dict[str, int] = field(default_factory=dict, compare=False, repr=False)  # Đỉnh -> phiên bản lần cuối danh sách kề của đỉnh thay đổi
+    _txn: Optional[_Transaction] = field(default=None, init=False, compare=False, repr=False)  # Giao dịch batch() đang mở
+
+    # ------------------------------------------------------------------
+    # Theo dõi thay đổi
+    # ------------------------------------------------------------------
+    def _touch(self, *nodes: str) -> None: # Đánh dấu các đỉnh có danh sách kề vừa thay đổi
+        if self._txn is not None:
+            # Trong batch(): phiên bản chỉ tăng một lần khi giao dịch được xác nhận
+            self._txn.touched.update(nodes)
+            return
+        self.version = next(_VERSION_COUNTER)
+        for node in nodes:
+            self.node_versions[node] = self.version
+    def node_version(self, node: str) -> int: # Phiên bản danh sách kề của một đỉnh (dùng làm khóa bộ nhớ đệm)
+        return self.node_versions.get(node, 0)
+    def set_options(self, directed: bool, weighted: bool) -> None: # Đổi chế độ có hướng / có trọng số (tăng phiên bản nếu có thay đổi)
+        if directed == self.directed and weighted == self.weighted:
+            return
+        self.directed = directed
+        self.weighted = weighted
+        # Cách hiển thị ô ma trận và danh sách kề của mọi đỉnh phụ thuộc hai cờ này
+        self._touch(*self.nodes)
+
+    # ------------------------------------------------------------------
+    # Giao dịch (batch)
+    # ------------------------------------------------------------------
+    @contextmanager
+    def batch(self) -> Iterator["GraphData"]: # Gom nhiều thay đổi thành một giao dịch
+        """
+        Mọi thay đổi trong khối `with graph.batch():` nhận chung một phiên bản mới khi khối kết
+        thúc (các bộ nhớ đệm hiển thị chỉ thấy một lần thay đổi). Nếu khối ném ngoại lệ, đồ thị
+        được khôi phục nguyên trạng trước giao dịch rồi ngoại lệ được ném tiếp. Trạng thái cũ chỉ
+        được chép cho các đỉnh bị sửa (lần đầu), nên chi phí tỉ lệ với phần bị thay đổi.
+        Giao dịch lồng nhau được gộp vào giao dịch ngoài cùng.
+        """
+        if self._txn is not None:
+            yield self
+            return
+        self._txn = _Transaction(self.version)
+        try:
+            yield self
+        except BaseException:
+            self._rollback()
+            raise
+        else:
+            self._commit()
+        finally:
+            self._txn = None
+    def _save(self, *nodes: str) -> None: # Ghi lại danh sách kề cũ của các đỉnh sắp bị sửa (chỉ khi đang trong batch)
+        txn = self._txn
+        if txn is None:
+            return
+        for node in nodes:
+            if node not in txn.adjacency:
+                nbrs = self.adjacency.get(node)
+                txn.adjacency[node] = dict(nbrs) if nbrs is not None else None
+                txn.node_versions[node] = self.node_versions.get(node)
+    def _save_nodes(self) -> None: # Ghi lại danh sách đỉnh cũ trước khi thêm/xóa đỉnh (chỉ khi đang trong batch)
+        if self._txn is not None and self._txn.nodes is None:
+            self._txn.nodes = list(self.nodes)
+    def _commit(self) -> None: # Xác nhận giao dịch: một phiên bản mới cho mọi đỉnh đã thay đổi
+        txn = self._txn
+        if not txn.touched:
+            return
+        self.version = next(_VERSION_COUNTER)
+        for node in txn.touched:
+            if node in self.adjacency:
+                self.node_versions[node] = self.version
+    def _rollback(self) -> None: # Hủy giao dịch: khôi phục danh sách kề, danh sách đỉnh và phiên bản cũ
+        txn = self._txn
+        for node, nbrs in txn.adjacency.items():
+            if nbrs is None:
+                self.adjacency.pop(node, None)
+            else:
+                self.adjacency[node] = nbrs
+            old_version = txn.node_versions[node]
+            if old_version is None:
+                self.node_versions.pop(node, None)
+            else:
+                self.node_versions[node] = old_version
+        if txn.nodes is not None:
+            self.nodes[:] = txn.nodes
+            # Giữ thứ tự duyệt adjacency như trước giao dịch
+            self.adjacency = {node: self.adjacency[node] for node in self.nodes}
+        self.version = txn.version
 
     # ------------------------------------------------------------------
     # Cập nhật dữ liệu
     # ------------------------------------------------------------------
     def ensure_node(self, node: str) -> None: # Đảm bảo đỉnh tồn tại trong danh sách nodes và adjacency
-        # Kiểm tra xem đỉnh đã có trong danh sách nodes chưa
-        if node not in self.nodes:
-            # Nếu chưa có, thêm đỉnh vào danh sách nodes
-            self.nodes.append(node)
-        
-        # Kiểm tra xem đỉnh đã có trong dictionary adjacency chưa
-        if node not in self.adjacency:
-            # Nếu chưa có, tạo một dictionary rỗng cho đỉnh này
-            # Dictionary này sẽ lưu các đỉnh kề và trọng số: {đỉnh_kề: trọng_số}
-            self.adjacency[node] = {}
+        # nodes và adjacency luôn chứa cùng tập đỉnh: tra cứu O(1) trong dictionary là đủ
+        # (không duyệt danh sách nodes O(V), vốn làm việc nạp V đỉnh tốn O(V^2))
+        if node in self.adjacency:
+            return
+        self._save_nodes()
+        self._save(node)
+        # Chưa có: thêm vào danh sách nodes và tạo một dictionary rỗng cho đỉnh này
+        # Dictionary này sẽ lưu các đỉnh kề và trọng số: {đỉnh_kề: trọng_số}
+        self.nodes.append(node)
+        self.adjacency[node] = {}
+        self._touch(node)
     def add_node(self, node: str) -> None: # Thêm một đỉnh mới vào đồ thị
         self.ensure_node(node)
     def remove_node(self, node: str) -> None: # Xóa một đỉnh và các cạnh liên quan khỏi đồ thị
         # Kiểm tra xem đỉnh có tồn tại không
         if node not in self.nodes:
             return  # Nếu không tồn tại, thoát khỏi hàm
+        self._save_nodes()
+        self._save(node)
         
         # Bước 1: Xóa đỉnh khỏi danh sách nodes
         self.nodes.remove(node)
@@ -43,14 +150,21 @@ class GraphData:
         
         # Bước 3: Xóa các cạnh trỏ TỚI đỉnh này từ các đỉnh khác
         # Duyệt qua tất cả các dictionary láng giềng của các đỉnh còn lại
-        for nbrs in self.adjacency.values():
+        changed = [node]
+        for u, nbrs in self.adjacency.items():
             # nbrs là dictionary chứa {đỉnh_kề: trọng_số}
-            # Xóa node khỏi dictionary này (nếu có)
-            nbrs.pop(node, None)
+            # Xóa node khỏi dictionary này (nếu có) và ghi nhận đỉnh u bị thay đổi
+            if node in nbrs:
+                self._save(u)
+                del nbrs[node]
+                changed.append(u)
+        self._touch(*changed)
+        self.node_versions.pop(node, None)
     def add_edge(self, u: str, v: str, weight: float = 1.0) -> None: # Thêm hoặc cập nhật một cạnh giữa hai đỉnh u và v
         # Bước 1: Đảm bảo cả hai đỉnh u và v đều tồn tại trong đồ thị
         self.ensure_node(u)  # Đảm bảo đỉnh nguồn u tồn tại
         self.ensure_node(v)  # Đảm bảo đỉnh đích v tồn tại
+        self._save(u, v)
         
         # Bước 2: Xác định trọng số của cạnh
         # Nếu đồ thị có trọng số: sử dụng weight được truyền vào
@@ -64,15 +178,26 @@ class GraphData:
         # Đồ thị vô hướng: cạnh A-B có nghĩa là cả A→B và B→A
         if not self.directed:
             self.adjacency[v][u] = w
+            self._touch(u, v)
+        else:
+            self._touch(u)
     def remove_edge(self, u: str, v: str) -> None: # Xóa cạnh giữa hai đỉnh u và v
+        self._save(u, v)
         # Bước 1: Xóa cạnh u → v
         # get(u, {}) lấy dictionary láng giềng của u, nếu không có trả về {}
         # pop(v, None) xóa v khỏi dictionary, nếu không có trả về None
-        self.adjacency.get(u, {}).pop(v, None)
+        removed = self.adjacency.get(u, {}).pop(v, None) is not None
         
         # Bước 2: Nếu là đồ thị vô hướng, xóa cạnh ngược lại v → u
         if not self.directed:
-            self.adjacency.get(v, {}).pop(u, None)
+            removed = (self.adjacency.get(v, {}).pop(u, None) is not None) or removed
+        
+        # Bước 3: Chỉ đánh dấu thay đổi khi thực sự có cạnh bị xóa
+        if removed:
+            if self.directed:
+                self._touch(u)
+            else:
+                self._touch(u, v)
     def load_from_edges( # Nạp dữ liệu đồ thị từ danh sách đỉnh và danh sách cạnh
         self,
         nodes: Iterable[str],
@@ -80,8 +205,12 @@ class GraphData:
     ) -> None:
         """Nạp dữ liệu đồ thị từ danh sách đỉnh và danh sách cạnh."""
         # Bước 1: Xóa toàn bộ dữ liệu cũ (reset đồ thị)
+        if self._txn is not None:
+            self._save_nodes()
+            self._save(*self.adjacency)
         self.nodes = []        # Danh sách đỉnh rỗng
         self.adjacency = {}    # Dictionary adjacency rỗng
+        self.node_versions = {}
         
         # Bước 2: Thêm tất cả các đỉnh vào đồ thị
         for node in nodes:
@@ -125,50 +254,44 @@ class GraphData:
         # Trả về ma trận hoàn chỉnh
         # Kết quả: ma trận V x V, với matrix[i][j] = trọng số cạnh nodes[i] → nodes[j]
         return matrix
-    def adjacency_list(self) -> Dict[str, List[str]]: # Trả về danh sách kề dưới dạng dictionary (đỉnh -> danh sách các đỉnh kề)
-        # Khởi tạo dictionary rỗng để lưu kết quả
-        adj_list: Dict[str, List[str]] = {}
-        
-        # Duyệt qua từng đỉnh trong đồ thị
-        for node in self.nodes:
-            # Lấy dictionary các đỉnh kề của node hiện tại
-            # neighbors có dạng: {đỉnh_kề: trọng_số}
-            neighbors = self.adjacency.get(node, {})
-            
-            # Nếu đồ thị CÓ TRỌNG SỐ: hiển thị dạng "đỉnh (trọng_số)"
-            if self.weighted:
-                # Khởi tạo danh sách rỗng để lưu các đỉnh kề đã được format
-                formatted_neighbors = []
-                
-                # Duyệt qua từng cặp (đỉnh_kề, trọng_số)
-                for nbr, weight in neighbors.items():
-                    # nbr: tên đỉnh kề
-                    # weight: trọng số của cạnh node → nbr
-                    
-                    # Trường hợp 1: Trọng số là vô cùng (∞)
-                    if weight == float('inf'):
-                        formatted_neighbors.append(f"{nbr} (∞)")
-                    # Trường hợp 2: Trọng số là số nguyên (ví dụ: 5.0 == 5)
-                    elif weight == int(weight):
-                        formatted_neighbors.append(f"{nbr} ({int(weight)})")
-                    # Trường hợp 3: Trọng số là số thập phân (ví dụ: 3.14)
-                    else:
-                        # :g là format để loại bỏ các số 0 thừa ở cuối
-                        formatted_neighbors.append(f"{nbr} ({weight:g})")
-                
-                # Lưu danh sách đã format vào kết quả
-                adj_list[node] = formatted_neighbors
-            
-            # Nếu đồ thị KHÔNG TRỌNG SỐ: chỉ hiển thị tên đỉnh
+    def matrix_cell(self, u: str, v: str) -> str: # Giá trị ô (u, v) của ma trận kề đã định dạng để hiển thị
+        # Đường chéo chính luôn là 0
+        if u == v:
+            return "0"
+        weight = self.adjacency.get(u, {}).get(v)
+        # Đồ thị có trọng số: không có cạnh hiển thị là ∞
+        if self.weighted:
+            if weight is None or weight == float('inf'):
+                return "∞"
+            return f"{weight:g}"
+        # Đồ thị không trọng số: 1 nếu có cạnh, 0 nếu không
+        return f"{weight if weight is not None else 0.0:g}"
+    def format_neighbors(self, node: str) -> List[str]: # Danh sách đỉnh kề của một đỉnh đã định dạng để hiển thị
+        # Lấy dictionary các đỉnh kề của node hiện tại
+        # neighbors có dạng: {đỉnh_kề: trọng_số}
+        neighbors = self.adjacency.get(node, {})
+        
+        # Nếu đồ thị KHÔNG TRỌNG SỐ: chỉ hiển thị tên đỉnh
+        if not self.weighted:
+            return list(neighbors.keys())
+        
+        # Nếu đồ thị CÓ TRỌNG SỐ: hiển thị dạng "đỉnh (trọng_số)"
+        formatted_neighbors = []
+        for nbr, weight in neighbors.items():
+            # Trường hợp 1: Trọng số là vô cùng (∞)
+            if weight == float('inf'):
+                formatted_neighbors.append(f"{nbr} (∞)")
+            # Trường hợp 2: Trọng số là số nguyên (ví dụ: 5.0 == 5)
+            elif weight == int(weight):
+                formatted_neighbors.append(f"{nbr} ({int(weight)})")
+            # Trường hợp 3: Trọng số là số thập phân (ví dụ: 3.14)
             else:
-                # Lấy danh sách các key (tên đỉnh kề) từ dictionary neighbors
-                # neighbors.keys() trả về dict_keys(['B', 'C', ...])
-                # list(...) chuyển thành ['B', 'C', ...]
-                adj_list[node] = list(neighbors.keys())
-        
-        # Trả về dictionary hoàn chỉnh
-        # Kết quả: {đỉnh: [danh_sách_đỉnh_kề]}
-        return adj_list
+                # :g là format để loại bỏ các số 0 thừa ở cuối
+                formatted_neighbors.append(f"{nbr} ({weight:g})")
+        return formatted_neighbors
+    def adjacency_list(self) -> Dict[str, List[str]]: # Trả về danh sách kề dưới dạng dictionary (đỉnh -> danh sách các đỉnh kề)
+        # Kết quả: {đỉnh: [danh_sách_đỉnh_kề]}, mỗi phần tử được định dạng bởi format_neighbors
+        return {node: self.format_neighbors(node) for node in self.nodes}
     # ------------------------------------------------------------------
     # Các hàm phân tích bổ sung
     # ------------------------------------------------------------------
@@ -208,6 +331,80 @@ class GraphData:
         # Nếu mật độ >= ngưỡng: đồ thị dày (nhiều cạnh)
         # Nếu mật độ < ngưỡng: đồ thị thưa (ít cạnh)
         return "Đồ thị dày" if d >= threshold else "Đồ thị thưa"
+    def in_degree(self, node: str) -> int: # Số cạnh đi vào một đỉnh (đồ thị vô hướng: bằng bậc)
+        if not self.directed:
+            return len(self.adjacency.get(node, ()))
+        return sum(1 for nbrs in self.adjacency.values() if node in nbrs)
+    def shortest_path(self, source: str, target: str) -> Optional[Tuple[List[str], float]]: # Đường đi ngắn nhất giữa hai đỉnh
+        """
+        BFS cho đồ thị không trọng số, Dijkstra cho đồ thị có trọng số (giả định trọng số không âm).
+
+        Returns:
+            Tuple gồm danh sách đỉnh trên đường đi và tổng độ dài, hoặc None nếu không có đường đi
+        """
+        if source not in self.adjacency or target not in self.adjacency:
+            return None
+        parent: Dict[str, Optional[str]] = {source: None}
+        if not self.weighted:
+            queue = deque([source])
+            while queue and target not in parent:
+                u = queue.popleft()
+                for v in self.adjacency[u]:
+                    if v not in parent:
+                        parent[v] = u
+                        queue.append(v)
+            if target not in parent:
+                return None
+            path = self._trace_path(parent, target)
+            return path, float(len(path) - 1)
+        dist = {source: 0.0}
+        heap = [(0.0, source)]
+        done = set()
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in done:
+                continue
+            if u == target:
+                return self._trace_path(parent, target), d
+            done.add(u)
+            for v, w in self.adjacency[u].items():
+                nd = d + w
+                if v not in done and nd < dist.get(v, float("inf")):
+                    dist[v] = nd
+                    parent[v] = u
+                    heapq.heappush(heap, (nd, v))
+        return None
+    @staticmethod
+    def _trace_path(parent: Dict[str, Optional[str]], target: str) -> List[str]: # Dựng lại đường đi từ bảng đỉnh cha
+        path = [target]
+        while parent[path[-1]] is not None:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return path
+    def snapshot(self) -> "GraphData": # Bản chụp để đọc trên luồng khác: chép danh sách đỉnh và từng danh sách kề, giữ phiên bản
+        """
+        Các thao tác sửa đổi ghi trực tiếp vào danh sách kề của từng đỉnh, nên bản chụp chép cả
+        các dict con (O(V + E), nhanh vì chỉ chép tham chiếu chuỗi/số). Gọi trên luồng Tk.
+        """
+        return GraphData(
+            directed=self.directed,
+            weighted=self.weighted,
+            nodes=list(self.nodes),
+            adjacency={node: dict(nbrs) for node, nbrs in self.adjacency.items()},
+            version=self.version,
+            node_versions=dict(self.node_versions),
+        )
+    def subgraph(self, nodes: Iterable[str]) -> "GraphData": # Đồ thị con cảm sinh bởi tập đỉnh cho trước (bỏ qua đỉnh không tồn tại)
+        keep = [node for node in dict.fromkeys(nodes) if node in self.adjacency]
+        keep_set = set(keep)
+        sub = GraphData(directed=self.directed, weighted=self.weighted)
+        sub.load_from_edges(keep, (
+            (u, v, w)
+            for u in keep
+            for v, w in self.adjacency[u].items()
+            if v in keep_set
+        ))
+        return sub
     # ------------------------------------------------------------------
     # Chuyển đổi sang thư viện NetworkX
     # ------------------------------------------------------------------
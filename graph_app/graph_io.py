@@ -1,10 +1,14 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Iterable, List, Optional, Tuple
 from .graph_data import GraphData
 
+# Hàm báo tiến độ progress(đã xong, tổng): được gọi định kỳ, có thể ném ngoại lệ để hủy giữa chừng
+ProgressCallback = Optional[Callable[[int, int], None]]
+PROGRESS_EVERY = 4096  # Số dòng/hàng giữa hai lần báo tiến độ
+
 def read_graph_from_text( # Đọc dữ liệu đồ thị từ một chuỗi văn bản.
-    text: str, directed: bool = False, weighted: bool = False
+    text: str, directed: bool = False, weighted: bool = False, progress: ProgressCallback = None
 ) -> GraphData:
     """
     Đọc dữ liệu đồ thị từ một chuỗi văn bản.
@@ -38,7 +42,10 @@ def read_graph_from_text( # Đọc dữ liệu đồ thị từ một chuỗi v
     edges = []
     nodes_set = set()
     has_weight = False
+    total = len(lines)
     for i, line in enumerate(lines[2:], start=3):
+        if progress is not None and i % PROGRESS_EVERY == 0:
+            progress(i, total)
         parts = line.strip().split()
         if len(parts) < 2:
             # Nếu dòng chỉ có 1 phần tử, coi đó là đỉnh đơn lẻ
@@ -68,16 +75,18 @@ def read_graph_from_text( # Đọc dữ liệu đồ thị từ một chuỗi v
     # Khởi tạo đối tượng GraphData và nạp dữ liệu
     graph = GraphData(directed=directed, weighted=weighted)
     graph.load_from_edges(nodes, edges)
+    if progress is not None:
+        progress(total, total)
     return graph
 def read_graph_from_file( # Đọc dữ liệu đồ thị từ tệp tin cục bộ.
-    path: str | Path, directed: bool = False, weighted: bool = False
+    path: str | Path, directed: bool = False, weighted: bool = False, progress: ProgressCallback = None
 ) -> GraphData:
     """
     Đọc nội dung file thành chuỗi văn bản
     Phân tích chuỗi đó thành đối tượng đồ thị
     """
-    return read_graph_from_text(Path(path).read_text(encoding="utf-8"), directed, weighted)
-def export_graph_to_file(graph: GraphData, path: str | Path) -> None: # Xuất cấu trúc đồ thị hiện tại ra tệp tin văn bản (.txt)
+    return read_graph_from_text(Path(path).read_text(encoding="utf-8"), directed, weighted, progress)
+def export_graph_to_file(graph: GraphData, path: str | Path, progress: ProgressCallback = None) -> None: # Xuất cấu trúc đồ thị hiện tại ra tệp tin văn bản (.txt)
     """
     Bao gồm: thuộc tính đồ thị, ma trận kề, danh sách kề và danh sách cạnh.
     """
@@ -96,28 +105,17 @@ def export_graph_to_file(graph: GraphData, path: str | Path) -> None: # Xuất c
     if not edge_lines:
         edge_lines.append("∅ (Đồ thị rỗng)")
 
-    # 2. Xây dựng ma trận kề dạng bảng
-    matrix = graph.adjacency_matrix()
+    # 2. Xây dựng ma trận kề dạng bảng (định dạng từng ô, không tạo ma trận trung gian)
     matrix_lines: List[str] = []
     if nodes:
         header = ["#"] + nodes
         matrix_lines.append("\t".join(header))
-        for idx, row in enumerate(matrix):
-            u = nodes[idx]
-            row_values: List[str] = [nodes[idx]]
-            for col_idx, val in enumerate(row):
-                v = nodes[col_idx]
-                if u == v:
-                    row_values.append("0")
-                else:
-                    weight = graph.adjacency.get(u, {}).get(v)
-                    if graph.weighted:
-                        if weight is None or weight == float('inf'):
-                            row_values.append("∞")
-                        else:
-                            row_values.append(f"{weight:g}")
-                    else:
-                        row_values.append(f"{val:g}")
+        for row, u in enumerate(nodes):
+            # Ma trận kề là phần tốn O(V²): báo tiến độ theo từng nhóm hàng
+            if progress is not None and row % max(1, PROGRESS_EVERY // max(node_count, 1)) == 0:
+                progress(row, node_count)
+            row_values: List[str] = [u]
+            row_values.extend(graph.matrix_cell(u, v) for v in nodes)
             matrix_lines.append("\t".join(row_values))
     else:
         matrix_lines.append("∅")
@@ -149,7 +147,72 @@ def export_graph_to_file(graph: GraphData, path: str | Path) -> None: # Xuất c
         "Danh sách kề:",
         *adj_list_lines,
     ]
+    # Báo tiến độ lần cuối trước khi ghi: tác vụ đã bị hủy (đồ thị đổi trong lúc xuất) thì dừng tại đây, file không bị ghi
+    if progress is not None:
+        progress(node_count, node_count)
     Path(path).write_text("\n".join(lines), encoding="utf-8")
+# Lệnh của script chỉnh sửa: (số dòng, tên lệnh, các tham số)
+Command = Tuple[int, str, Tuple[str, ...]]
+COMMAND_ARITY = {"add_node": (1, 1), "remove_node": (1, 1), "add_edge": (2, 3), "remove_edge": (2, 2)}  # Số tham số (tối thiểu, tối đa)
+
+def parse_command_script(text: str, progress: ProgressCallback = None) -> List[Command]: # Phân tích script chỉnh sửa đồ thị
+    """
+    Mỗi dòng một lệnh, cùng tên với các thao tác ghi của máy chủ truy vấn:
+    - add_node u / remove_node u
+    - add_edge u v [w] / remove_edge u v
+    Dòng trống và phần sau '#' được bỏ qua. Chỉ kiểm tra cú pháp; việc lệnh có áp dụng được
+    lên đồ thị hay không do apply_commands kiểm tra.
+    """
+    commands: List[Command] = []
+    lines = text.splitlines()
+    total = len(lines)
+    for i, line in enumerate(lines, start=1):
+        if progress is not None and i % PROGRESS_EVERY == 0:
+            progress(i, total)
+        parts = line.split("#", 1)[0].split()
+        if not parts:
+            continue
+        op, args = parts[0], tuple(parts[1:])
+        if op not in COMMAND_ARITY:
+            raise ValueError(f"Lỗi dòng {i}: Lệnh không hợp lệ '{op}' (chỉ hỗ trợ: {', '.join(COMMAND_ARITY)}).")
+        low, high = COMMAND_ARITY[op]
+        if not low <= len(args) <= high:
+            raise ValueError(f"Lỗi dòng {i}: Lệnh '{op}' cần {low if low == high else f'{low}-{high}'} tham số, nhận được {len(args)}.")
+        if op == "add_edge" and len(args) == 3:
+            try:
+                float(args[2])
+            except ValueError:
+                raise ValueError(f"Lỗi dòng {i}: Trọng số '{args[2]}' không hợp lệ (phải là số).")
+        commands.append((i, op, args))
+    if progress is not None:
+        progress(total, total)
+    return commands
+def read_command_script(path: str | Path, progress: ProgressCallback = None) -> List[Command]: # Đọc và phân tích script chỉnh sửa từ file
+    return parse_command_script(Path(path).read_text(encoding="utf-8"), progress)
+def apply_commands(graph: GraphData, commands: Iterable[Command]) -> int: # Áp dụng các lệnh trong một giao dịch, trả về số lệnh đã áp dụng
+    """
+    Toàn bộ script là một giao dịch GraphData.batch(): một lần tăng phiên bản. Nếu một lệnh
+    không áp dụng được (xóa đỉnh/cạnh không tồn tại), ValueError được ném ra và đồ thị giữ
+    nguyên như trước khi chạy script.
+    """
+    count = 0
+    with graph.batch():
+        for line, op, args in commands:
+            if op == "add_node":
+                graph.add_node(args[0])
+            elif op == "remove_node":
+                if args[0] not in graph.adjacency:
+                    raise ValueError(f"Lỗi dòng {line}: Đỉnh '{args[0]}' không tồn tại.")
+                graph.remove_node(args[0])
+            elif op == "add_edge":
+                graph.add_edge(args[0], args[1], float(args[2]) if len(args) == 3 else 1.0)
+            else:
+                u, v = args
+                if v not in graph.adjacency.get(u, {}):
+                    raise ValueError(f"Lỗi dòng {line}: Cạnh '{u} {v}' không tồn tại.")
+                graph.remove_edge(u, v)
+            count += 1
+    return count
 def load_karate_club(directed: bool = False) -> GraphData: # Tải đồ thị mẫu nổi tiếng - Zachary's Karate Club từ thư viện NetworkX.
     import networkx as nx
     base_graph = nx.karate_club_graph()
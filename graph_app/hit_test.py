@@ -0,0 +1,163 @@
+from __future__ import annotations
+import math
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+class _Grid:
+    """Lưới đều trong tọa độ màn hình: ô (cx, cy) -> mảng chỉ số phần tử nằm trong ô."""
+    def __init__(self, cell_size: float, cells_x: np.ndarray, cells_y: np.ndarray, items: np.ndarray) -> None:
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], np.ndarray] = {}
+        if len(items) == 0:
+            return
+        # Sắp xếp theo ô rồi cắt thành từng nhóm (vector hóa, không lặp theo phần tử)
+        order = np.lexsort((items, cells_y, cells_x))
+        cx, cy, items = cells_x[order], cells_y[order], items[order]
+        change = np.flatnonzero((np.diff(cx) != 0) | (np.diff(cy) != 0)) + 1
+        starts = np.concatenate(([0], change))
+        ends = np.concatenate((change, [len(items)]))
+        for s, e in zip(starts.tolist(), ends.tolist()):
+            self._cells[(int(cx[s]), int(cy[s]))] = items[s:e]
+    def query(self, x: float, y: float, reach: float) -> np.ndarray: # Các phần tử trong các ô cách (x, y) tối đa `reach` pixel
+        size = self.cell_size
+        k = int(math.ceil(reach / size))
+        cx, cy = int(math.floor(x / size)), int(math.floor(y / size))
+        found = [
+            self._cells[(i, j)]
+            for i in range(cx - k, cx + k + 1)
+            for j in range(cy - k, cy + k + 1)
+            if (i, j) in self._cells
+        ]
+        if not found:
+            return np.zeros(0, dtype=int)
+        return np.unique(np.concatenate(found))
+
+def _clip_segments(p1: np.ndarray, p2: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]: # Cắt các đoạn thẳng theo hình chữ nhật (Liang–Barsky, vector hóa)
+    """
+    Returns:
+        Tuple gồm mặt nạ các đoạn còn nhìn thấy và hai mảng tham số t0, t1 của phần nằm trong hình chữ nhật
+    """
+    d = p2 - p1
+    t0 = np.zeros(len(p1))
+    t1 = np.ones(len(p1))
+    visible = np.ones(len(p1), dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p, q in (
+            (-d[:, 0], p1[:, 0] - lo[0]),
+            (d[:, 0], hi[0] - p1[:, 0]),
+            (-d[:, 1], p1[:, 1] - lo[1]),
+            (d[:, 1], hi[1] - p1[:, 1]),
+        ):
+            r = q / p
+            visible &= ~((p == 0) & (q < 0))
+            t0 = np.where(p < 0, np.maximum(t0, r), t0)
+            t1 = np.where(p > 0, np.minimum(t1, r), t1)
+    visible &= t0 <= t1
+    return visible, t0, t1
+
+class HitTestIndex:
+    """
+    Chỉ mục không gian cho việc xác định đỉnh/cạnh được click trên canvas.
+
+    Tọa độ đỉnh được chuyển sang tọa độ màn hình bằng một phép biến đổi vector hóa, sau đó
+    đỉnh và các điểm lấy mẫu dọc theo cạnh (chỉ phần nằm trong khung nhìn) được xếp vào
+    một lưới đều. Mỗi truy vấn chỉ xét vài ô quanh điểm click nên tốn O(1) trung bình.
+    Chỉ mục chỉ được dựng lại khi vị trí đỉnh (geometry_version của renderer) hoặc phép
+    biến đổi khung nhìn thay đổi.
+    """
+    def __init__(self, cell_size: float = 24.0) -> None:
+        self.cell_size = cell_size
+        self._key = None
+        self._node_xy = np.zeros((0, 2))    # Tọa độ màn hình của các đỉnh
+        self._node_grid: Optional[_Grid] = None
+        self._edge_grid: Optional[_Grid] = None
+    def invalidate(self) -> None: # Buộc dựng lại chỉ mục ở lần truy vấn sau
+        self._key = None
+
+    # ------------------------------------------------------------------
+    # Truy vấn
+    # ------------------------------------------------------------------
+    def nearest_node(self, renderer, x: float, y: float, radius: float) -> Optional[str]: # Đỉnh gần điểm (x, y) nhất trong bán kính `radius` pixel
+        self._ensure(renderer)
+        candidates = self._node_grid.query(x, y, radius)
+        if len(candidates) == 0:
+            return None
+        d = np.hypot(self._node_xy[candidates, 0] - x, self._node_xy[candidates, 1] - y)
+        best = int(np.argmin(d))
+        if d[best] >= radius:
+            return None
+        return renderer.nodes[int(candidates[best])]
+    def nearest_edge(self, renderer, x: float, y: float, threshold: float) -> Optional[Tuple[str, str]]: # Cạnh gần điểm (x, y) nhất trong ngưỡng `threshold` pixel
+        self._ensure(renderer)
+        # Điểm mẫu cách điểm gần nhất trên cạnh tối đa nửa bước lấy mẫu
+        candidates = self._edge_grid.query(x, y, threshold + self.cell_size / 4)
+        if len(candidates) == 0:
+            return None
+        p1 = self._node_xy[renderer.src[candidates]]
+        p2 = self._node_xy[renderer.dst[candidates]]
+        d = p2 - p1
+        length_sq = (d * d).sum(axis=1)
+        valid = length_sq >= 0.00001  # Bỏ qua cạnh suy biến (hai đầu trùng nhau)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.clip(((x - p1[:, 0]) * d[:, 0] + (y - p1[:, 1]) * d[:, 1]) / length_sq, 0.0, 1.0)
+        dist = np.hypot(x - (p1[:, 0] + t * d[:, 0]), y - (p1[:, 1] + t * d[:, 1]))
+        dist = np.where(valid, dist, np.inf)
+        best = int(np.argmin(dist))
+        if dist[best] >= threshold:
+            return None
+        u, v, _ = renderer.edges[int(candidates[best])]
+        return (u, v)
+
+    # ------------------------------------------------------------------
+    # Dựng chỉ mục
+    # ------------------------------------------------------------------
+    def _ensure(self, renderer) -> None: # Dựng lại chỉ mục nếu vị trí hoặc khung nhìn đã thay đổi
+        ax = renderer.ax
+        key = (
+            id(renderer),
+            renderer.geometry_version,
+            tuple(ax.transData.get_affine().get_matrix().ravel()),
+            tuple(ax.bbox.bounds),
+        )
+        if key == self._key:
+            return
+        self._build(renderer)
+        self._key = key
+    def _build(self, renderer) -> None:
+        ax = renderer.ax
+        size = self.cell_size
+        xy = renderer.xy
+        self._node_xy = ax.transData.transform(xy) if len(xy) else np.zeros((0, 2))
+        # Chỉ đánh chỉ mục phần nằm trong khung nhìn (mở rộng một ô) vì click luôn nằm trong Axes
+        x0, y0, w, h = ax.bbox.bounds
+        lo = np.array([x0 - size, y0 - size])
+        hi = np.array([x0 + w + size, y0 + h + size])
+
+        # Đỉnh
+        inside = np.flatnonzero(np.all((self._node_xy >= lo) & (self._node_xy <= hi), axis=1))
+        cells = np.floor(self._node_xy[inside] / size).astype(np.int64)
+        self._node_grid = _Grid(size, cells[:, 0], cells[:, 1], inside)
+
+        # Cạnh: lấy mẫu phần nhìn thấy của mỗi cạnh với bước nửa ô
+        n_edges = len(renderer.src)
+        if n_edges == 0:
+            self._edge_grid = _Grid(size, np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0, dtype=int))
+            return
+        p1 = self._node_xy[renderer.src]
+        p2 = self._node_xy[renderer.dst]
+        visible, t0, t1 = _clip_segments(p1, p2, lo, hi)
+        edge_ids = np.flatnonzero(visible)
+        q1 = p1[edge_ids] + (p2[edge_ids] - p1[edge_ids]) * t0[edge_ids, None]
+        q2 = p1[edge_ids] + (p2[edge_ids] - p1[edge_ids]) * t1[edge_ids, None]
+        step = size / 2
+        counts = (np.floor(np.hypot(*(q2 - q1).T) / step).astype(np.int64) + 2)
+        owner = np.repeat(np.arange(len(edge_ids)), counts)
+        # Chỉ số mẫu trong từng cạnh: 0..count-1, quy về tham số s trong [0, 1]
+        offsets = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+        s = offsets / (counts[owner] - 1)
+        samples = q1[owner] + (q2[owner] - q1[owner]) * s[:, None]
+        cells = np.floor(samples / size).astype(np.int64)
+        # Mỗi cặp (ô, cạnh) chỉ giữ một lần
+        pairs = np.unique(np.stack([cells[:, 0], cells[:, 1], owner], axis=1), axis=0)
+        self._edge_grid = _Grid(size, pairs[:, 0], pairs[:, 1], edge_ids[pairs[:, 2]])
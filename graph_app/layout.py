@@ -0,0 +1,487 @@
+from __future__ import annotations
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .graph_data import GraphData
+
+Positions = Dict[str, Tuple[float, float]]
+
+QUADTREE_MIN_NODES = 1000     # Từ số đỉnh này trở lên dùng lực đẩy xấp xỉ theo cây tứ phân
+MULTILEVEL_MIN_NODES = 1000   # Từ số đỉnh này trở lên dùng layout đa mức (làm thô -> layout -> tinh chỉnh)
+COARSEST_NODES = 100          # Dừng làm thô khi đồ thị còn ít hơn số đỉnh này
+LEAF_SIZE = 8                 # Số đỉnh trung bình trong một ô lá của cây tứ phân
+_NEAR_PAIRS_CHUNK = 1 << 20   # Số cặp đỉnh tối đa xử lý trực tiếp trong một lần (giới hạn bộ nhớ)
+_MAX_DEPTH = 16               # Độ sâu tối đa của cây tứ phân
+
+def compact_graph(graph: GraphData) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]: # Chuyển GraphData sang dạng mảng chỉ số gọn (danh sách cạnh theo chỉ số)
+    """
+    Returns:
+        Tuple gồm danh sách đỉnh, mảng chỉ số đỉnh nguồn, mảng chỉ số đỉnh đích và mảng trọng số
+        (đồ thị vô hướng: mỗi cạnh xuất hiện một lần)
+    """
+    nodes = list(graph.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    src: List[int] = []
+    dst: List[int] = []
+    weights: List[float] = []
+    for u, nbrs in graph.adjacency.items():
+        i = index[u]
+        for v, weight in nbrs.items():
+            if graph.directed or u <= v:
+                src.append(i)
+                dst.append(index[v])
+                weights.append(weight if graph.weighted else 1.0)
+    weights_array = np.array(weights, dtype=float)
+    weights_array[~np.isfinite(weights_array)] = 1.0  # Trọng số ∞ không dùng được làm hệ số lực hút
+    return nodes, np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64), weights_array
+
+def warm_start_positions( # Vị trí khởi đầu: giữ vị trí cũ, đặt đỉnh mới gần các đỉnh kề đã có vị trí
+    nodes: Sequence[str],
+    src: np.ndarray,
+    dst: np.ndarray,
+    previous: Optional[Dict[str, Sequence[float]]] = None,
+    seed: int = 42,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns:
+        Tuple gồm mảng tọa độ (V, 2) và mặt nạ các đỉnh đã có vị trí từ trước
+    """
+    rng = np.random.default_rng(seed)
+    n = len(nodes)
+    xy = np.zeros((n, 2))
+    known = np.zeros(n, dtype=bool)
+    if previous:
+        for i, node in enumerate(nodes):
+            p = previous.get(node)
+            if p is not None:
+                xy[i] = p
+                known[i] = True
+    if not known.any():
+        # Không có vị trí cũ: khởi tạo ngẫu nhiên như spring_layout
+        return rng.random((n, 2)) * 2 - 1, known
+    placed = known.copy()
+    lo, hi = xy[known].min(axis=0), xy[known].max(axis=0)
+    jitter = max(float((hi - lo).max()), 1.0) * 0.05
+    # Lan truyền theo từng vòng: đỉnh mới nhận trung bình vị trí các đỉnh kề đã được đặt
+    for _ in range(8):
+        pending = ~placed
+        if not pending.any():
+            break
+        total = np.zeros((n, 2))
+        count = np.zeros(n)
+        for a, b in ((src, dst), (dst, src)):
+            mask = placed[b] & pending[a]
+            np.add.at(total, a[mask], xy[b[mask]])
+            np.add.at(count, a[mask], 1)
+        ready = count > 0
+        if not ready.any():
+            break
+        xy[ready] = total[ready] / count[ready, None] + rng.normal(0, jitter, (int(ready.sum()), 2))
+        placed |= ready
+    # Đỉnh không nối với phần đã đặt: rải ngẫu nhiên trong khung của các đỉnh cũ
+    rest = ~placed
+    xy[rest] = lo + rng.random((int(rest.sum()), 2)) * np.maximum(hi - lo, 1e-3)
+    return xy, known
+
+def _repulsion(xy: np.ndarray, k: float, block: int = 512) -> np.ndarray: # Lực đẩy k²/d giữa mọi cặp đỉnh (tính theo khối để giới hạn bộ nhớ)
+    disp = np.zeros_like(xy)
+    for start in range(0, len(xy), block):
+        delta = xy[start:start + block, None, :] - xy[None, :, :]
+        dist_sq = np.maximum((delta ** 2).sum(axis=2), 1e-4)  # Khoảng cách tối thiểu 0.01
+        disp[start:start + block] = (delta * (k * k / dist_sq)[:, :, None]).sum(axis=1)
+    return disp
+
+def _cells(unit: np.ndarray, level: int) -> Tuple[np.ndarray, np.ndarray]: # Ô chứa mỗi đỉnh ở một mức của cây tứ phân
+    g = 1 << level
+    cell = np.minimum((unit * g).astype(np.int64), g - 1)
+    return cell, cell[:, 0] * g + cell[:, 1]
+
+def _near_pairs(counts: np.ndarray, starts: np.ndarray, order: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray]]: # Liệt kê các cặp (i, j) với j thuộc ô lân cận của i, theo từng lô
+    """`counts[i]`/`starts[i]`: số đỉnh và vị trí bắt đầu (trong `order`) của ô lân cận đang xét của đỉnh i."""
+    bounds = np.cumsum(counts)
+    first = 0
+    while first < len(counts):
+        # Lấy đủ số đỉnh sao cho tổng số cặp không vượt quá _NEAR_PAIRS_CHUNK
+        base = bounds[first - 1] if first else 0
+        last = max(int(np.searchsorted(bounds, base + _NEAR_PAIRS_CHUNK, side="right")), first + 1)
+        cnt = counts[first:last]
+        i = np.repeat(np.arange(first, last), cnt)
+        offsets = np.arange(len(i)) - np.repeat(np.cumsum(cnt) - cnt, cnt)
+        j = order[np.repeat(starts[first:last], cnt) + offsets]
+        yield i, j
+        first = last
+
+def _far_field(xy: np.ndarray, unit: np.ndarray, kk: float, depth: int, disp: np.ndarray) -> None: # Lực đẩy từ các ô xa, cộng dồn vào disp
+    ox, oy = (a.ravel() for a in np.meshgrid(np.arange(6), np.arange(6), indexing="ij"))
+    # Duyệt từ mức 2 (ở mức 1 mọi ô đều kề nhau) tới mức lá
+    for level in range(2, depth + 1):
+        g = 1 << level
+        _, flat = _cells(unit, level)
+        occupied, owner = np.unique(flat, return_inverse=True)
+        n_cells = len(occupied)
+        cell_count = np.bincount(owner).astype(float)  # Số đỉnh trong ô
+        com = np.stack([np.bincount(owner, weights=xy[:, a]) for a in range(2)], axis=1) / cell_count[:, None]
+        count_ext = np.append(cell_count, 0.0)
+        com_ext = np.vstack([com, np.zeros((1, 2))])
+        cx, cy = occupied // g, occupied % g
+        tx = ((cx // 2) * 2 - 2)[:, None] + ox  # Khối 6x6 ô con thuộc 3x3 ô kề ô cha
+        ty = ((cy // 2) * 2 - 2)[:, None] + oy
+        far = (np.abs(tx - cx[:, None]) > 1) | (np.abs(ty - cy[:, None]) > 1)
+        valid = far & (tx >= 0) & (tx < g) & (ty >= 0) & (ty < g)
+        # Ô -> chỉ số trong danh sách ô có đỉnh (tìm nhị phân, không cấp phát mảng g*g);
+        # ô trống/ngoài lưới trỏ tới phần tử giả có 0 đỉnh
+        target = tx * g + ty
+        source = np.minimum(np.searchsorted(occupied, target), n_cells - 1)
+        source = np.where(valid & (occupied[source] == target), source, n_cells)
+        delta = com[:, None, :] - com_ext[source]
+        dist_sq = np.maximum((delta ** 2).sum(axis=2), 1e-4)
+        strength = kk * count_ext[source] / dist_sq
+        force = (delta * strength[:, :, None]).sum(axis=1)
+        # Jacobi của k²m·d/|d|²: k²m·(I/|d|² - 2·d·dᵀ/|d|⁴)
+        q = 2 * strength / dist_sq
+        jxx = (strength - q * delta[:, :, 0] ** 2).sum(axis=1)
+        jyy = (strength - q * delta[:, :, 1] ** 2).sum(axis=1)
+        jxy = (-q * delta[:, :, 0] * delta[:, :, 1]).sum(axis=1)
+        offset = xy - com[owner]
+        disp[:, 0] += force[owner, 0] + jxx[owner] * offset[:, 0] + jxy[owner] * offset[:, 1]
+        disp[:, 1] += force[owner, 1] + jxy[owner] * offset[:, 0] + jyy[owner] * offset[:, 1]
+
+def _near_field(xy: np.ndarray, unit: np.ndarray, kk: float, depth: int, disp: np.ndarray) -> None: # Lực đẩy trực tiếp giữa các đỉnh ở ô lân cận, cộng dồn vào disp
+    n = len(xy)
+    # Tính trực tiếp với các đỉnh trong 3x3 ô lân cận ở mức lá. Lực giữa hai đỉnh
+    # trực đối nên chỉ cần duyệt nửa số ô lân cận (và i < j trong cùng ô) rồi cộng cho cả hai phía.
+    g = 1 << depth
+    cell, flat = _cells(unit, depth)
+    order = np.argsort(flat, kind="stable")
+    sorted_flat = flat[order]
+    for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        tx = cell[:, 0] + dx
+        ty = cell[:, 1] + dy
+        valid = (tx >= 0) & (tx < g) & (ty >= 0) & (ty < g)
+        target = tx * g + ty
+        starts = np.searchsorted(sorted_flat, target, side="left")
+        counts = np.where(valid, np.searchsorted(sorted_flat, target, side="right") - starts, 0)
+        for i, j in _near_pairs(counts, starts, order):
+            if dx == 0 and dy == 0:
+                keep = i < j
+                i, j = i[keep], j[keep]
+            delta = xy[i] - xy[j]
+            dist_sq = np.maximum((delta ** 2).sum(axis=1), 1e-4)
+            force = delta * (kk / dist_sq)[:, None]
+            for axis in range(2):
+                disp[:, axis] += np.bincount(i, weights=force[:, axis], minlength=n)
+                disp[:, axis] -= np.bincount(j, weights=force[:, axis], minlength=n)
+
+def quadtree_repulsion(xy: np.ndarray, k: float, leaf_size: int = LEAF_SIZE) -> np.ndarray: # Lực đẩy xấp xỉ Barnes–Hut trên cây tứ phân đầy đủ, O(V log V)
+    """
+    Xấp xỉ lực đẩy theo kiểu Barnes–Hut, vector hóa theo từng mức của cây tứ phân.
+
+    Ở mỗi mức, mỗi ô có đỉnh chịu lực từ trọng tâm của các ô "xa" (không kề nó) nằm trong các
+    ô con của những ô kề với ô cha — mỗi cặp ô chỉ được xét ở đúng một mức, tối đa 27 ô mỗi mức.
+    Lực tại ô được khai triển bậc nhất quanh trọng tâm ô (lực + ma trận Jacobi) rồi nội suy cho
+    từng đỉnh, nên chi phí trường xa tỉ lệ với số ô thay vì số đỉnh. Ở mức lá, lực từ các đỉnh
+    trong 3x3 ô lân cận được tính trực tiếp.
+    """
+    n = len(xy)
+    lo = xy.min(axis=0)
+    span = max(float(np.ptp(xy[:, 0])), float(np.ptp(xy[:, 1])), 1e-9) * (1 + 1e-9)
+    unit = (xy - lo) / span  # Tọa độ chuẩn hóa trong [0, 1)
+    depth = int(min(max(np.ceil(0.5 * np.log2(max(n / leaf_size, 1.0))), 2), _MAX_DEPTH))
+    # Đỉnh phân bố không đều: tăng độ sâu tới khi số đỉnh trung bình cùng ô lá với một đỉnh đủ nhỏ
+    while depth < _MAX_DEPTH:
+        counts = np.unique(_cells(unit, depth)[1], return_counts=True)[1]
+        if (counts * counts).sum() <= 2 * leaf_size * n:
+            break
+        depth += 1
+    disp = np.zeros_like(xy)
+    _far_field(xy, unit, k * k, depth, disp)
+    _near_field(xy, unit, k * k, depth, disp)
+    return disp
+
+def fruchterman_reingold( # Thuật toán lò xo Fruchterman–Reingold, trả về tọa độ sau mỗi vòng lặp
+    xy: np.ndarray,
+    src: np.ndarray,
+    dst: np.ndarray,
+    weights: Optional[np.ndarray] = None,
+    iterations: int = 50,
+    temperature: Optional[float] = None,
+    repulsion=None,
+) -> Iterator[np.ndarray]:
+    """
+    Cài đặt vector hóa tương đương nx.spring_layout: lực đẩy k²/d giữa mọi cặp đỉnh,
+    lực hút w·d²/k dọc theo cạnh, bước di chuyển giới hạn bởi "nhiệt độ" giảm tuyến tính.
+    `repulsion(xy, k)` mặc định là tính trực tiếp O(V²) cho đồ thị nhỏ và xấp xỉ
+    Barnes–Hut (quadtree_repulsion) từ QUADTREE_MIN_NODES đỉnh trở lên.
+    """
+    xy = np.array(xy, dtype=float)
+    n = len(xy)
+    if n <= 1:
+        yield xy
+        return
+    if weights is None:
+        weights = np.ones(len(src))
+    if repulsion is None:
+        repulsion = _repulsion if n < QUADTREE_MIN_NODES else quadtree_repulsion
+    k = np.sqrt(1.0 / n)  # Khoảng cách tối ưu giữa các đỉnh
+    if temperature is None:
+        temperature = 0.1 * max(float(np.ptp(xy[:, 0])), float(np.ptp(xy[:, 1])), 1e-3)
+    dt = temperature / (iterations + 1)
+    for _ in range(iterations):
+        disp = repulsion(xy, k)
+        # Lực hút dọc theo cạnh: w·d/k theo hướng của cạnh (độ lớn w·d²/k)
+        delta = xy[src] - xy[dst]
+        dist = np.maximum(np.hypot(delta[:, 0], delta[:, 1]), 0.01)
+        pull = delta * (weights * dist / k)[:, None]
+        for axis in range(2):
+            disp[:, axis] += np.bincount(dst, weights=pull[:, axis], minlength=n)
+            disp[:, axis] -= np.bincount(src, weights=pull[:, axis], minlength=n)
+        # Giới hạn bước di chuyển theo nhiệt độ
+        length = np.maximum(np.hypot(disp[:, 0], disp[:, 1]), 0.01)
+        xy += disp * (temperature / length)[:, None]
+        temperature -= dt
+        yield xy
+
+@dataclass
+class CoarseLevel:
+    """Một mức trong phân cấp làm thô: đồ thị dạng mảng và ánh xạ đỉnh sang mức thô hơn."""
+    n: int                              # Số đỉnh
+    src: np.ndarray                     # Chỉ số đỉnh nguồn của các cạnh
+    dst: np.ndarray                     # Chỉ số đỉnh đích của các cạnh
+    weights: np.ndarray                 # Trọng số cạnh (tổng trọng số các cạnh gốc được gộp)
+    mass: np.ndarray                    # Số đỉnh gốc mà mỗi đỉnh đại diện
+    parent: Optional[np.ndarray] = None # Đỉnh -> đỉnh ở mức thô hơn (None với mức thô nhất)
+
+def _group(level: CoarseLevel, rng: np.random.Generator, rounds: int = 4) -> np.ndarray: # Gom đỉnh thành nhóm theo cạnh nặng (vector hóa, ghép cặp kiểu "bắt tay")
+    """
+    Mỗi vòng, mỗi đỉnh chưa ghép chọn đỉnh kề chưa ghép có điểm w/(m_u + m_v) cao nhất; các cặp
+    chọn nhau được ghép. Ưu tiên cạnh nặng và đỉnh nhẹ để các mức thô cân bằng. Sau cùng, đỉnh
+    chưa ghép nhập vào nhóm của đỉnh kề tốt nhất nếu đỉnh đó đã được ghép.
+
+    Returns:
+        Mảng group với group[u] là đỉnh đại diện cho nhóm chứa u
+    """
+    n = level.n
+    match = np.full(n, -1, dtype=np.int64)
+    keep = level.src != level.dst
+    a = np.concatenate([level.src[keep], level.dst[keep]])
+    b = np.concatenate([level.dst[keep], level.src[keep]])
+    w = np.concatenate([level.weights[keep], level.weights[keep]])
+    score = np.abs(w) / (level.mass[a] + level.mass[b])
+    score = score * (1 + 1e-3 * rng.random(len(score)))  # Phá thế hòa ngẫu nhiên (theo seed)
+
+    def best_neighbor(mask: np.ndarray) -> np.ndarray: # Đỉnh kề có điểm cao nhất theo các cạnh trong mask (-1 nếu không có)
+        aa, bb, ss = a[mask], b[mask], score[mask]
+        order = np.lexsort((-ss, aa))
+        aa, bb = aa[order], bb[order]
+        first = np.concatenate(([True], aa[1:] != aa[:-1])) if len(aa) else np.zeros(0, dtype=bool)
+        choice = np.full(n, -1, dtype=np.int64)
+        choice[aa[first]] = bb[first]
+        return choice
+
+    for _ in range(rounds):
+        free = (match[a] < 0) & (match[b] < 0)
+        if not free.any():
+            break
+        choice = best_neighbor(free)
+        chooser = np.flatnonzero(choice >= 0)
+        mutual = chooser[choice[choice[chooser]] == chooser]
+        match[mutual] = choice[mutual]
+    nodes = np.arange(n)
+    group = np.where(match >= 0, np.minimum(nodes, match), nodes)
+    # Đỉnh còn lẻ: nhập vào nhóm của đỉnh kề đã ghép (tránh mức thô giảm quá chậm)
+    lonely = (match[a] < 0) & (match[b] >= 0)
+    if lonely.any():
+        choice = best_neighbor(lonely)
+        joined = np.flatnonzero(choice >= 0)
+        group[joined] = group[choice[joined]]
+    return group
+
+def coarsen(level: CoarseLevel, rng: np.random.Generator) -> CoarseLevel: # Gộp mỗi nhóm đỉnh thành một đỉnh của đồ thị thô hơn (gán level.parent)
+    _, parent = np.unique(_group(level, rng), return_inverse=True)
+    level.parent = parent
+    n = int(parent.max()) + 1 if level.n else 0
+    cs, cd = parent[level.src], parent[level.dst]
+    keep = cs != cd
+    lo, hi = np.minimum(cs[keep], cd[keep]), np.maximum(cs[keep], cd[keep])
+    keys, inverse = np.unique(lo * n + hi, return_inverse=True)
+    return CoarseLevel(
+        n=n,
+        src=keys // n,
+        dst=keys % n,
+        weights=np.bincount(inverse, weights=level.weights[keep], minlength=len(keys)),
+        mass=np.bincount(parent, weights=level.mass, minlength=n),
+    )
+
+def coarsen_hierarchy(src: np.ndarray, dst: np.ndarray, weights: np.ndarray, n: int, rng: np.random.Generator) -> List[CoarseLevel]: # Phân cấp làm thô từ đồ thị gốc (mức 0) tới mức thô nhất
+    levels = [CoarseLevel(n, src, dst, weights, np.ones(n))]
+    while levels[-1].n > COARSEST_NODES:
+        coarser = coarsen(levels[-1], rng)
+        if coarser.n > 0.9 * levels[-1].n:
+            levels[-1].parent = None  # Làm thô không còn hiệu quả (ví dụ: đồ thị hình sao)
+            break
+        levels.append(coarser)
+    return levels
+
+def multilevel_layout( # Layout đa mức: làm thô, layout đồ thị thô nhất, rồi tinh chỉnh dần về đồ thị gốc
+    n: int,
+    src: np.ndarray,
+    dst: np.ndarray,
+    weights: np.ndarray,
+    iterations: int = 50,
+    seed: int = 42,
+) -> Iterator[np.ndarray]:
+    """
+    Trả về (dạng generator) tọa độ (V, 2) của đồ thị gốc sau mỗi vòng lặp ở mọi mức; ở các mức
+    thô, mọi đỉnh gốc nhận vị trí của đỉnh thô đại diện cho nó. Đồ thị thô nhất được layout
+    đầy đủ `iterations` vòng, các mức mịn hơn chỉ cần ít vòng với nhiệt độ thấp vì vị trí
+    khởi đầu (kế thừa từ mức thô) đã gần đúng. Các mức thô dùng trọng số cạnh bằng 1, trọng
+    số gốc chỉ được dùng ở mức cuối cùng.
+    """
+    rng = np.random.default_rng(seed)
+    levels = coarsen_hierarchy(src, dst, weights, n, rng)
+    # Ánh xạ đỉnh gốc -> đỉnh ở từng mức
+    to_level = [np.arange(n)]
+    for level in levels[:-1]:
+        to_level.append(level.parent[to_level[-1]])
+    refine_iterations = max(iterations // 5, 10)
+    xy = rng.random((levels[-1].n, 2)) * 2 - 1
+    for depth in range(len(levels) - 1, -1, -1):
+        level = levels[depth]
+        temperature = None
+        steps = iterations
+        if depth < len(levels) - 1:
+            # Kế thừa vị trí từ mức thô hơn, tách các đỉnh cùng nhóm bằng một nhiễu nhỏ
+            k = np.sqrt(1.0 / level.n)
+            xy = xy[level.parent] + rng.normal(0, 0.1 * k, (level.n, 2))
+            temperature = 2 * k
+            steps = refine_iterations
+        weights_at_level = level.weights if depth == 0 else None
+        for xy in fruchterman_reingold(xy, level.src, level.dst, weights_at_level, steps, temperature):
+            yield xy[to_level[depth]]
+
+def layout_steps( # Chọn thuật toán theo kích thước đồ thị, trả về tọa độ sau mỗi vòng lặp
+    xy: np.ndarray,
+    known: np.ndarray,
+    src: np.ndarray,
+    dst: np.ndarray,
+    weights: np.ndarray,
+    iterations: int = 50,
+    seed: int = 42,
+) -> Iterator[np.ndarray]:
+    """
+    Khởi đầu ấm (có đỉnh đã biết vị trí) hoặc đồ thị nhỏ: Fruchterman–Reingold trực tiếp từ `xy`.
+    Khởi đầu lạnh với đồ thị lớn: layout đa mức (bỏ qua `xy` ngẫu nhiên).
+    """
+    warm = bool(known.any())
+    if warm or len(xy) < MULTILEVEL_MIN_NODES:
+        temperature = _warm_temperature(xy) if warm else None
+        yield from fruchterman_reingold(xy, src, dst, weights, iterations, temperature)
+    else:
+        yield from multilevel_layout(len(xy), src, dst, weights, iterations, seed)
+
+def rescale(xy: np.ndarray, scale: float = 1.0) -> np.ndarray: # Đưa tọa độ về khung [-scale, scale] quanh gốc tọa độ (như nx.rescale_layout)
+    if len(xy) == 0:
+        return xy
+    xy = xy - xy.mean(axis=0)
+    lim = np.abs(xy).max()
+    return xy * (scale / lim) if lim > 0 else xy
+
+def to_positions(nodes: Sequence[str], xy: np.ndarray) -> Positions: # Chuyển mảng tọa độ sang dictionary {đỉnh: (x, y)}
+    return {node: (x, y) for node, (x, y) in zip(nodes, xy.tolist())}
+
+def _warm_temperature(xy: np.ndarray) -> float: # Nhiệt độ thấp khi khởi đầu ấm để các đỉnh cũ gần như giữ nguyên
+    if len(xy) == 0:
+        return 1e-3
+    return 0.02 * max(float(np.ptp(xy[:, 0])), float(np.ptp(xy[:, 1])), 1e-3)
+
+def spring_layout( # Tính layout đồng bộ (không dùng luồng nền), khởi đầu ấm từ `previous` nếu có
+    graph: GraphData,
+    previous: Optional[Dict[str, Sequence[float]]] = None,
+    iterations: int = 50,
+    seed: int = 42,
+) -> Positions:
+    nodes, src, dst, weights = compact_graph(graph)
+    xy, known = warm_start_positions(nodes, src, dst, previous, seed)
+    final = xy
+    for final in layout_steps(xy, known, src, dst, weights, iterations, seed):
+        pass
+    return to_positions(nodes, final if known.any() else rescale(final))
+
+class LayoutEngine:
+    """
+    Chạy layout lực lò xo trên một luồng nền và gửi vị trí trung gian về giao diện.
+
+    Mỗi lần start() tạo một "thế hệ" mới và hủy lần chạy trước; kết quả của thế hệ cũ bị
+    bỏ qua. Luồng nền chỉ làm việc trên bản sao dạng mảng của đồ thị, không chạm vào
+    GraphData hay Tk. Giao diện gọi poll() định kỳ (Tk after) để lấy vị trí mới nhất.
+    Nếu layout ném ngoại lệ, lần chạy kết thúc và ngoại lệ được giữ ở `error` cho giao diện báo lỗi.
+    """
+    def __init__(self, iterations: int = 50, report_every: int = 5) -> None:
+        self.iterations = iterations
+        self.report_every = report_every        # Gửi vị trí trung gian sau mỗi N vòng lặp
+        self.generation = 0
+        self._cancel = threading.Event()
+        self._results: queue.Queue = queue.Queue()
+        self._running = False
+        self.error: Optional[BaseException] = None  # Lỗi của lần chạy gần nhất (poll() ghi, giao diện đọc rồi xóa)
+    @property
+    def running(self) -> bool: # Có lần chạy nào chưa kết thúc
+        return self._running
+    def start(self, graph: GraphData, previous: Optional[Dict[str, Sequence[float]]] = None) -> Positions: # Bắt đầu layout nền, trả về vị trí khởi đầu để vẽ ngay
+        self.cancel()
+        self.generation += 1
+        self._cancel = threading.Event()
+        nodes, src, dst, weights = compact_graph(graph)
+        xy, known = warm_start_positions(nodes, src, dst, previous)
+        initial = to_positions(nodes, xy)
+        self.error = None
+        self._running = True
+        worker = threading.Thread(
+            target=self._run,
+            args=(self.generation, self._cancel, nodes, xy, known, src, dst, weights),
+            name="layout-engine",
+            daemon=True,
+        )
+        worker.start()
+        return initial
+    def cancel(self) -> None: # Hủy lần chạy hiện tại (kết quả chưa nhận sẽ bị bỏ qua)
+        self._cancel.set()
+        self.generation += 1
+        self._running = False
+    def poll(self) -> Optional[Tuple[Positions, bool]]: # Lấy vị trí mới nhất của thế hệ hiện tại: (vị trí, đã xong?)
+        latest = None
+        while True:
+            try:
+                generation, positions, finished = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self.generation:
+                continue  # Kết quả của lần chạy đã bị hủy
+            if isinstance(positions, BaseException):
+                # Luồng nền gặp lỗi: lần chạy kết thúc, giữ vị trí trung gian cuối cùng (nếu có)
+                self.error = positions
+                self._running = False
+                continue
+            latest = (positions, finished)
+            if finished:
+                self._running = False
+        return latest
+    def _run(self, generation, cancel, nodes, xy, known, src, dst, weights) -> None: # Hàm chạy trên luồng nền
+        # Khởi đầu lạnh: chuẩn hóa về [-1, 1] như spring_layout; khởi đầu ấm: giữ nguyên hệ tọa độ cũ
+        finish = (lambda a: a) if known.any() else rescale
+        current = xy
+        try:
+            steps = layout_steps(xy, known, src, dst, weights, self.iterations)
+            for i, current in enumerate(steps, start=1):
+                if cancel.is_set():
+                    return
+                if i % self.report_every == 0:
+                    self._results.put((generation, to_positions(nodes, finish(current)), False))
+            if not cancel.is_set():
+                self._results.put((generation, to_positions(nodes, finish(current)), True))
+        except Exception as e:  # Không để running kẹt ở True: báo lỗi về luồng Tk qua hàng đợi
+            self._results.put((generation, e, True))
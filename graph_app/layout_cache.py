@@ -0,0 +1,214 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .graph_data import GraphData
+
+Positions = Dict[str, Tuple[float, float]]
+
+NUM_PERMUTATIONS = 64       # Số hàm băm của chữ ký MinHash
+MIN_SIMILARITY = 0.5        # Độ tương đồng Jaccard (ước lượng) tối thiểu để dùng lại vị trí của đồ thị khác
+_PRIME = 4294967311         # Số nguyên tố > 2^32 cho họ hàm băm (a·x + b) mod p
+_rng = np.random.default_rng(20240501)  # Seed cố định: chữ ký phải giống nhau giữa các lần chạy
+_HASH_A = _rng.integers(1, 2 ** 31, NUM_PERMUTATIONS, dtype=np.uint64)
+_HASH_B = _rng.integers(0, 2 ** 31, NUM_PERMUTATIONS, dtype=np.uint64)
+
+def default_cache_dir() -> Path: # Thư mục bộ nhớ đệm mặc định trong thư mục người dùng
+    return Path.home() / ".graph_app" / "layout_cache"
+
+def structure_tokens(graph: GraphData) -> List[str]: # Các "token" mô tả cấu trúc đồ thị: mỗi đỉnh và mỗi cạnh một token
+    tokens = [f"n:{node}" for node in graph.adjacency]
+    for u, nbrs in graph.adjacency.items():
+        for v in nbrs:
+            if graph.directed or u <= v:
+                tokens.append(f"e:{u}\t{v}")
+    return tokens
+
+def fingerprint(graph: GraphData, tokens: Optional[Sequence[str]] = None) -> str: # Dấu vân tay cấu trúc (không phụ thuộc trọng số và thứ tự nhập)
+    if tokens is None:
+        tokens = structure_tokens(graph)
+    digest = hashlib.sha1(b"directed" if graph.directed else b"undirected")
+    for token in sorted(tokens):
+        digest.update(b"\n")
+        digest.update(token.encode("utf-8"))
+    return digest.hexdigest()
+
+def minhash(tokens: Sequence[str], chunk: int = 8192) -> np.ndarray: # Chữ ký MinHash của tập token (ước lượng độ tương đồng Jaccard)
+    signature = np.full(NUM_PERMUTATIONS, np.iinfo(np.uint64).max, dtype=np.uint64)
+    values = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in tokens), dtype=np.uint64, count=len(tokens))
+    for start in range(0, len(values), chunk):
+        hashed = (values[start:start + chunk, None] * _HASH_A + _HASH_B) % _PRIME
+        signature = np.minimum(signature, hashed.min(axis=0))
+    return signature
+
+@dataclass
+class PendingWrite:
+    """Phần ghi đĩa của một lần LayoutCache.store: chạy được trên luồng nền (không đọc GraphData)."""
+    cache: "LayoutCache"
+    key: str
+    directed: bool
+    positions: Positions                # Bản sao vị trí lúc lưu
+    index: List[dict]                   # Bản sao danh sách mục sau khi cập nhật
+    evicted: List[str]                  # Khóa các mục bị loại khỏi LRU
+    def write(self) -> None: # Ghi file vị trí, xóa file của các mục bị loại, ghi index.json
+        data = {
+            "directed": self.directed,
+            "positions": {node: [float(x), float(y)] for node, (x, y) in self.positions.items()},
+        }
+        cache = self.cache
+        with cache._io_lock:
+            try:
+                cache.directory.mkdir(parents=True, exist_ok=True)
+                cache._write_json(cache._entry_path(self.key), data)
+            except OSError:
+                return
+            for key in self.evicted:
+                try:
+                    cache._entry_path(key).unlink()
+                except OSError:
+                    pass
+            cache._write_index(self.index)
+
+class LayoutCache:
+    """
+    Bộ nhớ đệm vị trí đỉnh lưu trên đĩa, khóa theo dấu vân tay cấu trúc của đồ thị.
+
+    Mỗi layout được lưu thành một file JSON riêng; file index.json giữ danh sách các mục theo
+    thứ tự dùng gần nhất (LRU) cùng chữ ký MinHash. Khi không có mục trùng khớp hoàn toàn, mục
+    có độ tương đồng cao nhất (tối thiểu MIN_SIMILARITY) được dùng cho các đỉnh còn tồn tại.
+    Mọi lỗi đọc/ghi đĩa đều bị bỏ qua: bộ nhớ đệm chỉ giúp tăng tốc, không bắt buộc.
+
+    Dấu vân tay và chữ ký MinHash được nhớ theo phiên bản đồ thị: kéo thả đỉnh không đổi cấu
+    trúc nên các lần lưu sau không phải tính lại. prepare_store() cập nhật danh sách mục trong bộ
+    nhớ; phần ghi đĩa (PendingWrite.write) có thể chạy trên luồng nền.
+    """
+    def __init__(self, directory: str | Path | None = None, max_entries: int = 50) -> None:
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_entries = max_entries
+        self._index: Optional[List[dict]] = None  # Nạp trễ từ index.json, phần tử đầu là mục dùng gần nhất
+        self._signature: Optional[list] = None     # [phiên bản, có hướng, token, khóa, MinHash] của đồ thị gần nhất
+        self._io_lock = threading.Lock()          # Tuần tự hóa các lần ghi đĩa (có thể từ nhiều luồng)
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    def lookup(self, graph: GraphData) -> Optional[Positions]: # Vị trí đã lưu cho đồ thị (khớp hoàn toàn hoặc một phần), None nếu không có
+        """
+        Returns:
+            Dictionary {đỉnh: (x, y)} chỉ gồm các đỉnh có trong đồ thị, hoặc None
+        """
+        if not graph.adjacency:
+            return None
+        index = self._load_index()
+        if not index:
+            return None
+        key = self._fingerprint(graph)
+        entry = next((e for e in index if e["key"] == key), None)
+        if entry is None:
+            # Không khớp hoàn toàn: chọn mục có chữ ký MinHash giống nhất
+            signature = self._minhash(graph)
+            stored = np.array([e["minhash"] for e in index], dtype=np.uint64)
+            similarity = (stored == signature).mean(axis=1)
+            best = int(np.argmax(similarity))
+            if similarity[best] < MIN_SIMILARITY:
+                return None
+            entry = index[best]
+        data = self._read_json(self._entry_path(entry["key"]))
+        if data is None:
+            return None
+        positions = {
+            node: (float(p[0]), float(p[1]))
+            for node, p in data.get("positions", {}).items()
+            if node in graph.adjacency
+        }
+        if not positions:
+            return None
+        self._touch(entry)
+        return positions
+    def store(self, graph: GraphData, positions: Positions) -> None: # Lưu vị trí hiện tại của đồ thị (ghi đè mục cũ cùng khóa)
+        pending = self.prepare_store(graph, positions)
+        if pending is not None:
+            pending.write()
+    def prepare_store(self, graph: GraphData, positions: Positions) -> Optional[PendingWrite]: # Cập nhật danh sách mục (luồng gọi), trả về phần ghi đĩa
+        if not graph.adjacency:
+            return None
+        key = self._fingerprint(graph)
+        entry = {"key": key, "n_nodes": len(graph.adjacency), "minhash": self._minhash(graph).tolist()}
+        index = self._load_index()
+        index[:] = [e for e in index if e["key"] != key]
+        index.insert(0, entry)
+        # Loại các mục lâu không dùng nhất
+        evicted = [e["key"] for e in index[self.max_entries:]]
+        del index[self.max_entries:]
+        kept = {node: p for node, p in positions.items() if node in graph.adjacency}
+        return PendingWrite(self, key, graph.directed, kept, list(index), evicted)
+    def clear(self) -> None: # Xóa toàn bộ bộ nhớ đệm
+        for entry in self._load_index():
+            try:
+                self._entry_path(entry["key"]).unlink()
+            except OSError:
+                pass
+        self._index = []
+        self._save_index()
+
+    # ------------------------------------------------------------------
+    # Hàm nội bộ
+    # ------------------------------------------------------------------
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+    def _load_index(self) -> List[dict]: # Danh sách mục (nạp từ đĩa ở lần dùng đầu tiên)
+        if self._index is None:
+            data = self._read_json(self.directory / "index.json")
+            entries = data.get("entries", []) if isinstance(data, dict) else []
+            self._index = [e for e in entries if isinstance(e, dict) and len(e.get("minhash", ())) == NUM_PERMUTATIONS]
+        return self._index
+    def _save_index(self) -> None:
+        with self._io_lock:
+            self._write_index(list(self._index or []))
+    def _write_index(self, entries: List[dict]) -> None: # Ghi index.json (gọi khi đang giữ _io_lock)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._write_json(self.directory / "index.json", {"entries": entries})
+        except OSError:
+            pass
+    def _signature_for(self, graph: GraphData) -> list: # Mục nhớ token/khóa/MinHash của phiên bản đồ thị hiện tại (tính lại khi đồ thị đổi)
+        cached = self._signature
+        # Phiên bản 0: đồ thị dựng trực tiếp, chưa qua thao tác nào, không dùng làm khóa được
+        if cached is None or graph.version == 0 or cached[0] != graph.version or cached[1] != graph.directed:
+            tokens = structure_tokens(graph)
+            cached = self._signature = [graph.version, graph.directed, tokens, fingerprint(graph, tokens), None]
+        return cached
+    def _fingerprint(self, graph: GraphData) -> str:
+        return self._signature_for(graph)[3]
+    def _minhash(self, graph: GraphData) -> np.ndarray:
+        cached = self._signature_for(graph)
+        if cached[4] is None:
+            cached[4] = minhash(cached[2])
+            cached[2] = None    # Không cần giữ token nữa
+        return cached[4]
+    def _touch(self, entry: dict) -> None: # Đưa mục lên đầu danh sách LRU
+        index = self._load_index()
+        if index and index[0] is entry:
+            return
+        index.remove(entry)
+        index.insert(0, entry)
+        self._save_index()
+    @staticmethod
+    def _read_json(path: Path) -> Optional[dict]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+    @staticmethod
+    def _write_json(path: Path, data: dict) -> None: # Ghi qua file tạm rồi đổi tên để không để lại file hỏng
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
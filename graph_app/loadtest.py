@@ -0,0 +1,140 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from .server import DEFAULT_HOST, DEFAULT_PORT, GraphClient, GraphServer
+
+def make_requests(nodes: Sequence[str], count: int, rng: random.Random, write_ratio: float = 0.0) -> List[Dict[str, Any]]: # Sinh ngẫu nhiên một hỗn hợp truy vấn
+    requests = []
+    for _ in range(count):
+        u, v = rng.choice(nodes), rng.choice(nodes)
+        if rng.random() < write_ratio:
+            requests.append({"op": "add_edge", "u": u, "v": v, "weight": 1.0})
+            continue
+        kind = rng.random()
+        if kind < 0.4:
+            requests.append({"op": "has_edge", "u": u, "v": v})
+        elif kind < 0.7:
+            requests.append({"op": "neighbors", "node": u})
+        elif kind < 0.9:
+            requests.append({"op": "degree", "node": u})
+        elif kind < 0.98:
+            requests.append({"op": "density"})
+        else:
+            requests.append({"op": "path", "source": u, "target": v})
+    return requests
+
+async def _client_worker( # Một client: gửi các nhóm yêu cầu pipelined, ghi lại độ trễ mỗi nhóm
+    index: int, address: Dict[str, Any], nodes: Sequence[str], n_requests: int, depth: int, write_ratio: float, seed: int,
+) -> List[float]:
+    rng = random.Random(seed + index)
+    client = await GraphClient.connect(**address)
+    latencies = []
+    try:
+        requests = make_requests(nodes, n_requests, rng, write_ratio)
+        for start in range(0, len(requests), depth):
+            chunk = requests[start:start + depth]
+            t0 = time.perf_counter()
+            await client.pipeline(chunk)
+            latencies.append((time.perf_counter() - t0) * 1000)
+    finally:
+        await client.close()
+    return latencies
+
+async def run_load_test( # Chạy nhiều client đồng thời, trả về thống kê thông lượng và độ trễ
+    address: Dict[str, Any],
+    clients: int = 8,
+    requests_per_client: int = 1000,
+    depth: int = 16,
+    write_ratio: float = 0.0,
+    seed: int = 0,
+) -> Dict[str, float]:
+    """
+    Args:
+        address: Tham số kết nối của GraphClient.connect (host/port hoặc unix_path)
+        depth: Số yêu cầu gửi liền trong một lượt (độ sâu pipeline)
+        write_ratio: Tỉ lệ yêu cầu ghi (add_edge) trong hỗn hợp
+    """
+    probe = await GraphClient.connect(**address)
+    try:
+        nodes = await probe.request("nodes")
+    finally:
+        await probe.close()
+    if not nodes:
+        raise ValueError("Máy chủ chưa nạp đồ thị nào.")
+    start = time.perf_counter()
+    per_client = await asyncio.gather(*(
+        _client_worker(i, address, nodes, requests_per_client, depth, write_ratio, seed)
+        for i in range(clients)
+    ))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(x for chunk in per_client for x in chunk)
+    total = clients * requests_per_client
+    return {
+        "requests": total,
+        "seconds": elapsed,
+        "throughput": total / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))],
+        "p99_ms": latencies[int(0.99 * (len(latencies) - 1))],
+    }
+
+async def _wait_for_server(address: Dict[str, Any], timeout: float = 30.0) -> None: # Chờ máy chủ vừa khởi động nhận kết nối
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            client = await GraphClient.connect(**address)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+            continue
+        await client.close()
+        return
+
+async def _main(args: argparse.Namespace) -> Dict[str, float]:
+    address = {"unix_path": args.unix} if args.unix else {"host": args.host, "port": args.port}
+    process = None
+    if args.graph:
+        # Máy chủ chạy ở tiến trình riêng để không dùng chung vòng lặp sự kiện với các client
+        command = [sys.executable, "-m", "graph_app.server", args.graph, "--host", args.host, "--port", str(args.port)]
+        if args.unix:
+            command += ["--unix", args.unix]
+        process = await asyncio.create_subprocess_exec(*command, stdout=asyncio.subprocess.DEVNULL)
+    try:
+        await _wait_for_server(address)
+        return await run_load_test(address, args.clients, args.requests, args.depth, args.write_ratio, args.seed)
+    finally:
+        if process is not None:
+            process.terminate()
+            await process.wait()
+
+def main(argv: Optional[Sequence[str]] = None) -> int: # Điểm vào dòng lệnh: python -m graph_app.loadtest
+    parser = argparse.ArgumentParser(
+        prog="python -m graph_app.loadtest",
+        description="Kiểm tra tải máy chủ truy vấn đồ thị bằng nhiều client đồng thời.",
+    )
+    parser.add_argument("--graph", help="Tự khởi động máy chủ với file đồ thị này (mặc định: dùng máy chủ đang chạy)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="Kết nối qua Unix socket")
+    parser.add_argument("-c", "--clients", type=int, default=8, help="Số client đồng thời")
+    parser.add_argument("-n", "--requests", type=int, default=1000, help="Số yêu cầu mỗi client")
+    parser.add_argument("-d", "--depth", type=int, default=16, help="Độ sâu pipeline (số yêu cầu gửi liền một lượt)")
+    parser.add_argument("-w", "--write-ratio", type=float, default=0.0, help="Tỉ lệ yêu cầu ghi (0.0 - 1.0)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    stats = asyncio.run(_main(args))
+    print(f"{stats['requests']} yêu cầu trong {stats['seconds']:.2f} s: {stats['throughput']:.0f} yêu cầu/s")
+    print(f"Độ trễ mỗi lượt pipeline ({args.depth} yêu cầu): "
+          f"p50 {stats['p50_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
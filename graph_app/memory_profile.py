@@ -0,0 +1,152 @@
+from __future__ import annotations
+import gc
+import os
+import threading
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .graph_data import GraphData
+
+RSS_SAMPLE_INTERVAL = 0.0005  # Chu kỳ lấy mẫu RSS (giây) trong lúc một giai đoạn đang chạy
+
+def rss_bytes() -> Optional[int]: # Bộ nhớ thường trú (RSS) hiện tại của tiến trình, None nếu không đọc được (ngoài Linux)
+    try:
+        with open("/proc/self/statm", "rb") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+class RssSampler:
+    """Luồng nền đọc RSS định kỳ trong khối `with`, ghi lại giá trị lớn nhất (đỉnh RSS của giai đoạn)."""
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.start: Optional[int] = None
+        self.peak: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    def __enter__(self) -> "RssSampler":
+        self.start = self.peak = rss_bytes()
+        if self.start is not None:
+            self._thread = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+            self._thread.start()
+        return self
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._record(rss_bytes())
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._record(rss_bytes())
+    def _record(self, value: Optional[int]) -> None:
+        if value is not None and (self.peak is None or value > self.peak):
+            self.peak = value
+
+@dataclass
+class MemoryStats:
+    """
+    Bộ nhớ của một giai đoạn (byte). `peak` là mức cao nhất trong lúc dựng (kể cả dữ liệu tạm),
+    `retained` là phần còn giữ lại khi đối tượng kết quả vẫn sống. Theo tracemalloc (chính xác,
+    chỉ tính cấp phát qua Python/numpy) và theo RSS (toàn tiến trình, gồm cả bộ nhớ bộ cấp phát
+    chưa trả lại hệ điều hành; None nếu không đọc được).
+    """
+    peak: int
+    retained: int
+    rss_peak: Optional[int] = None
+    rss_retained: Optional[int] = None
+    def per_node(self, n_nodes: int) -> float:
+        return self.retained / n_nodes if n_nodes else 0.0
+    def per_edge(self, n_edges: int) -> float:
+        return self.retained / n_edges if n_edges else 0.0
+    def to_dict(self) -> Dict[str, Any]:
+        return {"peak": self.peak, "retained": self.retained, "rss_peak": self.rss_peak, "rss_retained": self.rss_retained}
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MemoryStats":
+        return cls(int(data["peak"]), int(data["retained"]), data.get("rss_peak"), data.get("rss_retained"))
+
+def measure_memory(build: Callable[[], Any]) -> Tuple[Any, MemoryStats]: # Đo bộ nhớ của một lần gọi build(); trả về kết quả (vẫn sống) và số liệu
+    """tracemalloc phải đang chạy (xem measure_memory_stages)."""
+    gc.collect()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    with RssSampler() as rss:
+        result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    rss_peak = rss_retained = None
+    if rss.start is not None:
+        rss_peak = rss.peak - rss.start
+        rss_retained = (rss_bytes() or rss.start) - rss.start
+    return result, MemoryStats(peak - before, current - before, rss_peak, rss_retained)
+
+# Các giai đoạn đo bộ nhớ: (tên, nhãn hiển thị)
+MEMORY_STAGES: List[Tuple[str, str]] = [
+    ("graph", "GraphData"),
+    ("matrix", "adjacency_matrix()"),
+    ("adj_list", "adjacency_list()"),
+    ("networkx", "to_networkx()"),
+    ("refresh", "Một lần refresh"),
+]
+
+def _derived_builders(graph: GraphData, include_matrix: bool) -> List[Tuple[str, Callable[[], Any]]]: # Các cấu trúc dẫn xuất dựng lại từ GraphData khi cập nhật giao diện
+    builders: List[Tuple[str, Callable[[], Any]]] = []
+    if include_matrix:
+        builders.append(("matrix", graph.adjacency_matrix))
+    builders.append(("adj_list", graph.adjacency_list))
+    try:
+        import networkx  # noqa: F401 (chỉ kiểm tra đã cài)
+        builders.append(("networkx", graph.to_networkx))
+    except ImportError:
+        pass
+    return builders
+
+def measure_memory_stages( # Đo bộ nhớ của GraphData và của từng cấu trúc dẫn xuất
+    nodes: List[str],
+    edges: List[Tuple],
+    directed: bool,
+    weighted: bool,
+    include_matrix: bool = True,
+) -> Dict[str, MemoryStats]:
+    """
+    Mỗi cấu trúc dẫn xuất (ma trận kề, danh sách kề, bản sao NetworkX) được đo riêng rồi giải
+    phóng. Giai đoạn "refresh" dựng lại tất cả và giữ chúng cùng lúc như khi giao diện cập nhật:
+    `retained` của nó là phần bộ nhớ do các bản sao trùng lặp của cùng một đồ thị.
+    Đo trong lúc tracemalloc chạy nên chậm hơn nhiều so với đo thời gian: không chạy chung.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        def load() -> GraphData:
+            graph = GraphData(directed=directed, weighted=weighted)
+            graph.load_from_edges(nodes, edges)
+            return graph
+
+        graph, stats = measure_memory(load)
+        results = {"graph": stats}
+        builders = _derived_builders(graph, include_matrix)
+        for name, build in builders:
+            built, results[name] = measure_memory(build)
+            del built
+        alive, results["refresh"] = measure_memory(lambda: [build() for _, build in builders])
+        del alive
+        return results
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+def duplicate_ratio(memory: Dict[str, MemoryStats]) -> float: # Tỉ lệ bộ nhớ của một lần refresh nằm ở các bản sao (so với tổng GraphData + bản sao)
+    graph, refresh = memory.get("graph"), memory.get("refresh")
+    if graph is None or refresh is None:
+        return 0.0
+    total = graph.retained + refresh.retained
+    return refresh.retained / total if total > 0 else 0.0
+
+def format_bytes(value: Optional[float]) -> str: # Định dạng số byte dễ đọc (B, KiB, MiB, GiB)
+    if value is None:
+        return "N/A"
+    for unit in ("B", "KiB", "MiB"):
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.2f} GiB"
@@ -0,0 +1,676 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+from matplotlib.patches import FancyArrowPatch
+from matplotlib.path import Path
+
+from .graph_data import GraphData
+
+# Kiểu dáng mặc định (giống giao diện vẽ trước đây bằng nx.draw_networkx_*)
+NODE_SIZE = 700                     # Kích thước đỉnh (points^2)
+NODE_FACE_COLOR = "white"           # Màu nền đỉnh
+DEFAULT_COLOR = "#95a5a6"           # Màu viền đỉnh / cạnh thường
+HIGHLIGHT_COLOR = "black"           # Màu viền đỉnh / cạnh được highlight
+NODE_WIDTH, NODE_HIGHLIGHT_WIDTH = 2.0, 3.0
+EDGE_WIDTH, EDGE_HIGHLIGHT_WIDTH = 1.5, 2.5
+ARROW_SIZE = 20                     # Kích thước mũi tên (đồ thị có hướng)
+ARROW_MARGIN = 15                   # Khoảng cách đầu/cuối mũi tên tới tâm đỉnh (points)
+LABEL_FONT_SIZE = 10
+WEIGHT_FONT_SIZE = 9
+WEIGHT_OFFSET_POINTS = 9            # Khoảng cách nhãn trọng số tới cạnh (points)
+WEIGHT_BOX_PAD = 0.3 * WEIGHT_FONT_SIZE  # Lề nền nhãn trọng số (points), như boxstyle "round,pad=0.3"
+WEIGHT_CHAR_WIDTH = 0.6 * WEIGHT_FONT_SIZE  # Độ rộng ước lượng của một ký tự nhãn trọng số (points)
+ARROW_HEAD_LENGTH = 0.4 * ARROW_SIZE  # Kích thước đầu mũi tên dạng đoạn thẳng (points), như arrowstyle '->'
+ARROW_HEAD_HALF_WIDTH = 0.2 * ARROW_SIZE
+
+@dataclass
+class LevelOfDetail:
+    """
+    Ngưỡng của chính sách mức chi tiết (level of detail).
+    Các ngưỡng về đỉnh/cạnh tính theo số phần tử nằm trong khung nhìn hiện tại, nên khi phóng
+    to vào một vùng nhỏ, nhãn và kích thước đầy đủ sẽ hiện trở lại.
+    """
+    max_full_size_nodes: int = 1000     # Số đỉnh trong khung nhìn tối đa để vẽ đỉnh kích thước đầy đủ
+    max_labels: int = 300               # Số đỉnh trong khung nhìn tối đa để hiện nhãn đỉnh
+    max_weight_labels: int = 200        # Số cạnh trong khung nhìn tối đa để hiện nhãn trọng số
+    max_arrow_patches: int = 300        # Số cạnh trong khung nhìn tối đa để vẽ mũi tên bằng FancyArrowPatch (còn lại: một LineCollection)
+    small_node_size: float = 40.0       # Kích thước đỉnh (points^2) khi giảm chi tiết
+
+def format_weight(weight: float) -> str: # Định dạng nhãn trọng số: hiển thị ∞ nếu là vô cùng
+    return "∞" if weight == float('inf') else f"{weight:g}"
+
+@lru_cache(maxsize=None)
+def weight_box(n_chars: int) -> Path: # Hình chữ nhật nền cho nhãn trọng số dài n_chars ký tự (đơn vị points)
+    half_w = n_chars * WEIGHT_CHAR_WIDTH / 2 + WEIGHT_BOX_PAD
+    half_h = WEIGHT_FONT_SIZE / 2 + WEIGHT_BOX_PAD
+    return Path([(-half_w, -half_h), (half_w, -half_h), (half_w, half_h), (-half_w, half_h), (-half_w, -half_h)], closed=True)
+
+def _pick(values: np.ndarray, ids: np.ndarray) -> np.ndarray: # Thuộc tính theo phần tử của collection (mảng 1 phần tử dùng chung cho mọi phần tử)
+    values = np.asarray(values)
+    return values[ids] if len(values) > 1 else np.repeat(values, len(ids), axis=0)
+
+def graph_edges(graph: GraphData) -> List[Tuple[str, str, float]]: # Danh sách cạnh để vẽ (vô hướng: mỗi cạnh một lần)
+    edges = []
+    for u, nbrs in graph.adjacency.items():
+        for v, weight in nbrs.items():
+            if graph.directed or u <= v:
+                edges.append((u, v, weight))
+    return edges
+
+class GraphRenderer:
+    """
+    Bộ vẽ đồ thị kiểu retained-mode trên một Axes của Matplotlib.
+
+    Các artist (PathCollection cho đỉnh, LineCollection hoặc FancyArrowPatch cho cạnh,
+    nhãn đỉnh, nhãn trọng số) chỉ được tạo lại khi cấu trúc đồ thị thay đổi. Vị trí nhãn trọng số
+    được tính một lần cho mọi cạnh bằng phép toán vector trên mảng đầu mút; nền của các nhãn
+    là một PathCollection duy nhất thay cho bbox riêng của từng nhãn. Kéo đỉnh và
+    đổi highlight chỉ cập nhật tọa độ, màu, độ dày tại chỗ; trong lúc kéo, canvas được vẽ
+    lại bằng blitting trên nền đã chụp sẵn.
+
+    Mức chi tiết (xem LevelOfDetail) được tính lại mỗi khi khung nhìn đổi (update_detail):
+    nhãn đỉnh/trọng số chỉ được tạo cho phần tử trong khung nhìn khi số lượng đủ nhỏ, đỉnh
+    thu nhỏ khi có quá nhiều, và khi khung nhìn chứa quá nhiều cạnh có hướng, cạnh cùng đầu mũi
+    tên được vẽ trong một LineCollection duy nhất thay cho từng FancyArrowPatch.
+    """
+    def __init__(self, ax, lod: Optional[LevelOfDetail] = None) -> None:
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.lod = lod if lod is not None else LevelOfDetail()
+        self._structure_key = None          # (id đồ thị, phiên bản, có hướng, có trọng số)
+        self.directed = False
+        self.weighted = False
+        self.nodes: List[str] = []
+        self.node_index: Dict[str, int] = {}
+        self.edges: List[Tuple[str, str, float]] = []
+        self.src = np.zeros(0, dtype=int)  # Chỉ số đỉnh nguồn của từng cạnh
+        self.dst = np.zeros(0, dtype=int)  # Chỉ số đỉnh đích của từng cạnh
+        self._incident: Dict[int, List[int]] = {}  # Đỉnh -> các cạnh liên thuộc
+        self.xy = np.zeros((0, 2))          # Tọa độ các đỉnh theo thứ tự self.nodes
+        self.node_artist = None
+        self.edge_artist: Optional[LineCollection] = None
+        self.arrow_artists: Dict[int, FancyArrowPatch] = {}  # Chỉ số cạnh -> mũi tên (tạo trễ theo khung nhìn)
+        self.label_artists: Dict[int, object] = {}   # Chỉ số đỉnh -> nhãn (tạo trễ theo khung nhìn)
+        self.weight_artists: Dict[int, object] = {}  # Chỉ số cạnh -> nhãn trọng số (tạo trễ theo khung nhìn)
+        self.weight_background = None      # PathCollection: nền của các nhãn trọng số đang hiện
+        self.weight_xy = np.zeros((0, 2))   # Vị trí (dữ liệu) nhãn trọng số của mọi cạnh
+        self._weight_text: List[str] = []   # Nội dung nhãn trọng số của mọi cạnh
+        self._weight_shown = np.zeros(0, dtype=int)  # Chỉ số các cạnh đang hiện nhãn trọng số
+        self._edge_arrows = False           # Cạnh có hướng vẽ kèm đầu mũi tên trong edge_artist
+        self._arrow_patches = False         # Cạnh trong khung nhìn đang vẽ bằng FancyArrowPatch (edge_artist ẩn)
+        self._edge_hl = np.zeros(0, dtype=bool)  # Cạnh đang được highlight (màu cho mũi tên tạo trễ)
+        self._node_size = NODE_SIZE         # Kích thước đỉnh đang dùng (theo mức chi tiết)
+        self.zoomed = False                 # Người dùng đã phóng to/thu nhỏ (autoscale không ghi đè)
+        self._background = None             # Nền đã chụp cho blitting
+        self._animating = False
+        self._drag_nodes = None             # Chỉ số các đỉnh đang kéo (lớp phủ blit), None nếu không kéo
+        self._drag_edges = np.zeros(0, dtype=int)     # Các cạnh liên thuộc với đỉnh đang kéo
+        self._drag_weights = np.zeros(0, dtype=int)   # Các cạnh liên thuộc đang hiện nhãn trọng số
+        self._overlay: list = []            # Artist động khi kéo: chỉ phần liên quan tới đỉnh đang kéo
+        self._overlay_created: list = []    # Artist tạm (tạo khi bắt đầu kéo, xóa khi kết thúc)
+        self.geometry_version = 0           # Tăng mỗi khi tọa độ đỉnh thay đổi (dùng cho chỉ mục hit-test)
+        self._state_nodes: list = []        # Lớp trạng thái (show_states): một PathCollection mỗi trạng thái đỉnh
+        self._state_edges: Dict[int, Line2D] = {}  # Trạng thái cạnh -> Line2D (trừ trạng thái giữ nét vẽ thường)
+        self._state_paths = None            # Đường vẽ (E, k, 2) của từng cạnh trong lớp trạng thái, ngắt bằng NaN
+        self._state_key = None              # (phiên bản tọa độ, khung nhìn, kích thước đỉnh) lúc tính _state_paths
+
+    # ------------------------------------------------------------------
+    # API chính
+    # ------------------------------------------------------------------
+    def render( # Vẽ đồ thị: dựng lại artist nếu cấu trúc đổi, ngược lại chỉ cập nhật tại chỗ
+        self,
+        graph: GraphData,
+        pos: Dict[str, Sequence[float]],
+        highlighted_nodes: Iterable[str] = (),
+        highlighted_edges: Iterable[Tuple[str, str]] = (),
+    ) -> None:
+        key = (id(graph), graph.version, graph.directed, graph.weighted)
+        if key != self._structure_key:
+            self.rebuild(graph, pos, highlighted_nodes, highlighted_edges)
+            self._structure_key = key
+        else:
+            self.update_positions(pos)
+            self.update_highlights(highlighted_nodes, highlighted_edges)
+            self.canvas.draw_idle()
+    def invalidate(self) -> None: # Buộc lần render() sau dựng lại toàn bộ artist
+        self._structure_key = None
+    def rebuild( # Tạo lại toàn bộ artist từ đầu
+        self,
+        graph: GraphData,
+        pos: Dict[str, Sequence[float]],
+        highlighted_nodes: Iterable[str] = (),
+        highlighted_edges: Iterable[Tuple[str, str]] = (),
+    ) -> None:
+        ax = self.ax
+        # Giữ khung nhìn người dùng đã phóng to khi chỉ cấu trúc của cùng đồ thị thay đổi
+        keep_view = (ax.get_xlim(), ax.get_ylim()) if self.zoomed and self._structure_key and self._structure_key[0] == id(graph) else None
+        ax.clear()
+        self._background = None
+        self._animating = False
+        self._drag_nodes = None
+        self._overlay, self._overlay_created = [], []
+        self._state_nodes, self._state_edges, self._state_paths = [], {}, None
+        self.directed = graph.directed
+        self.weighted = graph.weighted
+
+        # Chỉ số hóa đỉnh/cạnh một lần để các lần cập nhật sau làm việc trên mảng
+        self.nodes = list(graph.nodes)
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        self.edges = graph_edges(graph)
+        self.src = np.fromiter((self.node_index[u] for u, _, _ in self.edges), dtype=int, count=len(self.edges))
+        self.dst = np.fromiter((self.node_index[v] for _, v, _ in self.edges), dtype=int, count=len(self.edges))
+        self._incident = {}
+        for e, (i, j) in enumerate(zip(self.src.tolist(), self.dst.tolist())):
+            self._incident.setdefault(i, []).append(e)
+            if j != i:
+                self._incident.setdefault(j, []).append(e)
+        self.xy = self._positions_array(pos)
+        self.geometry_version += 1
+
+        # Giới hạn trục cần có trước khi tính đầu mũi tên (theo pixel) và mức chi tiết
+        if keep_view is not None:
+            ax.set_xlim(*keep_view[0])
+            ax.set_ylim(*keep_view[1])
+        else:
+            self.zoomed = False
+            self.autoscale(update=False)
+        ax.axis("off")
+
+        # Cạnh (vẽ trước để nằm dưới đỉnh): một LineCollection, kèm đầu mũi tên nếu có hướng.
+        # Mũi tên FancyArrowPatch của cạnh trong khung nhìn được tạo trong update_detail()
+        self.arrow_artists = {}
+        self._arrow_patches = False
+        self._edge_hl = np.zeros(len(self.edges), dtype=bool)
+        self._edge_arrows = self.directed
+        self.edge_artist = LineCollection(self._edge_segments(), colors=DEFAULT_COLOR, linewidths=EDGE_WIDTH, zorder=1)
+        ax.add_collection(self.edge_artist)
+
+        # Đỉnh: một PathCollection duy nhất
+        self.node_artist = ax.scatter(
+            self.xy[:, 0], self.xy[:, 1],
+            s=self._node_size,
+            c=NODE_FACE_COLOR,
+            edgecolors=DEFAULT_COLOR,
+            linewidths=NODE_WIDTH,
+            zorder=2,
+        )
+
+        # Nhãn trọng số: nội dung định dạng một lần, nền là một PathCollection chung
+        self.weight_background = None
+        self._weight_text = [format_weight(w) for _, _, w in self.edges] if self.weighted else []
+        self._weight_shown = np.zeros(0, dtype=int)
+        if self.weighted:
+            self.weight_background = ax.scatter(
+                np.zeros(0), np.zeros(0), s=1, marker=weight_box(1),
+                c=NODE_FACE_COLOR, edgecolors="none", alpha=0.8, zorder=2.5,
+            )
+
+        # Nhãn đỉnh và nhãn trọng số được tạo theo khung nhìn trong update_detail()
+        self.label_artists = {}
+        self.weight_artists = {}
+        self.update_detail()
+        self.update_highlights(highlighted_nodes, highlighted_edges)
+        self.canvas.draw_idle()
+    def update_positions(self, pos: Dict[str, Sequence[float]], nodes: Optional[Iterable[str]] = None) -> None: # Cập nhật tọa độ tại chỗ
+        """
+        Cập nhật tọa độ các đỉnh. Nếu truyền `nodes`, chỉ các đỉnh đó và các cạnh liên thuộc
+        được cập nhật (dùng khi kéo một đỉnh).
+        """
+        if nodes is None:
+            self.xy = self._positions_array(pos)
+            node_ids = range(len(self.nodes))
+            edge_ids = None
+        else:
+            node_ids = [self.node_index[n] for n in nodes if n in self.node_index]
+            for i in node_ids:
+                self.xy[i] = pos[self.nodes[i]]
+            edge_ids = sorted({e for i in node_ids for e in self._incident.get(i, ())})
+        self.geometry_version += 1
+        if self.node_artist is None:
+            return
+        if self._drag_nodes is not None and nodes is not None:
+            # Đang kéo: chỉ cập nhật lớp phủ (đỉnh kéo và các cạnh liên thuộc), nền tĩnh giữ nguyên
+            self._update_overlay()
+            return
+        self.node_artist.set_offsets(self.xy)
+        if self.label_artists:
+            for i in node_ids:
+                label = self.label_artists.get(i)
+                if label is not None:
+                    label.set_position(self.xy[i])
+        self._update_edge_geometry(edge_ids)
+    def update_highlights( # Cập nhật màu/độ dày của đỉnh và cạnh theo trạng thái highlight
+        self,
+        highlighted_nodes: Iterable[str],
+        highlighted_edges: Iterable[Tuple[str, str]],
+    ) -> None:
+        if self.node_artist is None:
+            return
+        hn = set(highlighted_nodes)
+        he: Set[Tuple[str, str]] = set(highlighted_edges)
+        node_hl = np.fromiter((n in hn for n in self.nodes), dtype=bool, count=len(self.nodes))
+        self.node_artist.set_edgecolors([HIGHLIGHT_COLOR if h else DEFAULT_COLOR for h in node_hl])
+        self.node_artist.set_linewidths(np.where(node_hl, NODE_HIGHLIGHT_WIDTH, NODE_WIDTH))
+        edge_hl = np.fromiter(
+            ((u, v) in he or (not self.directed and (v, u) in he) for u, v, _ in self.edges),
+            dtype=bool, count=len(self.edges),
+        )
+        self._edge_hl = edge_hl
+        for e, arrow in self.arrow_artists.items():
+            arrow.set_color(HIGHLIGHT_COLOR if edge_hl[e] else DEFAULT_COLOR)
+            arrow.set_linewidth(EDGE_HIGHLIGHT_WIDTH if edge_hl[e] else EDGE_WIDTH)
+        colors = [HIGHLIGHT_COLOR if h else DEFAULT_COLOR for h in edge_hl]
+        widths = [EDGE_HIGHLIGHT_WIDTH if h else EDGE_WIDTH for h in edge_hl]
+        if self.edge_artist is not None:
+            if self._edge_arrows:
+                # Mỗi cạnh gồm 3 đoạn: thân và hai nét đầu mũi tên
+                colors = [c for c in colors for _ in range(3)]
+                widths = [w for w in widths for _ in range(3)]
+            self.edge_artist.set_color(colors)
+            self.edge_artist.set_linewidths(widths)
+    def autoscale(self, margin: float = 0.1, force: bool = False, update: bool = True) -> None: # Đặt giới hạn trục vừa với toàn bộ đỉnh
+        """Giữ khung nhìn người dùng đã phóng to (chỉ tính lại mức chi tiết), trừ khi `force`."""
+        if len(self.xy) == 0:
+            return
+        if force or not self.zoomed:
+            self.zoomed = False
+            lo = self.xy.min(axis=0)
+            hi = self.xy.max(axis=0)
+            pad = np.maximum((hi - lo) * margin, 0.1)
+            self.ax.set_xlim(lo[0] - pad[0], hi[0] + pad[0])
+            self.ax.set_ylim(lo[1] - pad[1], hi[1] + pad[1])
+        if update:
+            self.update_detail()
+    def zoom(self, x: float, y: float, factor: float) -> None: # Phóng to (factor < 1) hoặc thu nhỏ quanh điểm (x, y) theo tọa độ dữ liệu
+        ax = self.ax
+        (x0, x1), (y0, y1) = ax.get_xlim(), ax.get_ylim()
+        ax.set_xlim(x - (x - x0) * factor, x + (x1 - x) * factor)
+        ax.set_ylim(y - (y - y0) * factor, y + (y1 - y) * factor)
+        self.zoomed = True
+        if factor > 1 and len(self.xy) and self._visible_nodes().size == len(self.xy):
+            self.autoscale(force=True, update=False)  # Đã thu nhỏ tới mức thấy toàn bộ: trở lại tự căn khung
+        self.update_detail()
+    def update_detail(self) -> None: # Áp dụng chính sách mức chi tiết theo khung nhìn hiện tại
+        if self.node_artist is None:
+            return
+        lod = self.lod
+        visible = self._visible_nodes()
+        full = len(visible) <= lod.max_full_size_nodes
+        self._node_size = NODE_SIZE if full else lod.small_node_size
+        self.node_artist.set_sizes([self._node_size])
+        # Nhãn đỉnh: chỉ khi đỉnh đủ lớn để chứa nhãn
+        show = visible if full and len(visible) <= lod.max_labels else np.zeros(0, dtype=int)
+        self._show_only(self.label_artists, show, self._make_label)
+        # Nhãn trọng số nằm trong khung nhìn (offset theo points phụ thuộc mức phóng to)
+        if self.weighted:
+            self.weight_xy = self._weight_positions()
+            edges = self._visible_weights()
+            show = edges if len(edges) <= lod.max_weight_labels else np.zeros(0, dtype=int)
+            self._show_only(self.weight_artists, show, self._make_weight_label)
+            for e in show.tolist():
+                self.weight_artists[e].set_position(self.weight_xy[e])
+            self._weight_shown = show
+            self.weight_background.set_paths([weight_box(len(self._weight_text[e])) for e in show.tolist()])
+            self.weight_background.set_offsets(self.weight_xy[show] if len(show) else np.zeros((0, 2)))
+        # Cạnh có hướng: FancyArrowPatch cho các cạnh trong khung nhìn khi đủ ít, ngược lại
+        # LineCollection với đầu mũi tên dạng đoạn thẳng (kích thước theo pixel: tính lại khi khung nhìn đổi)
+        if self._edge_arrows and self.edge_artist is not None:
+            edges = self._visible_edges()
+            self._arrow_patches = len(edges) <= lod.max_arrow_patches
+            self._show_only(self.arrow_artists, edges if self._arrow_patches else np.zeros(0, dtype=int), self._make_arrow)
+            self.edge_artist.set_visible(not self._arrow_patches)
+            if not self._arrow_patches:
+                self.edge_artist.set_segments(self._edge_segments())
+
+    # ------------------------------------------------------------------
+    # Blitting
+    # ------------------------------------------------------------------
+    def dynamic_artists(self) -> list: # Các artist thay đổi trong lúc kéo/hoạt ảnh
+        if self._drag_nodes is not None:
+            return self._overlay
+        artists = []
+        if self._state_nodes:
+            # Lớp trạng thái: cạnh ở trạng thái thường nằm trong nền, đỉnh gốc đang ẩn
+            artists.extend(self._state_edges.values())
+            artists.extend(self._state_nodes)
+        else:
+            if self.edge_artist is not None and self.edge_artist.get_visible():
+                artists.append(self.edge_artist)
+            artists.extend(arrow for arrow in self.arrow_artists.values() if arrow.get_visible())
+            if self.node_artist is not None:
+                artists.append(self.node_artist)
+        # Nhãn ẩn (ngoài khung nhìn hoặc bị giảm chi tiết) không cần vẽ lại
+        artists.extend(label for label in self.label_artists.values() if label.get_visible())
+        if self.weight_background is not None:
+            artists.append(self.weight_background)
+        artists.extend(label for label in self.weight_artists.values() if label.get_visible())
+        return artists
+    def begin_animation(self, nodes: Optional[Iterable[str]] = None) -> None: # Chụp nền tĩnh (không có các artist động) để blit
+        """
+        Nếu truyền `nodes` (kéo đỉnh), chỉ các đỉnh đó cùng cạnh và nhãn liên thuộc được tách
+        thành lớp phủ động; phần còn lại của đồ thị nằm trong nền đã chụp, nên mỗi khung hình
+        chỉ tốn O(bậc của đỉnh) bất kể đồ thị lớn tới đâu.
+        """
+        if self._animating or self.node_artist is None:
+            return
+        if nodes is not None:
+            self._begin_overlay([self.node_index[n] for n in nodes if n in self.node_index])
+        for artist in self.dynamic_artists():
+            artist.set_animated(True)
+        self.canvas.draw()
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._animating = True
+    def blit(self) -> None: # Vẽ lại các artist động lên nền đã chụp (không vẽ lại toàn bộ figure)
+        if not self._animating or self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        for artist in self.dynamic_artists():
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.ax.bbox)
+    def end_animation(self) -> None: # Kết thúc chế độ blit, trả các artist về chế độ vẽ thường
+        if not self._animating:
+            return
+        for artist in self.dynamic_artists():
+            artist.set_animated(False)
+        if self._drag_nodes is not None:
+            self._end_overlay()
+        self._animating = False
+        self._background = None
+        self.canvas.draw_idle()
+    # ------------------------------------------------------------------
+    # Lớp trạng thái (tô màu đỉnh/cạnh theo mã, dùng cho mô phỏng thuật toán)
+    # ------------------------------------------------------------------
+    def show_states( # Vẽ đỉnh/cạnh theo mã trạng thái, mỗi trạng thái một artist cùng kiểu dáng
+        self,
+        node_state: np.ndarray,
+        edge_state: np.ndarray,
+        node_styles: Sequence[Tuple[str, str, float]],
+        edge_styles: Sequence[Optional[Tuple[str, float]]],
+    ) -> None:
+        """
+        node_styles[k] = (màu nền, màu viền, độ dày viền) của đỉnh mang mã k; edge_styles[k] =
+        (màu, độ dày) của cạnh mang mã k, hoặc None để giữ nét vẽ thường của cạnh (khi blit, các
+        cạnh này nằm trong nền đã chụp nên không tốn gì mỗi khung hình).
+
+        Mỗi trạng thái đỉnh là một PathCollection đồng màu, nên Agg vẽ bằng draw_markers (marker
+        rasterize một lần) thay cho đường vẽ từng đỉnh một màu; cạnh của mỗi trạng thái là một
+        Line2D duy nhất ngắt đoạn bằng NaN. Cập nhật chỉ là lọc mảng tọa độ theo mã.
+        """
+        if self.node_artist is None:
+            return
+        if not self._state_nodes:
+            self._create_state_layer(node_styles, edge_styles)
+        key = (self.geometry_version, self.ax.get_xlim(), self.ax.get_ylim(), self._node_size)
+        if key != self._state_key:
+            self._state_paths = self._edge_polylines()
+            self._state_key = key
+        for k, artist in enumerate(self._state_nodes):
+            artist.set_offsets(self.xy[node_state == k])
+            artist.set_sizes([self._node_size])
+        for k, artist in self._state_edges.items():
+            artist.set_data(*self._state_paths[edge_state == k].reshape(-1, 2).T)
+    def clear_states(self) -> None: # Xóa lớp trạng thái, hiện lại đỉnh/cạnh với kiểu dáng thường
+        if not self._state_nodes:
+            return
+        for artist in [*self._state_nodes, *self._state_edges.values()]:
+            artist.remove()
+        self._state_nodes, self._state_edges, self._state_paths = [], {}, None
+        self._state_key = None
+        self.node_artist.set_visible(True)
+        self.canvas.draw_idle()
+    def _create_state_layer(self, node_styles, edge_styles) -> None: # Tạo artist của lớp trạng thái, ẩn đỉnh gốc
+        for k, style in enumerate(edge_styles):
+            if style is None:
+                continue
+            color, width = style
+            line = Line2D([], [], color=color, linewidth=width, solid_capstyle='butt', zorder=1.5)
+            line.set_animated(self._animating)
+            self.ax.add_line(line)
+            self._state_edges[k] = line
+        for face, edge, width in node_styles:
+            artist = self.ax.scatter(
+                np.zeros(0), np.zeros(0), s=self._node_size, c=face, edgecolors=edge, linewidths=width, zorder=2,
+            )
+            artist.set_animated(self._animating)
+            self._state_nodes.append(artist)
+        self.node_artist.set_visible(False)
+    def _edge_polylines(self) -> np.ndarray: # Mảng (E, k, 2): các đoạn của từng cạnh (có hướng: kèm đầu mũi tên) nối tiếp, kết thúc bằng NaN
+        segments = self._edge_segments(arrows=self.directed)
+        per_edge = len(segments) // max(len(self.edges), 1)
+        polylines = np.full((len(segments), 3, 2), np.nan)
+        polylines[:, :2] = segments
+        return polylines.reshape(len(self.edges), per_edge * 3, 2)
+    def _begin_overlay(self, node_ids: List[int]) -> None: # Tách đỉnh đang kéo và phần liên thuộc khỏi các collection tĩnh
+        ax = self.ax
+        ids = np.asarray(node_ids, dtype=int)
+        edges = np.asarray(sorted({e for i in node_ids for e in self._incident.get(i, ())}), dtype=int)
+        self._drag_nodes, self._drag_edges = ids, edges
+        overlay, created = [], []
+
+        # Đỉnh: một scatter nhỏ cùng kiểu dáng, điểm tương ứng trong scatter chính bị ẩn (NaN)
+        node = ax.scatter(
+            self.xy[ids, 0], self.xy[ids, 1], s=self._node_size, c=NODE_FACE_COLOR,
+            edgecolors=_pick(self.node_artist.get_edgecolors(), ids),
+            linewidths=_pick(self.node_artist.get_linewidths(), ids),
+            zorder=2,
+        )
+        hidden = self.xy.copy()
+        hidden[ids] = np.nan
+        self.node_artist.set_offsets(hidden)
+
+        # Cạnh liên thuộc
+        if self.edge_artist is not None and not self._arrow_patches and len(edges):
+            paths = self._edge_path_ids(edges)
+            line = LineCollection(
+                self._edge_segments(edges),
+                colors=_pick(self.edge_artist.get_colors(), paths),
+                linewidths=_pick(self.edge_artist.get_linewidths(), paths),
+                zorder=1,
+            )
+            ax.add_collection(line)
+            self._set_edge_paths(paths, np.full((len(paths), 2, 2), np.nan))
+            overlay.append(line)
+            created.append(line)
+        if self._arrow_patches:
+            # Cạnh liên thuộc có thể nằm ngoài khung nhìn lúc bắt đầu kéo: tạo và hiện mũi tên cho mọi cạnh
+            self._show_only(self.arrow_artists, np.union1d(self._visible_edges(), edges), self._make_arrow)
+            overlay.extend(self.arrow_artists[e] for e in edges.tolist())
+        overlay.append(node)
+        created.append(node)
+        overlay.extend(self.label_artists[i] for i in ids.tolist() if i in self.label_artists and self.label_artists[i].get_visible())
+
+        # Nhãn trọng số đang hiện của các cạnh liên thuộc (nền riêng, nền chung ẩn các ô tương ứng)
+        self._drag_weights = np.zeros(0, dtype=int)
+        if self.weighted and len(self._weight_shown) and len(edges):
+            moving = np.isin(self._weight_shown, edges)
+            self._drag_weights = self._weight_shown[moving]
+            if len(self._drag_weights):
+                boxes = ax.scatter(
+                    self.weight_xy[self._drag_weights, 0], self.weight_xy[self._drag_weights, 1], s=1,
+                    marker=weight_box(1), c=NODE_FACE_COLOR, edgecolors="none", alpha=0.8, zorder=2.5,
+                )
+                boxes.set_paths([weight_box(len(self._weight_text[e])) for e in self._drag_weights.tolist()])
+                offsets = self.weight_xy[self._weight_shown].copy()
+                offsets[moving] = np.nan
+                self.weight_background.set_offsets(offsets)
+                overlay.append(boxes)
+                created.append(boxes)
+                overlay.extend(self.weight_artists[e] for e in self._drag_weights.tolist())
+        self._overlay, self._overlay_created = overlay, created
+    def _update_overlay(self) -> None: # Cập nhật tọa độ các artist của lớp phủ theo self.xy
+        ids, edges = self._drag_nodes, self._drag_edges
+        created = iter(self._overlay_created)
+        if self.edge_artist is not None and not self._arrow_patches and len(edges):
+            next(created).set_segments(self._edge_segments(edges))
+        for e in edges.tolist() if self._arrow_patches else ():
+            self.arrow_artists[e].set_positions(tuple(self.xy[self.src[e]]), tuple(self.xy[self.dst[e]]))
+        next(created).set_offsets(self.xy[ids])
+        for i in ids.tolist():
+            if i in self.label_artists:
+                self.label_artists[i].set_position(self.xy[i])
+        if self.weighted and len(edges):
+            self.weight_xy[edges] = self._weight_positions(edges)
+            if len(self._drag_weights):
+                next(created).set_offsets(self.weight_xy[self._drag_weights])
+                for e in self._drag_weights.tolist():
+                    self.weight_artists[e].set_position(self.weight_xy[e])
+    def _end_overlay(self) -> None: # Xóa lớp phủ, đưa vị trí mới vào các collection tĩnh
+        for artist in self._overlay_created:
+            artist.remove()
+        edges = self._drag_edges
+        self._drag_nodes = None
+        self._overlay, self._overlay_created = [], []
+        self.node_artist.set_offsets(self.xy)
+        self._update_edge_geometry(edges.tolist())
+        if self.weight_background is not None and len(self._weight_shown):
+            self.weight_background.set_offsets(self.weight_xy[self._weight_shown])
+
+    # ------------------------------------------------------------------
+    # Hàm nội bộ
+    # ------------------------------------------------------------------
+    def _positions_array(self, pos: Dict[str, Sequence[float]]) -> np.ndarray: # Mảng (V, 2) tọa độ theo thứ tự self.nodes
+        if not self.nodes:
+            return np.zeros((0, 2))
+        return np.array([pos[node] for node in self.nodes], dtype=float).reshape(len(self.nodes), 2)
+    def _edge_segments(self, edge_ids=None, arrows: Optional[bool] = None) -> np.ndarray: # Các đoạn thẳng của edge_artist (mọi cạnh hoặc các cạnh edge_ids): cạnh, kèm hai nét đầu mũi tên nếu _edge_arrows
+        src = self.src if edge_ids is None else self.src[edge_ids]
+        dst = self.dst if edge_ids is None else self.dst[edge_ids]
+        if not len(src):
+            return np.zeros((0, 2, 2))
+        if not (self._edge_arrows if arrows is None else arrows):
+            return np.stack([self.xy[src], self.xy[dst]], axis=1)
+        # Tính trong tọa độ màn hình để đầu mũi tên có kích thước cố định theo points
+        to_display = self.ax.transData
+        p1 = to_display.transform(self.xy[src])
+        p2 = to_display.transform(self.xy[dst])
+        px_per_point = self.ax.figure.dpi / 72
+        d = p2 - p1
+        length = np.maximum(np.hypot(d[:, 0], d[:, 1]), 1e-6)[:, None]
+        unit = d / length
+        normal = np.stack([-unit[:, 1], unit[:, 0]], axis=1)
+        # Thu ngắn hai đầu bằng bán kính đỉnh (s là diện tích ô vuông chứa marker, points^2)
+        shrink = np.minimum(np.sqrt(self._node_size) / 2 * px_per_point + 1, length / 2)
+        start = p1 + unit * shrink
+        tip = p2 - unit * shrink
+        back = tip - unit * (ARROW_HEAD_LENGTH * px_per_point)
+        side = normal * (ARROW_HEAD_HALF_WIDTH * px_per_point)
+        segments = np.stack([start, tip, back + side, tip, back - side, tip], axis=1).reshape(-1, 2)
+        return to_display.inverted().transform(segments).reshape(-1, 2, 2)
+    def _edge_path_ids(self, edge_ids: np.ndarray) -> np.ndarray: # Chỉ số các path trong edge_artist của các cạnh (3 path mỗi cạnh nếu có đầu mũi tên)
+        if not self._edge_arrows:
+            return edge_ids
+        return (edge_ids[:, None] * 3 + np.arange(3)).ravel()
+    def _set_edge_paths(self, path_ids: np.ndarray, segments: np.ndarray) -> None: # Sửa tại chỗ một số đoạn thẳng của edge_artist
+        """set_segments() dựng lại toàn bộ E path; khi chỉ vài cạnh đổi, ghi đè đỉnh của các path đó là đủ."""
+        paths = self.edge_artist.get_paths()
+        for k, segment in zip(path_ids.tolist(), segments):
+            paths[k].vertices = segment
+        self.edge_artist.stale = True
+    def _visible_nodes(self) -> np.ndarray: # Chỉ số các đỉnh nằm trong khung nhìn
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        x, y = self.xy[:, 0], self.xy[:, 1]
+        inside = (x >= min(x0, x1)) & (x <= max(x0, x1)) & (y >= min(y0, y1)) & (y <= max(y0, y1))
+        return np.flatnonzero(inside)
+    def _visible_edges(self) -> np.ndarray: # Chỉ số các cạnh (đoạn thẳng giữa hai đầu mút) cắt khung nhìn
+        if not len(self.edges):
+            return np.zeros(0, dtype=int)
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        x0, x1, y0, y1 = min(x0, x1), max(x0, x1), min(y0, y1), max(y0, y1)
+        p1, p2 = self.xy[self.src], self.xy[self.dst]
+        lo, hi = np.minimum(p1, p2), np.maximum(p1, p2)
+        overlap = (hi[:, 0] >= x0) & (lo[:, 0] <= x1) & (hi[:, 1] >= y0) & (lo[:, 1] <= y1)
+        # Hộp bao giao khung nhìn nhưng cả bốn góc khung nằm cùng một phía của đường thẳng: không cắt
+        d = p2 - p1
+        corners = np.array([[x0, y0], [x0, y1], [x1, y0], [x1, y1]])
+        side = d[:, None, 0] * (corners[None, :, 1] - p1[:, None, 1]) - d[:, None, 1] * (corners[None, :, 0] - p1[:, None, 0])
+        crosses = ~((side > 0).all(axis=1) | (side < 0).all(axis=1))
+        return np.flatnonzero(overlap & crosses)
+    def _visible_weights(self) -> np.ndarray: # Chỉ số các cạnh có nhãn trọng số nằm trong khung nhìn
+        if not len(self.weight_xy):
+            return np.zeros(0, dtype=int)
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        x, y = self.weight_xy[:, 0], self.weight_xy[:, 1]
+        inside = (x >= min(x0, x1)) & (x <= max(x0, x1)) & (y >= min(y0, y1)) & (y <= max(y0, y1))
+        return np.flatnonzero(inside)
+    def _show_only(self, artists: Dict[int, object], wanted: np.ndarray, factory) -> None: # Hiện các artist trong `wanted` (tạo nếu chưa có), ẩn phần còn lại
+        wanted_set = set(wanted.tolist())
+        for i in wanted_set.difference(artists):
+            artists[i] = factory(i)
+        for i, artist in artists.items():
+            artist.set_visible(i in wanted_set)
+    def _make_label(self, i: int): # Tạo nhãn cho đỉnh thứ i
+        x, y = self.xy[i]
+        label = self.ax.text(x, y, self.nodes[i], fontsize=LABEL_FONT_SIZE, ha='center', va='center', zorder=3, clip_on=True)
+        label.set_animated(self._animating)
+        return label
+    def _make_weight_label(self, e: int): # Tạo nhãn trọng số của cạnh thứ e (nền nằm trong weight_background)
+        x, y = self.weight_xy[e]
+        label = self.ax.text(
+            x, y, self._weight_text[e], fontsize=WEIGHT_FONT_SIZE,
+            ha='center', va='center', zorder=3, clip_on=True,
+        )
+        label.set_animated(self._animating)
+        return label
+    def _make_arrow(self, e: int): # Tạo mũi tên FancyArrowPatch cho cạnh thứ e (màu theo highlight hiện tại)
+        hl = bool(self._edge_hl[e])
+        arrow = FancyArrowPatch(
+            tuple(self.xy[self.src[e]]), tuple(self.xy[self.dst[e]]),
+            arrowstyle='->',
+            mutation_scale=ARROW_SIZE,
+            shrinkA=ARROW_MARGIN,
+            shrinkB=ARROW_MARGIN,
+            color=HIGHLIGHT_COLOR if hl else DEFAULT_COLOR,
+            linewidth=EDGE_HIGHLIGHT_WIDTH if hl else EDGE_WIDTH,
+            zorder=1,
+        )
+        arrow.set_animated(self._animating)
+        self.ax.add_patch(arrow)
+        return arrow
+    def _weight_positions(self, edge_ids=None) -> np.ndarray: # Vị trí (dữ liệu) nhãn trọng số: điểm giữa cạnh lệch vuông góc WEIGHT_OFFSET_POINTS
+        """Tính vector hóa cho mọi cạnh (hoặc các cạnh `edge_ids`) trong tọa độ màn hình rồi đổi lại tọa độ dữ liệu."""
+        if not self.weighted or not len(self.edges):
+            return np.zeros((0, 2))
+        src = self.src if edge_ids is None else self.src[edge_ids]
+        dst = self.dst if edge_ids is None else self.dst[edge_ids]
+        to_display = self.ax.transData
+        p1 = to_display.transform(self.xy[src])
+        p2 = to_display.transform(self.xy[dst])
+        d = p2 - p1
+        length = np.maximum(np.hypot(d[:, 0], d[:, 1]), 0.001)[:, None]  # Tránh chia cho 0
+        # Vector vuông góc đơn vị (quay 90 độ ngược chiều kim đồng hồ)
+        perp = np.stack([-d[:, 1], d[:, 0]], axis=1) / length
+        anchors = (p1 + p2) / 2 + perp * (WEIGHT_OFFSET_POINTS * self.ax.figure.dpi / 72)
+        return to_display.inverted().transform(anchors)
+    def _update_edge_geometry(self, edge_ids: Optional[List[int]] = None) -> None: # Cập nhật tọa độ cạnh và nhãn trọng số
+        if not len(self.edges):
+            return
+        if self.edge_artist is not None:
+            if edge_ids is None:
+                # LineCollection: cập nhật toàn bộ mảng đoạn thẳng (vector hóa)
+                self.edge_artist.set_segments(self._edge_segments())
+            elif len(edge_ids):
+                ids = np.asarray(edge_ids, dtype=int)
+                self._set_edge_paths(self._edge_path_ids(ids), self._edge_segments(ids))
+        ids = range(len(self.edges)) if edge_ids is None else edge_ids
+        arrows = self.arrow_artists.items() if edge_ids is None else (
+            (e, self.arrow_artists[e]) for e in ids if e in self.arrow_artists
+        )
+        for e, arrow in arrows:
+            arrow.set_positions(tuple(self.xy[self.src[e]]), tuple(self.xy[self.dst[e]]))
+        if self.weighted:
+            # Nhãn đã bố trí chỉ dịch theo đỉnh: tính lại vị trí của các cạnh bị ảnh hưởng
+            ids = np.arange(len(self.edges)) if edge_ids is None else np.asarray(list(ids), dtype=int)
+            self.weight_xy[ids] = self._weight_positions(ids)
+            labels = self.weight_artists.items() if edge_ids is None else (
+                (e, self.weight_artists[e]) for e in ids.tolist() if e in self.weight_artists
+            )
+            for e, label in labels:
+                label.set_position(self.weight_xy[e])
+            if len(self._weight_shown):
+                self.weight_background.set_offsets(self.weight_xy[self._weight_shown])
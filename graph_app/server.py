@@ -0,0 +1,369 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import sys
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Sequence
+
+from .graph_data import GraphData
+from .graph_io import read_graph_from_file
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_LINE_BYTES = 16 * 1024 * 1024   # Độ dài tối đa một dòng yêu cầu (yêu cầu subgraph/batch có thể dài)
+MAX_IN_FLIGHT = 256                 # Số yêu cầu tối đa đang xử lý trên một kết nối (áp lực ngược khi client gửi dồn)
+THREADED_OPS = {"path", "subgraph", "stats", "nodes"}  # Truy vấn có thể tốn O(V + E): chạy trên luồng phụ để không chặn vòng lặp sự kiện
+
+class RWLock:
+    """
+    Khóa đọc/ghi cho asyncio: nhiều truy vấn đọc chạy đồng thời, thao tác ghi chạy độc quyền.
+    Ghi được ưu tiên: khi có thao tác ghi đang chờ, truy vấn đọc mới phải đợi, nên ghi không
+    bị bỏ đói; mỗi thao tác ghi chỉ giữ khóa trong thời gian ngắn (xem GraphServer.load).
+    """
+    def __init__(self) -> None:
+        self._cond = asyncio.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+    @asynccontextmanager
+    async def read(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: not self._writer and not self._waiting_writers)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+    @asynccontextmanager
+    async def write(self):
+        async with self._cond:
+            self._waiting_writers += 1
+            try:
+                await self._cond.wait_for(lambda: not self._writer and not self._readers)
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+class RequestError(Exception):
+    """Yêu cầu không hợp lệ (trả về cho client dưới dạng {"ok": false, "error": ...})."""
+
+def _param(request: Dict[str, Any], name: str) -> Any: # Lấy tham số bắt buộc của yêu cầu
+    if name not in request:
+        raise RequestError(f"Thiếu tham số '{name}'.")
+    return request[name]
+
+def _node(graph: GraphData, request: Dict[str, Any], name: str) -> str: # Lấy tham số là một đỉnh đã tồn tại
+    node = str(_param(request, name))
+    if node not in graph.adjacency:
+        raise RequestError(f"Đỉnh '{node}' không tồn tại.")
+    return node
+
+def _weight(value: float) -> Any: # Trọng số dạng JSON (JSON không có Infinity)
+    return "inf" if value == float("inf") else value
+
+# ----------------------------------------------------------------------
+# Truy vấn đọc: hàm thuần trên GraphData, gọi khi đang giữ khóa đọc
+# ----------------------------------------------------------------------
+def _info(graph: GraphData, request: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "directed": graph.directed,
+        "weighted": graph.weighted,
+        "nodes": len(graph.nodes),
+        "edges": graph.edge_count(),
+        "version": graph.version,
+    }
+
+def _nodes(graph: GraphData, request: Dict[str, Any]) -> List[str]:
+    limit = request.get("limit")
+    return list(graph.nodes) if limit is None else graph.nodes[:int(limit)]
+
+def _has_edge(graph: GraphData, request: Dict[str, Any]) -> bool:
+    u, v = str(_param(request, "u")), str(_param(request, "v"))
+    return v in graph.adjacency.get(u, ())
+
+def _neighbors(graph: GraphData, request: Dict[str, Any]) -> Any:
+    node = _node(graph, request, "node")
+    if request.get("weights"):
+        return {v: _weight(w) for v, w in graph.adjacency[node].items()}
+    return list(graph.adjacency[node])
+
+def _degree(graph: GraphData, request: Dict[str, Any]) -> Dict[str, int]:
+    node = _node(graph, request, "node")
+    out_degree = len(graph.adjacency[node])
+    if not graph.directed:
+        return {"degree": out_degree}
+    in_degree = graph.in_degree(node)
+    return {"degree": in_degree + out_degree, "in": in_degree, "out": out_degree}
+
+def _density(graph: GraphData, request: Dict[str, Any]) -> float:
+    return graph.density()
+
+def _stats(graph: GraphData, request: Dict[str, Any]) -> Dict[str, Any]:
+    degrees = [len(nbrs) for nbrs in graph.adjacency.values()]
+    return {
+        **_info(graph, request),
+        "density": graph.density(),
+        "max_out_degree": max(degrees, default=0),
+    }
+
+def _path(graph: GraphData, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    found = graph.shortest_path(_node(graph, request, "source"), _node(graph, request, "target"))
+    if found is None:
+        return None
+    path, length = found
+    return {"path": path, "length": _weight(length)}
+
+def _subgraph(graph: GraphData, request: Dict[str, Any]) -> Dict[str, Any]:
+    nodes = _param(request, "nodes")
+    if not isinstance(nodes, list):
+        raise RequestError("Tham số 'nodes' phải là danh sách.")
+    sub = graph.subgraph(str(node) for node in nodes)
+    edges = [
+        [u, v, _weight(w)]
+        for u, nbrs in sub.adjacency.items()
+        for v, w in nbrs.items()
+        if sub.directed or u <= v
+    ]
+    return {"nodes": sub.nodes, "edges": edges}
+
+READ_OPS = {
+    "info": _info,
+    "nodes": _nodes,
+    "has_edge": _has_edge,
+    "neighbors": _neighbors,
+    "degree": _degree,
+    "density": _density,
+    "stats": _stats,
+    "path": _path,
+    "subgraph": _subgraph,
+}
+
+class GraphServer:
+    """
+    Máy chủ truy vấn JSON cục bộ (asyncio) chia sẻ một GraphData đã nạp cho nhiều công cụ.
+
+    Giao thức: mỗi dòng là một yêu cầu JSON {"id": ..., "op": ..., ...tham số}, mỗi dòng trả
+    về là {"id": ..., "ok": true, "result": ...} hoặc {"id": ..., "ok": false, "error": ...}.
+    Client có thể gửi liên tiếp nhiều dòng không chờ (pipelining): các yêu cầu trên cùng kết nối
+    được xử lý đồng thời nhưng kết quả trả về đúng thứ tự gửi. {"op": "batch", "requests": [...]}
+    chạy cả lô dưới một lần giữ khóa đọc.
+    """
+    def __init__(self, graph: Optional[GraphData] = None) -> None:
+        self.graph = graph if graph is not None else GraphData()
+        self.lock = RWLock()
+        self.requests_served = 0
+
+    # ------------------------------------------------------------------
+    # Khởi chạy
+    # ------------------------------------------------------------------
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: Optional[str] = None):
+        """Mở cổng TCP localhost (hoặc Unix socket nếu có `unix_path`), trả về asyncio.Server."""
+        if unix_path:
+            return await asyncio.start_unix_server(self._handle_client, path=unix_path, limit=MAX_LINE_BYTES)
+        return await asyncio.start_server(self._handle_client, host, port, limit=MAX_LINE_BYTES)
+
+    # ------------------------------------------------------------------
+    # Xử lý yêu cầu
+    # ------------------------------------------------------------------
+    async def handle(self, request: Any) -> Dict[str, Any]: # Xử lý một yêu cầu đã giải mã, trả về đối tượng phản hồi
+        request_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict):
+                raise RequestError("Yêu cầu phải là một đối tượng JSON.")
+            result = await self._dispatch(request)
+            response = {"id": request_id, "ok": True, "result": result}
+        except RequestError as e:
+            response = {"id": request_id, "ok": False, "error": str(e)}
+        except Exception as e:  # Lỗi đọc/phân tích file khi nạp đồ thị, ... : không làm đứt kết nối
+            response = {"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        self.requests_served += 1
+        return response
+    async def _dispatch(self, request: Dict[str, Any]) -> Any:
+        op = request.get("op")
+        if op in READ_OPS:
+            async with self.lock.read():
+                return await self._read(op, request)
+        if op == "batch":
+            requests = _param(request, "requests")
+            if not isinstance(requests, list):
+                raise RequestError("Tham số 'requests' phải là danh sách.")
+            if any(not isinstance(r, dict) or r.get("op") not in READ_OPS for r in requests):
+                raise RequestError("Batch chỉ gồm các truy vấn đọc: " + ", ".join(sorted(READ_OPS)))
+            async with self.lock.read():
+                # Cả lô thấy cùng một phiên bản đồ thị
+                return [await self._read_response(r) for r in requests]
+        if op == "load":
+            return await self.load(str(_param(request, "path")), bool(request.get("directed", False)), bool(request.get("weighted", False)))
+        if op in ("add_edge", "remove_edge", "add_node", "remove_node"):
+            return await self._write(op, request)
+        raise RequestError(f"Thao tác không hợp lệ: '{op}'.")
+    async def _read(self, op: str, request: Dict[str, Any]) -> Any: # Chạy truy vấn đọc (đã giữ khóa đọc)
+        if op in THREADED_OPS:
+            return await asyncio.to_thread(READ_OPS[op], self.graph, request)
+        return READ_OPS[op](self.graph, request)
+    async def _read_response(self, request: Dict[str, Any]) -> Dict[str, Any]: # Phản hồi của một truy vấn trong batch
+        try:
+            return {"id": request.get("id"), "ok": True, "result": await self._read(request["op"], request)}
+        except RequestError as e:
+            return {"id": request.get("id"), "ok": False, "error": str(e)}
+        except Exception as e:  # Như handle(): lỗi của một truy vấn không làm hỏng cả lô
+            return {"id": request.get("id"), "ok": False, "error": f"{type(e).__name__}: {e}"}
+    async def load(self, path: str, directed: bool = False, weighted: bool = False) -> Dict[str, Any]: # Nạp đồ thị mới qua graph_io
+        """Đọc và phân tích file ngoài khóa (trên luồng phụ), chỉ giữ khóa ghi trong lúc hoán đổi đồ thị."""
+        graph = await asyncio.to_thread(read_graph_from_file, path, directed, weighted)
+        async with self.lock.write():
+            self.graph = graph
+        return _info(graph, {})
+    async def _write(self, op: str, request: Dict[str, Any]) -> Dict[str, Any]: # Sửa đồ thị tại chỗ (giữ khóa ghi)
+        async with self.lock.write():
+            graph = self.graph
+            if op == "add_node":
+                graph.add_node(str(_param(request, "node")))
+            elif op == "remove_node":
+                graph.remove_node(str(_param(request, "node")))
+            elif op == "add_edge":
+                try:
+                    weight = float(request.get("weight", 1.0))
+                except (TypeError, ValueError):
+                    raise RequestError("Trọng số phải là số.")
+                graph.add_edge(str(_param(request, "u")), str(_param(request, "v")), weight)
+            else:
+                graph.remove_edge(str(_param(request, "u")), str(_param(request, "v")))
+            return {"version": graph.version}
+
+    # ------------------------------------------------------------------
+    # Kết nối
+    # ------------------------------------------------------------------
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        pending: asyncio.Queue = asyncio.Queue(MAX_IN_FLIGHT)
+        sender = asyncio.create_task(self._send_responses(pending, writer))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # Dòng quá dài: không thể tiếp tục đồng bộ với client
+                    await pending.put(_done({"id": None, "ok": False, "error": "Yêu cầu quá dài."}))
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    await pending.put(_done({"id": None, "ok": False, "error": "JSON không hợp lệ."}))
+                    continue
+                # Xử lý đồng thời, phản hồi theo thứ tự nhận (hàng đợi có giới hạn tạo áp lực ngược)
+                await pending.put(asyncio.ensure_future(self.handle(request)))
+            await pending.put(None)
+            await sender
+        except ConnectionError:
+            await pending.put(None)
+            await sender
+        except asyncio.CancelledError:
+            # Vòng lặp sự kiện đang dừng: đóng kết nối, bỏ các phản hồi còn lại
+            sender.cancel()
+            writer.close()
+    @staticmethod
+    async def _send_responses(pending: asyncio.Queue, writer: asyncio.StreamWriter) -> None: # Ghi phản hồi theo thứ tự, gom nhiều dòng trước mỗi lần drain
+        try:
+            while True:
+                task = await pending.get()
+                if task is None:
+                    break
+                response = await task
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                if pending.empty():
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+def _done(response: Dict[str, Any]) -> asyncio.Future: # Future đã có sẵn kết quả (để xếp vào hàng đợi phản hồi)
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(response)
+    return future
+
+class GraphClient:
+    """Client asyncio cho GraphServer. `pipeline()` gửi nhiều yêu cầu liền một lượt rồi mới đọc phản hồi."""
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self._next_id = 0
+        self._lock = asyncio.Lock()  # Mỗi lượt gửi/nhận trên kết nối phải liền mạch
+    @classmethod
+    async def connect(cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: Optional[str] = None) -> "GraphClient":
+        if unix_path:
+            reader, writer = await asyncio.open_unix_connection(unix_path, limit=MAX_LINE_BYTES)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE_BYTES)
+        return cls(reader, writer)
+    async def request(self, op: str, **params: Any) -> Any: # Gửi một yêu cầu, trả về kết quả hoặc ném RequestError
+        response = (await self.pipeline([{"op": op, **params}]))[0]
+        if not response["ok"]:
+            raise RequestError(response["error"])
+        return response["result"]
+    async def pipeline(self, requests: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]: # Gửi nhiều yêu cầu không chờ, trả về các phản hồi theo thứ tự
+        async with self._lock:
+            lines = []
+            for request in requests:
+                self._next_id += 1
+                lines.append(json.dumps({"id": self._next_id, **request}, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.writer.write(b"".join(lines))
+            await self.writer.drain()
+            responses = []
+            for _ in requests:
+                line = await self.reader.readline()
+                if not line:
+                    raise ConnectionError("Máy chủ đã đóng kết nối.")
+                responses.append(json.loads(line))
+            return responses
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+async def serve(path: Optional[str], directed: bool, weighted: bool, host: str, port: int, unix_path: Optional[str]) -> None: # Chạy máy chủ tới khi bị dừng
+    server = GraphServer()
+    if path:
+        info = await server.load(path, directed, weighted)
+        print(f"Đã nạp '{path}': {info['nodes']} đỉnh, {info['edges']} cạnh")
+    listener = await server.start(host, port, unix_path)
+    print(f"Đang phục vụ tại {unix_path or f'{host}:{port}'} (Ctrl+C để dừng)")
+    async with listener:
+        await listener.serve_forever()
+
+def main(argv: Optional[Sequence[str]] = None) -> int: # Điểm vào dòng lệnh: python -m graph_app.server
+    parser = argparse.ArgumentParser(
+        prog="python -m graph_app.server",
+        description="Máy chủ truy vấn JSON (mỗi dòng một yêu cầu) trên một đồ thị nạp sẵn trong bộ nhớ.",
+    )
+    parser.add_argument("graph", nargs="?", help="File đồ thị nạp khi khởi động (có thể nạp sau bằng thao tác 'load')")
+    parser.add_argument("--directed", action="store_true")
+    parser.add_argument("--weighted", action="store_true")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Địa chỉ lắng nghe (mặc định chỉ localhost)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="Dùng Unix socket thay cho TCP")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.graph, args.directed, args.weighted, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
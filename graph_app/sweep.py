@@ -0,0 +1,267 @@
+from __future__ import annotations
+import argparse
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Sequence
+
+from .benchmark import BenchmarkResult, export_results_to_file, print_results_table, run_single_benchmark
+from .generators import TOPOLOGIES, pair_count
+from .timing import DEFAULT_HARNESS, Harness
+
+DEFAULT_TIMEOUT = 600.0     # Thời gian tối đa (giây) của một ô trước khi tiến trình con bị dừng
+BOOL_CHOICES = {"no": (False,), "yes": (True,), "both": (False, True)}
+
+@dataclass(frozen=True)
+class SweepCell:
+    """Một ô của ma trận cấu hình: chạy bằng run_single_benchmark trong một tiến trình riêng."""
+    topology: str
+    n_nodes: int
+    density: float
+    directed: bool
+    weighted: bool
+    seed: int = 42
+    def describe(self) -> str:
+        flags = ("có hướng" if self.directed else "vô hướng") + (", có trọng số" if self.weighted else "")
+        return f"{TOPOLOGIES.get(self.topology, self.topology)}, {self.n_nodes} đỉnh, {self.density * 100:g}%, {flags}"
+    def cost(self) -> float: # Ước lượng khối lượng (số đỉnh + số cạnh) để xếp ô lớn chạy trước
+        return self.n_nodes + self.density * pair_count(self.n_nodes, self.directed)
+
+@dataclass
+class CellOutcome:
+    """Kết quả một ô: BenchmarkResult hoặc thông báo lỗi (lỗi, quá thời gian, tiến trình con chết)."""
+    cell: SweepCell
+    result: Optional[BenchmarkResult] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0            # Thời gian thực của cả ô (giây), gồm sinh đồ thị và khởi động tiến trình
+    core: Optional[int] = None      # Lõi CPU đã ghim (None nếu không ghim)
+
+def expand_matrix( # Mọi tổ hợp (mô hình, số đỉnh, mật độ, có hướng, có trọng số)
+    sizes: Sequence[int],
+    densities: Sequence[float],
+    directed: Sequence[bool] = (False,),
+    weighted: Sequence[bool] = (False,),
+    topologies: Sequence[str] = ("random",),
+    seed: int = 42,
+) -> List[SweepCell]:
+    return [
+        SweepCell(topology, n, d, is_directed, is_weighted, seed)
+        for topology, n, d, is_directed, is_weighted in itertools.product(topologies, sizes, densities, directed, weighted)
+    ]
+
+def available_cores() -> List[int]: # Các lõi CPU tiến trình được phép chạy (theo affinity nếu hệ điều hành hỗ trợ)
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+# ----------------------------------------------------------------------
+# Tiến trình con: mỗi ô chạy trong một tiến trình mới (không dùng chung heap, cache, GC với ô khác)
+# ----------------------------------------------------------------------
+def _run_cell(cell: SweepCell, harness: Harness, include_draw: bool, include_memory: bool, core: Optional[int], conn) -> None:
+    try:
+        if core is not None:
+            os.sched_setaffinity(0, {core})
+        result = run_single_benchmark(
+            n_nodes=cell.n_nodes,
+            density=cell.density,
+            directed=cell.directed,
+            weighted=cell.weighted,
+            include_draw=include_draw,
+            seed=cell.seed,
+            topology=cell.topology,
+            harness=harness,
+            include_memory=include_memory,
+        )
+        conn.send((result, None))
+    except Exception as e:  # Lỗi của một ô không làm dừng cả lượt quét
+        conn.send((None, f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+@dataclass
+class _Running:
+    cell: SweepCell
+    process: multiprocessing.process.BaseProcess
+    core: Optional[int]
+    start: float
+
+# ----------------------------------------------------------------------
+# Tiến trình chính
+# ----------------------------------------------------------------------
+def run_sweep( # Chạy các ô trên tối đa `workers` tiến trình song song, trả kết quả theo thứ tự hoàn thành
+    cells: Sequence[SweepCell],
+    workers: Optional[int] = None,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    pin: bool = False,
+    harness: Harness = DEFAULT_HARNESS,
+    include_draw: bool = True,
+    include_memory: bool = False,
+    on_result: Optional[Callable[[CellOutcome], None]] = None,
+) -> List[CellOutcome]:
+    """
+    Args:
+        workers: Số tiến trình chạy cùng lúc (mặc định: số lõi được phép dùng, không quá số ô)
+        timeout: Thời gian tối đa (giây) của một ô; quá hạn thì dừng tiến trình con và ghi lỗi
+        pin: Ghim mỗi tiến trình con vào một lõi riêng (chỉ Linux: os.sched_setaffinity)
+        on_result: Hàm gọi lại với mỗi CellOutcome ngay khi ô đó xong
+    """
+    if not cells:
+        return []
+    cores = available_cores()
+    workers = max(1, min(workers or len(cores), len(cells)))
+    if pin and hasattr(os, "sched_setaffinity"):
+        free_cores: List[Optional[int]] = cores[:workers]
+        workers = len(free_cores)
+    else:
+        free_cores = [None] * workers
+    # Ô lớn chạy trước: ô chậm nhất không bị dồn vào cuối khi các tiến trình khác đã rảnh
+    pending: Deque[SweepCell] = deque(sorted(cells, key=lambda c: c.cost(), reverse=True))
+    running: Dict[object, _Running] = {}   # Đầu đọc của ống dẫn -> ô đang chạy
+    outcomes: List[CellOutcome] = []
+    context = multiprocessing.get_context()
+
+    def finish(conn, outcome: CellOutcome) -> None:
+        job = running.pop(conn)
+        conn.close()
+        job.process.join()
+        free_cores.append(job.core)
+        outcome.elapsed = time.perf_counter() - job.start
+        outcome.core = job.core
+        outcomes.append(outcome)
+        if on_result is not None:
+            on_result(outcome)
+
+    try:
+        while pending or running:
+            while pending and free_cores:
+                cell, core = pending.popleft(), free_cores.pop(0)
+                reader, writer = context.Pipe(duplex=False)
+                process = context.Process(
+                    target=_run_cell, args=(cell, harness, include_draw, include_memory, core, writer), daemon=True
+                )
+                process.start()
+                writer.close()  # Chỉ tiến trình con giữ đầu ghi: EOF khi nó chết
+                running[reader] = _Running(cell, process, core, time.perf_counter())
+
+            wait_time = None
+            if timeout is not None:
+                deadline = min(job.start for job in running.values()) + timeout
+                wait_time = max(0.0, deadline - time.perf_counter())
+            for conn in wait(list(running), wait_time):
+                cell = running[conn].cell
+                try:
+                    result, error = conn.recv()
+                except EOFError:
+                    running[conn].process.join()
+                    result, error = None, f"Tiến trình con kết thúc bất thường (mã thoát {running[conn].process.exitcode})"
+                finish(conn, CellOutcome(cell, result, error))
+
+            if timeout is not None:
+                now = time.perf_counter()
+                for conn, job in list(running.items()):
+                    if now - job.start >= timeout:
+                        job.process.terminate()
+                        finish(conn, CellOutcome(job.cell, error=f"Quá thời gian ({timeout:g} s)"))
+    finally:
+        for job in running.values():    # Bị ngắt (Ctrl+C, lỗi): không để lại tiến trình con
+            job.process.terminate()
+            job.process.join()
+    return outcomes
+
+def print_outcome(outcome: CellOutcome, done: int, total: int) -> None: # In một dòng tiến độ khi một ô xong
+    where = f", lõi {outcome.core}" if outcome.core is not None else ""
+    prefix = f"[{done:>{len(str(total))}}/{total}] {outcome.cell.describe():<48}"
+    if outcome.error:
+        print(f"{prefix} LỖI: {outcome.error}", flush=True)
+        return
+    r = outcome.result
+    print(
+        f"{prefix} {r.n_edges:>9} cạnh, tạo CTDL {r.create_structure_time.median:>10.3f} ms "
+        f"({outcome.elapsed:.1f} s{where})",
+        flush=True,
+    )
+
+def main(argv: Optional[Sequence[str]] = None) -> int: # Điểm vào dòng lệnh: python -m graph_app.sweep
+    from .benchmark_report import environment_metadata, save_results_csv, save_results_json
+    parser = argparse.ArgumentParser(
+        prog="python -m graph_app.sweep",
+        description="Chạy benchmark trên cả ma trận cấu hình, mỗi ô trong một tiến trình riêng, song song.",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 500], metavar="N", help="Các số đỉnh")
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.1, 0.3, 0.5], metavar="D", help="Các mật độ (0.0 - 1.0)")
+    parser.add_argument("--topologies", nargs="+", choices=list(TOPOLOGIES), default=list(TOPOLOGIES), help="Các mô hình đồ thị")
+    parser.add_argument("--directed", choices=list(BOOL_CHOICES), default="both", help="Đồ thị có hướng: no, yes hoặc both (mặc định)")
+    parser.add_argument("--weighted", choices=list(BOOL_CHOICES), default="both", help="Đồ thị có trọng số: no, yes hoặc both (mặc định)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Số tiến trình (mặc định: số lõi)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Thời gian tối đa của một ô (giây, mặc định 600; 0 = không giới hạn)")
+    parser.add_argument("--pin", action="store_true", help="Ghim mỗi tiến trình vào một lõi riêng (Linux)")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_HARNESS.warmup, help="Số lần gọi khởi động trước khi đo")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_HARNESS.repeats, help="Số mẫu mỗi phép đo")
+    parser.add_argument("--keep-gc", action="store_true", help="Không tắt bộ thu gom rác khi đo")
+    parser.add_argument("--no-draw", action="store_true", help="Bỏ qua phép đo thời gian vẽ")
+    parser.add_argument("--no-memory", action="store_true", help="Bỏ qua phép đo bộ nhớ (tracemalloc + RSS)")
+    parser.add_argument("--txt", default=None, metavar="PATH", help="Ghi thêm bảng kết quả dạng văn bản")
+    parser.add_argument("--json", default=None, metavar="PATH", help="File JSON (mặc định: graph_app/sweep_results.json)")
+    parser.add_argument("--csv", default=None, metavar="PATH", help="Ghi thêm file CSV")
+    args = parser.parse_args(argv)
+
+    cells = expand_matrix(
+        args.sizes, args.densities, BOOL_CHOICES[args.directed], BOOL_CHOICES[args.weighted], args.topologies, args.seed
+    )
+    harness = Harness(warmup=args.warmup, repeats=args.repeats, disable_gc=not args.keep_gc)
+    timeout = args.timeout or None
+    workers = max(1, min(args.jobs or len(available_cores()), len(cells)))
+    print(f"Quét {len(cells)} cấu hình trên {workers} tiến trình{' (ghim lõi)' if args.pin else ''}, "
+          f"tối đa {f'{timeout:g} s' if timeout else 'không giới hạn'} mỗi ô")
+    print("-" * 110)
+
+    done = 0
+    def report(outcome: CellOutcome) -> None:
+        nonlocal done
+        done += 1
+        print_outcome(outcome, done, len(cells))
+
+    start = time.perf_counter()
+    outcomes = run_sweep(
+        cells, workers, timeout, args.pin, harness,
+        include_draw=not args.no_draw, include_memory=not args.no_memory, on_result=report,
+    )
+    wall = time.perf_counter() - start
+
+    # Bảng kết quả theo thứ tự của ma trận cấu hình (không theo thứ tự hoàn thành)
+    order = {cell: i for i, cell in enumerate(cells)}
+    outcomes.sort(key=lambda o: order[o.cell])
+    results = [o.result for o in outcomes if o.result is not None]
+    failed = [o for o in outcomes if o.error]
+    busy = sum(o.elapsed for o in outcomes)
+    print("-" * 110)
+    print(f"Xong {len(results)}/{len(cells)} ô trong {wall:.1f} s "
+          f"(tổng thời gian các ô {busy:.1f} s, tăng tốc x{busy / wall if wall else 0:.2f})")
+    print()
+    if results:
+        print_results_table(results)
+
+    metadata = environment_metadata(harness)
+    metadata["sweep"] = {
+        "workers": workers,
+        "pinned": args.pin,
+        "timeout": timeout,
+        "failed": [{"cell": o.cell.describe(), "error": o.error} for o in failed],
+    }
+    json_path = args.json or Path(__file__).parent / "sweep_results.json"
+    print(f"Đã lưu kết quả (JSON) vào: {save_results_json(results, json_path, metadata)}")
+    if args.txt:
+        print(f"Đã lưu kết quả vào: {export_results_to_file(results, args.txt)}")
+    if args.csv:
+        print(f"Đã lưu kết quả (CSV) vào: {save_results_csv(results, args.csv)}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
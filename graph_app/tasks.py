@@ -0,0 +1,131 @@
+from __future__ import annotations
+import itertools
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+class TaskCancelled(Exception):
+    """Ném ra từ Progress khi tác vụ đã bị hủy (người dùng bấm Hủy hoặc kết quả đã cũ)."""
+
+class Progress:
+    """
+    Giao thức báo tiến độ cho các hàm chạy lâu (đọc/xuất file, thuật toán).
+
+    Hàm nhận một đối tượng có thể gọi `progress(done, total)` và gọi định kỳ; lời gọi chỉ ghi
+    lại giá trị mới nhất (luồng Tk tự đọc khi cập nhật giao diện) và ném TaskCancelled nếu tác
+    vụ đã bị hủy, nhờ đó hàm dừng ngay tại điểm báo tiến độ kế tiếp.
+    """
+    def __init__(self) -> None:
+        self._cancel = threading.Event()
+        self.state: Tuple[int, Optional[int], str] = (0, None, "")  # (đã xong, tổng, thông báo)
+    def __call__(self, done: int, total: Optional[int] = None, message: str = "") -> None:
+        self.state = (done, total, message or self.state[2])
+        if self._cancel.is_set():
+            raise TaskCancelled()
+    def cancel(self) -> None: # Yêu cầu dừng (an toàn khi gọi từ luồng khác)
+        self._cancel.set()
+    def check(self) -> None: # Ném TaskCancelled nếu đã bị hủy (dùng ở nơi không có số liệu tiến độ)
+        if self._cancel.is_set():
+            raise TaskCancelled()
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+    @property
+    def fraction(self) -> Optional[float]: # Tỉ lệ hoàn thành (0..1), None nếu chưa biết tổng
+        done, total, _ = self.state
+        return min(done / total, 1.0) if total else None
+
+class Task:
+    """Một tác vụ đã gửi cho TaskRunner."""
+    def __init__(self, task_id: int, name: str, group: Optional[str], key: Hashable, track_key: bool, on_done, on_error) -> None:
+        self.id = task_id
+        self.name = name                    # Tên hiển thị trên thanh trạng thái
+        self.group = group                  # Tác vụ mới cùng nhóm thay thế (hủy) tác vụ cũ
+        self.key = key                      # Trạng thái dữ liệu lúc gửi; khác hiện tại -> kết quả đã cũ
+        self.track_key = track_key          # Có bỏ kết quả khi dữ liệu thay đổi hay không
+        self.progress = Progress()
+        self.future: Optional[Future] = None
+        self._on_done = on_done
+        self._on_error = on_error
+    def cancel(self) -> None:
+        self.progress.cancel()
+        if self.future is not None:
+            self.future.cancel()            # Chưa chạy: bỏ khỏi hàng đợi; đang chạy: dừng ở lần báo tiến độ kế tiếp
+    @property
+    def cancelled(self) -> bool:
+        return self.progress.cancelled
+
+class TaskRunner:
+    """
+    Chạy các tác vụ dài trên một pool luồng, trả kết quả về luồng Tk.
+
+    `submit(name, fn, ...)` gọi `fn(progress, *args)` trên luồng nền. Luồng Tk gọi `poll()`
+    định kỳ: các callback on_done/on_error được gọi ngay trên luồng đó, nên có thể cập nhật
+    widget và đồ thị trực tiếp. Tác vụ gửi kèm `key` (ví dụ phiên bản đồ thị) bị hủy và bỏ
+    kết quả nếu `current_key()` đã khác khi kết quả về tới.
+    """
+    def __init__(self, current_key: Callable[[], Hashable] = lambda: None, max_workers: int = 2) -> None:
+        self.current_key = current_key
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="task")
+        self._results: queue.Queue = queue.Queue()  # (tác vụ, future) đã xong, gửi từ luồng nền
+        self._ids = itertools.count(1)
+        self.tasks: Dict[int, Task] = {}            # Các tác vụ chưa giao kết quả, theo thứ tự gửi
+    def submit( # Gửi một tác vụ chạy nền
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        group: Optional[str] = None,
+        track_key: bool = False,
+    ) -> Task:
+        """
+        Args:
+            group: Hủy các tác vụ cùng nhóm đang chờ/chạy (ví dụ hai lần bấm "Đọc file" liên tiếp)
+            track_key: Kết quả chỉ được giao nếu current_key() không đổi từ lúc gửi
+        """
+        if group is not None:
+            for task in self.tasks.values():
+                if task.group == group:
+                    task.cancel()
+        task = Task(next(self._ids), name, group, self.current_key() if track_key else None, track_key, on_done, on_error)
+        self.tasks[task.id] = task
+        task.future = self._executor.submit(fn, task.progress, *args)
+        task.future.add_done_callback(lambda f, t=task: self._results.put(t))
+        return task
+    def poll(self) -> None: # Gọi trên luồng Tk: giao kết quả đã xong, hủy các tác vụ đã cũ
+        key = self.current_key()
+        for task in self.tasks.values():
+            if task.track_key and task.key != key:
+                task.cancel()
+        while True:
+            try:
+                task = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self.tasks.pop(task.id, None)
+            if task.cancelled or task.future.cancelled():
+                continue
+            error = task.future.exception()
+            if isinstance(error, TaskCancelled):
+                continue
+            if task.track_key and task.key != key:
+                continue  # Đồ thị đã đổi trong lúc chạy: kết quả (hoặc lỗi) không còn ý nghĩa
+            if error is not None:
+                if task._on_error is not None:
+                    task._on_error(error)
+            elif task._on_done is not None:
+                task._on_done(task.future.result())
+    @property
+    def busy(self) -> bool: # Còn tác vụ chưa giao kết quả
+        return bool(self.tasks)
+    def active(self) -> List[Task]: # Các tác vụ chưa bị hủy (để hiển thị tiến độ)
+        return [task for task in self.tasks.values() if not task.cancelled]
+    def cancel_all(self) -> None:
+        for task in self.tasks.values():
+            task.cancel()
+    def shutdown(self) -> None:
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,166 @@
+from __future__ import annotations
+import gc
+import math
+import statistics
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Sequence
+
+# Độ phân giải của đồng hồ đo (giây) và thời gian tối thiểu của một mẫu: sai số làm tròn của đồng
+# hồ phải nhỏ hơn 0.01% mẫu, và mẫu không ngắn hơn 1 ms (độ trễ lập lịch của hệ điều hành)
+TIMER_RESOLUTION = time.get_clock_info("perf_counter").resolution
+MIN_SAMPLE_TIME = max(TIMER_RESOLUTION * 10_000, 0.001)
+
+@dataclass
+class TimingStats:
+    """Phân phối thời gian của một phép đo: mỗi mẫu là thời gian TRUNG BÌNH một lần gọi (ms)."""
+    samples: List[float] = field(default_factory=list)  # Thời gian một lần gọi (ms) của từng lần lặp
+    number: int = 1                                     # Số lần gọi trong mỗi mẫu (chọn bởi autorange)
+    run_medians: List[float] = field(default_factory=list)  # Trung vị của từng lần chạy độc lập (tiến trình riêng) đã gộp, rỗng nếu chỉ một lần
+    def __len__(self) -> int:
+        return len(self.samples)
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples) if self.samples else 0.0
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.samples) if self.samples else 0.0
+    @property
+    def min(self) -> float:
+        return min(self.samples, default=0.0)
+    @property
+    def max(self) -> float:
+        return max(self.samples, default=0.0)
+    @property
+    def stdev(self) -> float: # Độ lệch chuẩn mẫu (0 nếu chỉ có một mẫu)
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+    @property
+    def p95(self) -> float:
+        return self.percentile(95.0)
+    @property
+    def runs(self) -> List[float]: # Trung vị theo lần chạy: các mẫu độc lập với nhau (một lần chạy: một giá trị)
+        return self.run_medians or ([self.median] if self.samples else [])
+    def percentile(self, q: float) -> float: # Phân vị q (0..100), nội suy tuyến tính giữa hai mẫu kề nhau
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        rank = (len(ordered) - 1) * q / 100.0
+        low = math.floor(rank)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+    def summary(self) -> str: # Một dòng mô tả phân phối để in báo cáo
+        return (
+            f"trung vị {self.median:.3f} ms, p95 {self.p95:.3f}, min {self.min:.3f}, "
+            f"độ lệch {self.stdev:.3f} (n={len(self)} x {self.number} lần gọi)"
+        )
+    def to_dict(self) -> Dict[str, Any]: # Dạng dict (các mẫu thô kèm thống kê) để ghi JSON
+        return {
+            "samples": self.samples, "number": self.number, "run_medians": self.run_medians,
+            "median": self.median, "mean": self.mean, "min": self.min, "p95": self.p95, "stdev": self.stdev,
+        }
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TimingStats":
+        return cls(list(data.get("samples", [])), int(data.get("number", 1)), list(data.get("run_medians", [])))
+
+@dataclass(frozen=True)
+class Harness:
+    """
+    Cách chạy một phép đo: `warmup` lần gọi bỏ đi (nạp bộ nhớ đệm, JIT của thư viện, ...), rồi
+    `repeats` mẫu. Mỗi mẫu gọi hàm `number` lần liên tiếp và ghi thời gian trung bình một lần gọi;
+    `number` được chọn tự động (như timeit.autorange) để mỗi mẫu kéo dài ít nhất `min_time` giây,
+    đủ lớn so với độ phân giải đồng hồ. Bộ thu gom rác được tắt trong lúc đo nếu `disable_gc`.
+    """
+    warmup: int = 1
+    repeats: int = 5
+    disable_gc: bool = True
+    min_time: float = MIN_SAMPLE_TIME
+    def replace(self, **changes: Any) -> "Harness":
+        return replace(self, **changes)
+    def autorange(self, fn: Callable[[], Any]) -> int: # Số lần gọi mỗi mẫu: 1, 2, 5, 10, 20, 50, ... cho tới khi đạt min_time
+        number = 1
+        while True:
+            for step in (1, 2, 5):
+                candidate = number * step
+                if self._run(fn, candidate) >= self.min_time:
+                    return candidate
+            number *= 10
+    def measure(self, fn: Callable[[], Any], number: int | None = None) -> TimingStats: # Đo một hàm không tham số
+        for _ in range(self.warmup):
+            fn()
+        if number is None:
+            number = self.autorange(fn)
+        samples = [self._run(fn, number) * 1000 / number for _ in range(max(1, self.repeats))]
+        return TimingStats(samples, number)
+    def _run(self, fn: Callable[[], Any], number: int) -> float: # Thời gian (giây) của `number` lần gọi liên tiếp
+        gc_was_enabled = gc.isenabled()
+        if self.disable_gc:
+            gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            return time.perf_counter() - start
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+DEFAULT_HARNESS = Harness()
+
+EXACT_TEST_MAX = 400  # Tính phân phối chính xác của U khi len(a) * len(b) không vượt quá ngưỡng này
+
+def min_p_value(m: int, n: int) -> float: # p-value nhỏ nhất mà mann_whitney_p có thể trả về với m và n mẫu (không có giá trị trùng)
+    if not m or not n:
+        return 1.0
+    return min(1.0, 2 / math.comb(m + n, m))
+
+def mann_whitney_p(a: Sequence[float], b: Sequence[float]) -> float: # p-value hai phía của kiểm định Mann–Whitney U (hai mẫu có cùng phân phối?)
+    """
+    Kiểm định phi tham số, không giả định phân phối chuẩn (thời gian đo thường lệch phải do
+    các lần bị ngắt). Mẫu nhỏ không có giá trị trùng: phân phối chính xác của U; còn lại: xấp xỉ
+    chuẩn có hiệu chỉnh giá trị trùng và hiệu chỉnh liên tục. Trả về 1.0 nếu một mẫu rỗng.
+    """
+    m, n = len(a), len(b)
+    if not m or not n:
+        return 1.0
+    # Hạng trung bình (giá trị trùng nhận hạng trung bình của nhóm)
+    values = sorted([(x, 0) for x in a] + [(y, 1) for y in b])
+    ranks = [0.0] * len(values)
+    ties = []
+    i = 0
+    while i < len(values):
+        j = i
+        while j + 1 < len(values) and values[j + 1][0] == values[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        if j > i:
+            ties.append(j - i + 1)
+        i = j + 1
+    rank_a = sum(rank for rank, (_, group) in zip(ranks, values) if group == 0)
+    u = rank_a - m * (m + 1) / 2
+    u = min(u, m * n - u)
+    if not ties and m * n <= EXACT_TEST_MAX:
+        # counts[k] = số cách xếp hai mẫu (theo thứ tự) cho U = k, theo công thức truy hồi
+        # f(i, j, k) = f(i - 1, j, k - j) + f(i, j - 1, k)
+        table = [[None] * (n + 1) for _ in range(m + 1)]
+        for i in range(m + 1):
+            for j in range(n + 1):
+                if i == 0 or j == 0:
+                    table[i][j] = [1]
+                    continue
+                left, up = table[i - 1][j], table[i][j - 1]
+                counts = [0] * (i * j + 1)
+                for k, c in enumerate(left):
+                    counts[k + j] += c
+                for k, c in enumerate(up):
+                    counts[k] += c
+                table[i][j] = counts
+        counts = table[m][n]
+        tail = sum(counts[: int(u) + 1]) / sum(counts)
+        return min(1.0, 2 * tail)
+    total = m + n
+    variance = m * n / 12 * ((total + 1) - sum(t ** 3 - t for t in ties) / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (m * n / 2 - u - 0.5) / math.sqrt(variance)
+    return min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
@@ -0,0 +1,388 @@
+from __future__ import annotations
+import bisect
+import itertools
+import tkinter as tk
+import tkinter.font as tkfont
+from collections import OrderedDict
+from tkinter import ttk
+from typing import List, Optional, Tuple
+from .graph_data import GraphData
+
+class VirtualMatrixView(ttk.Frame):
+    """
+    Bảng ma trận kề ảo hóa: chỉ định dạng và vẽ các ô nằm trong vùng nhìn thấy.
+
+    Giá trị từng ô được lấy trực tiếp từ GraphData (matrix_cell) khi cần, các hàng đã
+    định dạng được giữ trong một bộ nhớ đệm nhỏ (LRU) theo phiên bản của đỉnh. Cuộn chỉ
+    đổi nội dung các ô đang hiển thị, không dựng lại bảng, nên đồ thị hàng nghìn đỉnh
+    vẫn mở tức thì.
+    """
+    CELL_WIDTH = 60         # Độ rộng một cột (pixel)
+    HEADER_WIDTH = 70       # Độ rộng cột tiêu đề (tên đỉnh)
+    ROW_HEIGHT = 22         # Chiều cao một hàng (pixel)
+    ROW_CACHE_SIZE = 256    # Số hàng đã định dạng được giữ trong bộ nhớ đệm
+    HEADER_BG = "#ecf0f1"
+    GRID_COLOR = "#d5d8dc"
+
+    def __init__(self, master: tk.Misc, **kwargs) -> None:
+        super().__init__(master, **kwargs)
+        self._graph: Optional[GraphData] = None
+        self._first_row = 0     # Chỉ số hàng đầu tiên đang hiển thị
+        self._first_col = 0     # Chỉ số cột đầu tiên đang hiển thị
+        self._row_cache: OrderedDict = OrderedDict()
+        # Các item của Canvas được tái sử dụng giữa các lần vẽ: [hàng hiển thị][cột hiển thị]
+        self._slot_rows = 0
+        self._slot_cols = 0
+        self._cell_items: List[List[int]] = []
+        self._row_header_items: List[int] = []
+        self._col_header_items: List[int] = []
+
+        self.canvas = tk.Canvas(self, background="white", highlightthickness=0)
+        self.scroll_y = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_yscroll)
+        self.scroll_x = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self._on_xscroll)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.scroll_y.grid(row=0, column=1, sticky="ns")
+        self.scroll_x.grid(row=1, column=0, sticky="ew")
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.canvas.bind("<Configure>", lambda e: self._render())
+        # Cuộn bằng con lăn chuột (Windows/Mac: MouseWheel, Linux: Button-4/5)
+        self.canvas.bind("<MouseWheel>", lambda e: self._scroll_rows(-1 if e.delta > 0 else 1))
+        self.canvas.bind("<Shift-MouseWheel>", lambda e: self._scroll_cols(-1 if e.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda e: self._scroll_rows(-1))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll_rows(1))
+        self.canvas.bind("<Shift-Button-4>", lambda e: self._scroll_cols(-1))
+        self.canvas.bind("<Shift-Button-5>", lambda e: self._scroll_cols(1))
+
+    # ------------------------------------------------------------------
+    # API công khai
+    # ------------------------------------------------------------------
+    def set_graph(self, graph: GraphData) -> None: # Gắn đồ thị cần hiển thị (O(1), không định dạng trước)
+        self._graph = graph
+        self._render()
+    def refresh(self) -> None: # Vẽ lại vùng đang hiển thị (các hàng không đổi lấy từ bộ nhớ đệm)
+        self._render()
+
+    # ------------------------------------------------------------------
+    # Cuộn
+    # ------------------------------------------------------------------
+    def _node_count(self) -> int:
+        return len(self._graph.nodes) if self._graph is not None else 0
+    def _visible_rows(self) -> int: # Số hàng (không tính tiêu đề) vừa với chiều cao hiện tại
+        return max(1, (self.canvas.winfo_height() - self.ROW_HEIGHT) // self.ROW_HEIGHT)
+    def _visible_cols(self) -> int: # Số cột (không tính tiêu đề) vừa với chiều rộng hiện tại
+        return max(1, (self.canvas.winfo_width() - self.HEADER_WIDTH) // self.CELL_WIDTH)
+    @staticmethod
+    def _scroll_target(args: Tuple[str, ...], first: int, visible: int, total: int) -> int: # Tính vị trí mới từ lệnh của Scrollbar
+        if not args:
+            return first
+        if args[0] == "moveto":
+            return int(float(args[1]) * total)
+        if args[0] == "scroll":
+            step = int(args[1])
+            return first + (step * visible if args[2] == "pages" else step)
+        return first
+    def _on_yscroll(self, *args: str) -> None:
+        self._first_row = self._scroll_target(args, self._first_row, self._visible_rows(), self._node_count())
+        self._render()
+    def _on_xscroll(self, *args: str) -> None:
+        self._first_col = self._scroll_target(args, self._first_col, self._visible_cols(), self._node_count())
+        self._render()
+    def _scroll_rows(self, step: int) -> None:
+        self._first_row += step * 3
+        self._render()
+    def _scroll_cols(self, step: int) -> None:
+        self._first_col += step
+        self._render()
+
+    # ------------------------------------------------------------------
+    # Vẽ
+    # ------------------------------------------------------------------
+    def _ensure_slots(self, rows: int, cols: int) -> None: # Tạo lại lưới item khi kích thước vùng nhìn thay đổi
+        if rows == self._slot_rows and cols == self._slot_cols:
+            return
+        self.canvas.delete("all")
+        self._row_cache.clear()
+        h, w, hw = self.ROW_HEIGHT, self.CELL_WIDTH, self.HEADER_WIDTH
+        # Nền tiêu đề
+        self.canvas.create_rectangle(0, 0, hw + cols * w, h, fill=self.HEADER_BG, outline=self.GRID_COLOR)
+        self.canvas.create_rectangle(0, 0, hw, h + rows * h, fill=self.HEADER_BG, outline=self.GRID_COLOR)
+        # Đường kẻ lưới
+        for r in range(1, rows + 2):
+            self.canvas.create_line(0, r * h, hw + cols * w, r * h, fill=self.GRID_COLOR)
+        for c in range(cols + 1):
+            self.canvas.create_line(hw + c * w, 0, hw + c * w, h + rows * h, fill=self.GRID_COLOR)
+        bold = ("TkDefaultFont", 9, "bold")
+        self.canvas.create_text(hw / 2, h / 2, text="#", font=bold)
+        self._col_header_items = [
+            self.canvas.create_text(hw + c * w + w / 2, h / 2, text="", font=bold) for c in range(cols)
+        ]
+        self._row_header_items = [
+            self.canvas.create_text(hw / 2, h + r * h + h / 2, text="", font=bold) for r in range(rows)
+        ]
+        self._cell_items = [
+            [self.canvas.create_text(hw + c * w + w / 2, h + r * h + h / 2, text="") for c in range(cols)]
+            for r in range(rows)
+        ]
+        self._slot_rows, self._slot_cols = rows, cols
+    def _format_row(self, u: str, col_nodes: Tuple[str, ...]) -> Tuple[str, ...]: # Định dạng các ô hiển thị của một hàng (có bộ nhớ đệm)
+        graph = self._graph
+        key = (u, graph.node_version(u), graph.weighted, col_nodes)
+        cached = self._row_cache.get(key)
+        if cached is not None:
+            self._row_cache.move_to_end(key)
+            return cached
+        values = tuple(graph.matrix_cell(u, v) for v in col_nodes)
+        self._row_cache[key] = values
+        if len(self._row_cache) > self.ROW_CACHE_SIZE:
+            self._row_cache.popitem(last=False)
+        return values
+    def _render(self) -> None: # Cập nhật nội dung các ô trong vùng nhìn thấy
+        if self.canvas.winfo_width() <= 1:
+            return  # Chưa có kích thước thật, sẽ vẽ khi nhận sự kiện <Configure>
+        rows, cols = self._visible_rows(), self._visible_cols()
+        nodes = self._graph.nodes if self._graph is not None else []
+        n = len(nodes)
+        # Giới hạn vị trí cuộn trong phạm vi hợp lệ
+        self._first_row = max(0, min(self._first_row, n - rows))
+        self._first_col = max(0, min(self._first_col, n - cols))
+        self._ensure_slots(rows, cols)
+
+        col_nodes = tuple(nodes[self._first_col:self._first_col + cols])
+        for c, item in enumerate(self._col_header_items):
+            self.canvas.itemconfigure(item, text=col_nodes[c] if c < len(col_nodes) else "")
+        for r in range(rows):
+            idx = self._first_row + r
+            if idx < n:
+                u = nodes[idx]
+                values = self._format_row(u, col_nodes)
+                self.canvas.itemconfigure(self._row_header_items[r], text=u)
+            else:
+                values = ()
+                self.canvas.itemconfigure(self._row_header_items[r], text="")
+            for c, item in enumerate(self._cell_items[r]):
+                self.canvas.itemconfigure(item, text=values[c] if c < len(values) else "")
+
+        # Cập nhật thanh cuộn theo tỉ lệ vùng nhìn thấy
+        if n:
+            self.scroll_y.set(self._first_row / n, min(1.0, (self._first_row + rows) / n))
+            self.scroll_x.set(self._first_col / n, min(1.0, (self._first_col + cols) / n))
+        else:
+            self.scroll_y.set(0.0, 1.0)
+            self.scroll_x.set(0.0, 1.0)
+
+class VirtualAdjacencyListView(ttk.Frame):
+    """
+    Danh sách kề ảo hóa: mỗi đỉnh ứng với một dòng, chỉ các dòng trong vùng nhìn thấy
+    được đưa vào widget Text.
+
+    Dòng đã định dạng của từng đỉnh được giữ lại theo phiên bản của đỉnh, nên khi thêm
+    một cạnh chỉ hai dòng liên quan được định dạng lại; khi vẽ lại chỉ các dòng hiển thị
+    có nội dung khác trước mới bị thay thế trong widget.
+    """
+    ARROW = "→"
+    SCROLL_LINES = 3  # Số dòng cuộn mỗi nấc con lăn
+
+    def __init__(self, master: tk.Misc, font=("Consolas", 10), **kwargs) -> None:
+        super().__init__(master, **kwargs)
+        self._graph: Optional[GraphData] = None
+        self._first = 0                     # Chỉ số đỉnh của dòng đầu tiên đang hiển thị
+        self._line_cache: dict = {}         # Đỉnh -> (phiên bản, cờ trọng số, dòng đã định dạng)
+        self._rendered: List[str] = []      # Các dòng đang nằm trong widget Text
+        self._rendered_first = -1
+
+        self.text = tk.Text(self, state=tk.DISABLED, font=font, wrap=tk.NONE)
+        self.scroll_y = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_yscroll)
+        self.scroll_x = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.text.xview)
+        self.text.configure(xscrollcommand=self.scroll_x.set)
+        self.text.grid(row=0, column=0, sticky="nsew")
+        self.scroll_y.grid(row=0, column=1, sticky="ns")
+        self.scroll_x.grid(row=1, column=0, sticky="ew")
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        self._line_height = max(1, tkfont.Font(font=self.text.cget("font")).metrics("linespace"))
+
+        self.text.bind("<Configure>", lambda e: self._render())
+        self.text.bind("<MouseWheel>", lambda e: self._scroll(-1 if e.delta > 0 else 1))
+        self.text.bind("<Button-4>", lambda e: self._scroll(-1))
+        self.text.bind("<Button-5>", lambda e: self._scroll(1))
+
+    # ------------------------------------------------------------------
+    # API công khai
+    # ------------------------------------------------------------------
+    def set_graph(self, graph: GraphData) -> None: # Gắn đồ thị cần hiển thị và vẽ lại vùng nhìn thấy
+        self._graph = graph
+        # Dọn các dòng của đỉnh đã bị xóa khi bộ nhớ đệm phình quá lớn
+        if len(self._line_cache) > 2 * len(graph.nodes) + 1024:
+            self._line_cache = {n: self._line_cache[n] for n in graph.nodes if n in self._line_cache}
+        self._render()
+    def refresh(self) -> None: # Vẽ lại vùng nhìn thấy
+        self._render()
+
+    # ------------------------------------------------------------------
+    # Định dạng và vẽ
+    # ------------------------------------------------------------------
+    def _line(self, node: str) -> str: # Dòng hiển thị của một đỉnh (chỉ định dạng lại khi đỉnh thay đổi)
+        graph = self._graph
+        version = graph.node_version(node)
+        cached = self._line_cache.get(node)
+        if cached is not None and cached[0] == version and cached[1] == graph.weighted:
+            return cached[2]
+        neighbors = graph.format_neighbors(node)
+        line = f"{node} {self.ARROW} {', '.join(neighbors) if neighbors else '∅'}"
+        self._line_cache[node] = (version, graph.weighted, line)
+        return line
+    def _visible_lines(self) -> int:
+        return max(1, self.text.winfo_height() // self._line_height)
+    def _on_yscroll(self, *args: str) -> None:
+        total = len(self._graph.nodes) if self._graph is not None else 0
+        self._first = VirtualMatrixView._scroll_target(args, self._first, self._visible_lines(), total)
+        self._render()
+    def _scroll(self, step: int) -> None:
+        self._first += step * self.SCROLL_LINES
+        self._render()
+    def _render(self) -> None: # Đưa các dòng trong vùng nhìn thấy vào widget, chỉ thay các dòng khác trước
+        nodes = self._graph.nodes if self._graph is not None else []
+        n = len(nodes)
+        visible = self._visible_lines()
+        self._first = max(0, min(self._first, n - visible))
+        lines = [self._line(node) for node in nodes[self._first:self._first + visible]]
+
+        self.text.configure(state=tk.NORMAL)
+        if self._rendered_first == self._first and len(lines) == len(self._rendered):
+            # Cùng vùng nhìn: chỉ thay các dòng có nội dung thay đổi
+            for i, (old, new) in enumerate(zip(self._rendered, lines), start=1):
+                if old != new:
+                    self.text.delete(f"{i}.0", f"{i}.end")
+                    self.text.insert(f"{i}.0", new)
+        else:
+            self.text.delete("1.0", tk.END)
+            self.text.insert("1.0", "\n".join(lines))
+        self.text.configure(state=tk.DISABLED)
+        self._rendered = lines
+        self._rendered_first = self._first
+
+        if n:
+            self.scroll_y.set(self._first / n, min(1.0, (self._first + visible) / n))
+        else:
+            self.scroll_y.set(0.0, 1.0)
+
+class PagedEdgeListView(ttk.Frame):
+    """
+    Danh sách cạnh chỉ đọc, chia trang: thay cho ô nhập cạnh khi đồ thị quá lớn để ghi toàn bộ
+    ra văn bản. Mỗi dòng có dạng như trong ô nhập ("u v [w]", đỉnh cô lập ghi riêng một dòng).
+
+    Mỗi trang chỉ định dạng PAGE_SIZE dòng lấy trực tiếp từ GraphData. Vị trí dòng đầu tiên của
+    từng đỉnh (tổng tiền tố) được tính một lần cho mỗi phiên bản đồ thị, nên chuyển trang chỉ
+    tốn một phép tìm kiếm nhị phân cộng O(PAGE_SIZE).
+    """
+    PAGE_SIZE = 500  # Số dòng mỗi trang
+
+    def __init__(self, master: tk.Misc, note: str = "", height: int = 8, width: int = 35, **kwargs) -> None:
+        super().__init__(master, **kwargs)
+        self._graph: Optional[GraphData] = None
+        self._page = 0
+        self._starts: List[int] = [0]       # _starts[i]: chỉ số dòng đầu tiên của đỉnh thứ i; phần tử cuối = tổng số dòng
+        self._starts_key = None             # (id đồ thị, phiên bản, có hướng) lúc tính _starts
+        self._count_cache: dict = {}        # Đỉnh -> (phiên bản, có hướng, số dòng)
+
+        if note:
+            ttk.Label(self, text=note, foreground="#7f8c8d", wraplength=250).pack(side=tk.TOP, anchor=tk.W)
+        nav = ttk.Frame(self)
+        nav.pack(side=tk.BOTTOM, fill=tk.X)
+        ttk.Button(nav, text="◀", width=3, command=lambda: self.show_page(self._page - 1)).pack(side=tk.LEFT)
+        ttk.Button(nav, text="▶", width=3, command=lambda: self.show_page(self._page + 1)).pack(side=tk.RIGHT)
+        self.page_var = tk.StringVar(value="")
+        ttk.Label(nav, textvariable=self.page_var, anchor=tk.CENTER).pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        self.text = tk.Text(self, state=tk.DISABLED, wrap=tk.NONE, height=height, width=width, background="#f4f6f6")
+        scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.text.yview)
+        self.text.configure(yscrollcommand=scrollbar.set)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    # ------------------------------------------------------------------
+    # API công khai
+    # ------------------------------------------------------------------
+    def set_graph(self, graph: GraphData) -> None: # Gắn đồ thị cần hiển thị (giữ trang hiện tại nếu còn hợp lệ)
+        if graph is not self._graph:
+            self._count_cache = {}
+        self._graph = graph
+        self.show_page(self._page)
+    def clear(self) -> None: # Bỏ đồ thị đang gắn (giải phóng bảng tổng tiền tố)
+        self._graph = None
+        self._starts, self._starts_key = [0], None
+        self._count_cache = {}
+        self._page = 0
+    @property
+    def line_count(self) -> int:
+        self._update_starts()
+        return self._starts[-1]
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-self.line_count // self.PAGE_SIZE))
+    def show_page(self, page: int) -> None: # Hiển thị trang thứ `page` (tính từ 0)
+        self._page = max(0, min(page, self.page_count - 1))
+        first = self._page * self.PAGE_SIZE
+        lines = self.lines(first, first + self.PAGE_SIZE)
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", "\n".join(lines))
+        self.text.configure(state=tk.DISABLED)
+        total = self.line_count
+        shown = f"{first + 1}-{first + len(lines)}" if lines else "0"
+        self.page_var.set(f"Trang {self._page + 1}/{self.page_count} (dòng {shown}/{total})")
+    def lines(self, start: int, stop: int) -> List[str]: # Các dòng thứ start..stop-1 của danh sách cạnh
+        self._update_starts()
+        graph = self._graph
+        if graph is None or start >= stop:
+            return []
+        nodes = graph.nodes
+        i = bisect.bisect_right(self._starts, start) - 1
+        skip = start - self._starts[i] if i >= 0 else 0
+        result: List[str] = []
+        for node in itertools.islice(nodes, max(i, 0), None):
+            for line in itertools.islice(self._node_lines(node), skip, None):
+                result.append(line)
+                if len(result) >= stop - start:
+                    return result
+            skip = 0
+        return result
+
+    # ------------------------------------------------------------------
+    # Nội bộ
+    # ------------------------------------------------------------------
+    def _owned(self, node: str) -> List[Tuple[str, float]]: # Các cạnh được ghi ở dòng của `node` (vô hướng: mỗi cạnh một lần, tại đầu mút nhỏ hơn)
+        nbrs = self._graph.adjacency.get(node, {})
+        if self._graph.directed:
+            return list(nbrs.items())
+        return [(v, w) for v, w in nbrs.items() if node <= v]
+    def _line_count(self, node: str) -> int: # Số dòng của một đỉnh (chỉ đếm lại khi đỉnh thay đổi)
+        graph = self._graph
+        version = graph.node_version(node)
+        cached = self._count_cache.get(node)
+        if cached is not None and cached[0] == version and cached[1] == graph.directed:
+            return cached[2]
+        nbrs = graph.adjacency.get(node, {})
+        count = (len(nbrs) if graph.directed else sum(node <= v for v in nbrs)) if nbrs else 1
+        self._count_cache[node] = (version, graph.directed, count)
+        return count
+    def _node_lines(self, node: str):
+        graph = self._graph
+        if not graph.adjacency.get(node):
+            yield node  # Đỉnh cô lập
+            return
+        for v, w in self._owned(node):
+            yield f"{node} {v} {w:g}" if graph.weighted else f"{node} {v}"
+    def _update_starts(self) -> None: # Tính lại tổng tiền tố số dòng khi đồ thị đổi
+        graph = self._graph
+        key = (id(graph), graph.version, graph.directed) if graph is not None else None
+        if key == self._starts_key:
+            return
+        self._starts_key = key
+        if graph is None:
+            self._starts = [0]
+            return
+        counts = (self._line_count(node) for node in graph.nodes)
+        self._starts = [0, *itertools.accumulate(counts)]
@@ -0,0 +1,47 @@
+from graph_app.edge_parser import IncrementalEdgeParser
+
+def _state(parser): # Đỉnh và cạnh (kèm trọng số) hiện tại của bộ phân tích
+    return parser.nodes(), sorted(parser.edges())
+
+def _fresh(text, directed=False): # Phân tích lại toàn bộ nội dung
+    parser = IncrementalEdgeParser(directed)
+    parser.update(text)
+    return _state(parser)
+
+def _typed(text): # Các trạng thái khi gõ lần lượt từng ký tự
+    return [text[:i] for i in range(1, len(text) + 1)]
+
+EDIT_SEQUENCES = [
+    # Cạnh lặp lại: dòng đứng sau cùng quyết định trọng số
+    _typed("A B 9\nB C 2\nA B 7"),
+    # Gõ dòng sau trước, rồi chèn dòng trùng lên đầu
+    ["B C 2", "A B 7\nB C 2", "A B 9\nA B 7\nB C 2", "A B 7\nB C 2", "B C 2\nA B 7\nA B 9"],
+    # Vô hướng: B A trùng với A B
+    ["A B 1", "A B 1\nB A 5", "B A 5", "A B 3\nB A 5\nA B 4", "A B 3\nB A 5"],
+    # Xóa và sửa dòng ở giữa
+    ["A B 1\nC D\nA B 2\nX", "A B 1\nX", "A B 1\nA B 6\nX", "A B 6\nA B 1\nX", ""],
+]
+
+def test_incremental_matches_fresh_parse():
+    for edits in EDIT_SEQUENCES:
+        parser = IncrementalEdgeParser()
+        for text in edits:
+            parser.update(text)
+            assert _state(parser) == _fresh(text), text
+
+def test_rebase_keeps_graph():
+    parser = IncrementalEdgeParser()
+    for text in _typed("A B 9\nB C 2\nA B 7"):
+        parser.update(text)
+    before = _state(parser)
+    parser.rebase("A B 9\nB C 2\nA B 7")
+    assert _state(parser) == before
+    assert dict(((u, v), w) for u, v, w in parser.edges())[("A", "B")] == 7.0
+
+def test_changes_reflect_last_line_weight():
+    parser = IncrementalEdgeParser()
+    parser.update("A B 7")
+    changes = parser.update("A B 9\nA B 7")
+    assert changes.is_empty
+    changes = parser.update("A B 9")
+    assert changes.upserted_edges == [("A", "B", 9.0)]
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from graph_app.generators import gnm_random_graph, gnp_random_graph, pair_count, pairs_from_index
+
+def _pairs(u, v, directed): # Tập cặp đỉnh (vô hướng: không phân biệt chiều)
+    return [(a, b) if directed else (min(a, b), max(a, b)) for a, b in zip(u.tolist(), v.tolist())]
+
+def _assert_simple(u, v, n, directed): # Không khuyên, không cạnh lặp, đỉnh trong [0, n)
+    pairs = _pairs(u, v, directed)
+    assert all(a != b for a, b in pairs)
+    assert len(set(pairs)) == len(pairs)
+    assert all(0 <= a < n and 0 <= b < n for a, b in pairs)
+
+def test_pairs_from_index_is_bijection():
+    for n in (2, 3, 7, 30):
+        for directed in (False, True):
+            u, v = pairs_from_index(np.arange(pair_count(n, directed)), n, directed)
+            _assert_simple(u, v, n, directed)
+            assert len(u) == pair_count(n, directed)
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("m", [0, 1, 50, 95, 96, 180, 190])
+def test_gnm_exact_edge_count(directed, m):
+    # 20 đỉnh: 190 cặp vô hướng, 380 cặp có hướng; m > nửa số cặp đi qua nhánh lấy mẫu phần bù
+    u, v, w = gnm_random_graph(20, m, directed=directed, seed=1, as_arrays=True)
+    assert len(u) == len(v) == len(w) == m
+    _assert_simple(u, v, 20, directed)
+
+def test_gnm_complete_and_out_of_range():
+    u, v, _ = gnm_random_graph(10, pair_count(10), seed=0, as_arrays=True)
+    assert sorted(_pairs(u, v, False)) == [(a, b) for a in range(10) for b in range(a + 1, 10)]
+    with pytest.raises(ValueError):
+        gnm_random_graph(10, pair_count(10) + 1)
+
+def test_gnm_seed_reproducible():
+    first = gnm_random_graph(200, 1000, weighted=True, seed=42)
+    assert gnm_random_graph(200, 1000, weighted=True, seed=42) == first
+    assert gnm_random_graph(200, 1000, weighted=True, seed=43) != first
+    nodes, edges = first
+    assert nodes == [str(i) for i in range(200)]
+    assert all(1.0 <= w <= 10.0 for _, _, w in edges)
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_gnp_simple_graph(directed):
+    u, v, _ = gnp_random_graph(300, 0.05, directed=directed, seed=3, as_arrays=True)
+    _assert_simple(u, v, 300, directed)
+    # Số cạnh kỳ vọng p * số cặp; sai lệch 5 độ lệch chuẩn là gần như không thể
+    total = pair_count(300, directed)
+    assert abs(len(u) - 0.05 * total) < 5 * np.sqrt(total * 0.05 * 0.95)
+
+def test_gnp_extremes_and_seed():
+    assert len(gnp_random_graph(50, 0.0, seed=0, as_arrays=True)[0]) == 0
+    assert len(gnp_random_graph(50, 1.0, seed=0, as_arrays=True)[0]) == pair_count(50)
+    assert gnp_random_graph(100, 0.1, seed=7) == gnp_random_graph(100, 0.1, seed=7)
+    assert gnp_random_graph(100, 0.1, seed=7) != gnp_random_graph(100, 0.1, seed=8)
+    with pytest.raises(ValueError):
+        gnp_random_graph(10, 1.5)
@@ -0,0 +1,80 @@
+import pytest
+
+from graph_app.graph_data import GraphData
+
+def _graph(): # Đồ thị nhỏ A-B-C, C-D với trọng số, đã qua vài thao tác (phiên bản khác 0)
+    graph = GraphData(weighted=True)
+    for u, v, w in [("A", "B", 1.0), ("B", "C", 2.0), ("C", "D", 3.0)]:
+        graph.add_edge(u, v, w)
+    return graph
+
+def _state(graph): # Toàn bộ trạng thái quan sát được của đồ thị
+    return (
+        list(graph.nodes),
+        {node: dict(nbrs) for node, nbrs in graph.adjacency.items()},
+        list(graph.adjacency),
+        graph.version,
+        dict(graph.node_versions),
+    )
+
+def _edit(graph): # Đủ loại thay đổi: thêm/xóa đỉnh, thêm/sửa/xóa cạnh
+    graph.add_node("E")
+    graph.add_edge("E", "A", 5.0)
+    graph.add_edge("A", "B", 9.0)
+    graph.remove_edge("C", "D")
+    graph.remove_node("B")
+
+def test_batch_rollback_restores_everything():
+    graph = _graph()
+    before = _state(graph)
+    with pytest.raises(RuntimeError):
+        with graph.batch():
+            _edit(graph)
+            raise RuntimeError("hủy")
+    assert _state(graph) == before
+    assert graph._txn is None
+
+def test_batch_commit_single_version():
+    graph = _graph()
+    version = graph.version
+    unchanged = graph.node_version("D")
+    with graph.batch():
+        _edit(graph)
+        assert graph.version == version     # Trong giao dịch: chưa tăng phiên bản
+    assert graph.version > version
+    assert graph.node_version("A") == graph.node_version("E") == graph.version
+    assert "B" not in graph.node_versions and "B" not in graph.nodes
+    # D mất cạnh C-D nên cũng đổi phiên bản; đồ thị sau batch giống hệt khi sửa trực tiếp
+    assert graph.node_version("D") != unchanged
+    direct = _graph()
+    _edit(direct)
+    assert graph.nodes == direct.nodes and graph.adjacency == direct.adjacency
+
+def test_empty_batch_keeps_version():
+    graph = _graph()
+    version = graph.version
+    with graph.batch():
+        pass
+    assert graph.version == version
+
+def test_nested_batch_rolls_back_outer():
+    graph = _graph()
+    before = _state(graph)
+    with pytest.raises(ValueError):
+        with graph.batch():
+            graph.add_edge("A", "D", 4.0)
+            with graph.batch():
+                graph.remove_node("C")
+            raise ValueError
+    assert _state(graph) == before
+
+def test_rollback_restores_node_order():
+    graph = _graph()
+    order = list(graph.adjacency)
+    with pytest.raises(KeyError):
+        with graph.batch():
+            graph.add_node("Z")
+            graph.remove_node("A")
+            graph.add_node("A")
+            raise KeyError("Z")
+    assert list(graph.adjacency) == order == graph.nodes
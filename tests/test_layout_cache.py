@@ -0,0 +1,69 @@
+from graph_app.graph_data import GraphData
+from graph_app.layout_cache import LayoutCache
+
+def _path_graph(prefix, n=6): # Đường đi n đỉnh; tiền tố khác nhau -> cấu trúc không giao nhau
+    graph = GraphData()
+    for i in range(n - 1):
+        graph.add_edge(f"{prefix}{i}", f"{prefix}{i + 1}")
+    return graph
+
+def _positions(graph, offset=0.0): # Vị trí giả cho mọi đỉnh
+    return {node: (float(i) + offset, 0.0) for i, node in enumerate(graph.nodes)}
+
+def _keys(cache): # Khóa các mục theo thứ tự LRU (mới dùng nhất trước)
+    return [entry["key"] for entry in cache._load_index()]
+
+def test_store_and_lookup_roundtrip(tmp_path):
+    cache = LayoutCache(tmp_path)
+    graph = _path_graph("a")
+    cache.store(graph, _positions(graph))
+    assert cache.lookup(graph) == _positions(graph)
+    # Bộ nhớ đệm mới trên cùng thư mục đọc lại từ index.json
+    assert LayoutCache(tmp_path).lookup(_path_graph("a")) == _positions(graph)
+
+def test_lru_evicts_oldest_and_deletes_file(tmp_path):
+    cache = LayoutCache(tmp_path, max_entries=2)
+    graphs = [_path_graph(prefix) for prefix in "abc"]
+    keys = []
+    for graph in graphs:
+        cache.store(graph, _positions(graph))
+        keys.append(cache._fingerprint(graph))
+    assert _keys(cache) == [keys[2], keys[1]]
+    assert not (tmp_path / f"{keys[0]}.json").exists()
+    assert (tmp_path / f"{keys[1]}.json").exists() and (tmp_path / f"{keys[2]}.json").exists()
+    assert LayoutCache(tmp_path).lookup(graphs[0]) is None
+    assert _keys(LayoutCache(tmp_path, max_entries=2)) == [keys[2], keys[1]]
+
+def test_lookup_refreshes_entry(tmp_path):
+    cache = LayoutCache(tmp_path, max_entries=2)
+    a, b, c = (_path_graph(prefix) for prefix in "abc")
+    cache.store(a, _positions(a))
+    cache.store(b, _positions(b))
+    assert cache.lookup(a) is not None     # A thành mục dùng gần nhất, B bị loại khi lưu C
+    cache.store(c, _positions(c))
+    assert cache.lookup(a) == _positions(a)
+    assert cache.lookup(b) is None
+    assert cache.lookup(c) == _positions(c)
+
+def test_store_same_structure_overwrites(tmp_path):
+    cache = LayoutCache(tmp_path, max_entries=2)
+    graph = _path_graph("a")
+    cache.store(graph, _positions(graph))
+    cache.store(graph, _positions(graph, offset=10.0))
+    assert len(_keys(cache)) == 1
+    assert cache.lookup(graph) == _positions(graph, offset=10.0)
+
+def test_prepare_store_defers_disk_write(tmp_path):
+    cache = LayoutCache(tmp_path / "cache", max_entries=1)
+    a, b = _path_graph("a"), _path_graph("b")
+    cache.store(a, _positions(a))
+    key_a = cache._fingerprint(a)
+    pending = cache.prepare_store(b, _positions(b))
+    # Danh sách mục trong bộ nhớ đã cập nhật, đĩa chưa đổi cho tới khi write()
+    assert _keys(cache) == [cache._fingerprint(b)]
+    assert pending.evicted == [key_a]
+    assert (tmp_path / "cache" / f"{key_a}.json").exists()
+    pending.write()
+    assert not (tmp_path / "cache" / f"{key_a}.json").exists()
+    assert LayoutCache(tmp_path / "cache").lookup(b) == _positions(b)
+    assert cache.prepare_store(GraphData(), {}) is None
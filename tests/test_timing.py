@@ -0,0 +1,37 @@
+from math import comb
+
+import pytest
+
+from graph_app.timing import mann_whitney_p, min_p_value
+
+def test_fully_separated_samples_exact_p():
+    # Tách hoàn toàn: U = 0, chỉ 1 trong C(m + n, m) cách xếp mỗi phía -> p = 2 / C(m + n, m)
+    assert mann_whitney_p([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]) == pytest.approx(2 / 252)
+    assert mann_whitney_p([1, 2, 3], [4, 5, 6]) == pytest.approx(0.1)
+    assert mann_whitney_p([6, 7, 8, 9, 10], [1, 2, 3, 4, 5]) == pytest.approx(2 / 252)
+
+def test_exact_table_small_u():
+    # U = 1: hai cách xếp có U <= 1 trên 20 -> p = 2 * 2 / 20
+    assert mann_whitney_p([1, 2, 4], [3, 5, 6]) == pytest.approx(0.2)
+    # 4 và 4 mẫu, U = 2: các cách có U <= 2 là 1 + 1 + 2 = 4 trên 70
+    assert mann_whitney_p([1, 2, 4, 5], [3, 6, 7, 8]) == pytest.approx(2 * 4 / 70)
+
+def test_symmetric():
+    a, b = [1.5, 2.0, 7.0, 3.1], [2.5, 4.0, 8.0, 9.5, 6.0]
+    assert mann_whitney_p(a, b) == pytest.approx(mann_whitney_p(b, a))
+
+def test_degenerate_inputs():
+    assert mann_whitney_p([], [1, 2, 3]) == 1.0
+    assert mann_whitney_p([1, 2], []) == 1.0
+    # Hai mẫu giống hệt nhau (toàn giá trị trùng): không có bằng chứng khác biệt
+    assert mann_whitney_p([1.0] * 5, [1.0] * 5) == 1.0
+    assert mann_whitney_p([1, 2, 3], [1, 2, 3]) == 1.0
+
+def test_min_p_value():
+    assert min_p_value(5, 5) == pytest.approx(2 / comb(10, 5))
+    assert min_p_value(3, 3) == pytest.approx(0.1)
+    assert min_p_value(1, 1) == 1.0
+    assert min_p_value(0, 5) == 1.0
+    for m, n in [(2, 3), (4, 4), (5, 7)]:
+        a, b = list(range(m)), list(range(m, m + n))
+        assert mann_whitney_p(a, b) == pytest.approx(min_p_value(m, n))